@@ -0,0 +1,91 @@
+# Typeahead (wildlife/autocomplete.py): build time and size of the table
+# index_to_solr.py writes to frontend/autocomplete.json, a check of every
+# suggestion list against a scan of all species, and the latency of typing
+# every name and scientific name one character at a time, on the feeds and
+# on a larger synthetic list of species.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_autocomplete
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.bench_engine import percentiles
+from wildlife.autocomplete import Autocomplete, build_autocomplete, normalize
+from wildlife.search_engine import SearchEngine
+
+
+def scan(table, text, limit):
+    # reference: every entry with a word of either name starting with text
+    prefix = normalize(text)
+    matches = []
+    for rank, (name, scientific, _) in enumerate(table["entries"]):
+        for value in (name, scientific):
+            words = normalize(value).split()
+            if any(" ".join(words[i:]).startswith(prefix) for i in range(len(words))):
+                matches.append(rank)
+                break
+    return [table["entries"][rank] for rank in matches[:limit]]
+
+
+def keystrokes(table):
+    # every prefix typed while entering each name
+    for name, scientific, _ in table["entries"]:
+        for value in (name, scientific):
+            for end in range(1, len(value) + 1):
+                yield value[:end]
+
+
+def synthetic_docs(n, docs, seed=1):
+    # names recombined from the feeds' words, one to three sources each
+    rnd = random.Random(seed)
+    words = sorted({w for doc in docs for w in str(doc.get("name", "")).split()})
+    latin = sorted({w for doc in docs for w in str(doc.get("scientific_name", "")).split() if w.isalpha()})
+    for i in range(n):
+        yield {
+            "name": " ".join(rnd.sample(words, rnd.randint(1, 3))) + f" {i}",
+            "scientific_name": " ".join(rnd.sample(latin, 2)),
+            "sources": rnd.sample(["WT", "AWF", "WWF"], rnd.randint(1, 3)),
+        }
+
+
+def run(label, docs, check):
+    start = time.perf_counter()
+    table = build_autocomplete(docs)
+    build_s = time.perf_counter() - start
+    size = len(json.dumps(table, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    start = time.perf_counter()
+    autocomplete = Autocomplete(json.loads(json.dumps(table)))
+    load_s = time.perf_counter() - start
+    print(f"{label}: {len(table['entries'])} species, {len(table['keys'])} keys, {size / 1e3:.0f} kB, "
+          f"built in {build_s * 1000:.0f} ms, loaded in {load_s * 1000:.0f} ms")
+
+    typed = list(keystrokes(table))
+    # every n-th keystroke of a large list
+    typed = typed[::max(1, len(typed) // 200_000)]
+    if check:
+        mismatches = sum(autocomplete.suggest(t) != scan(table, t, autocomplete.limit) for t in typed)
+        print(f"  {len(typed)} prefixes checked against a scan: {mismatches} mismatches")
+
+    samples = []
+    for text in typed:
+        start = time.perf_counter()
+        autocomplete.suggest(text)
+        samples.append(time.perf_counter() - start)
+    print(f"  {len(typed)} keystrokes: {percentiles(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=50_000, help="size of the synthetic species list")
+    args = parser.parse_args()
+
+    docs = list(SearchEngine.from_feeds(related_k=0).docs)
+    run("feeds", docs, check=True)
+    run("synthetic", list(synthetic_docs(args.docs, docs)), check=False)
+
+
+if __name__ == "__main__":
+    main()
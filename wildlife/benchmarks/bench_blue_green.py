@@ -0,0 +1,70 @@
+# Blue/green re-indexing against the fake Solr: a reader thread queries the
+# wild_life alias during two rebuilds and counts how often it sees an empty
+# collection, then a rebuild with an injected failure must leave the alias
+# untouched. Prints the Collections API calls Solr received.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_blue_green
+
+import contextlib
+import io
+import threading
+import time
+
+import requests
+
+from benchmarks.corpus import FEEDS, feed_path
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import index_blue_green
+
+SOURCES = [(feed_path(name), source) for name, source in FEEDS]
+
+
+def rebuild(solr, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return index_blue_green(base_url=solr.base_url, sources=SOURCES, batch_size=20, **kwargs)
+
+
+def main():
+    with FakeSolr(latency=0.01, collections=()) as solr:
+        rebuild(solr)
+
+        empty_reads = 0
+        reads = 0
+        stop = threading.Event()
+
+        def reader():
+            nonlocal empty_reads, reads
+            while not stop.is_set():
+                found = requests.get(f"{solr.url}/select", params={"q": "*:*", "rows": 0}).json()
+                reads += 1
+                empty_reads += found["response"]["numFound"] == 0
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+
+        start = time.perf_counter()
+        time.sleep(1.1)  # new collection names have one-second resolution
+        rebuild(solr)
+        elapsed = time.perf_counter() - start - 1.1
+
+        stop.set()
+        thread.join()
+        print(f"rebuild took {elapsed:.2f}s; {reads} reads of the alias during it, {empty_reads} empty")
+
+        live = solr.aliases["wild_life"]
+        solr.fail_when = lambda name, payload: name != live and isinstance(payload, list)
+        time.sleep(1.1)
+        try:
+            rebuild(solr)
+        except (RuntimeError, requests.HTTPError) as e:
+            print(f"failed rebuild rejected: {e}")
+        print(f"alias still -> {solr.aliases['wild_life']} (was {live}), collections: {sorted(solr.collections)}")
+
+        print("admin calls:")
+        for method, name, handler, params in solr.calls:
+            if name == "admin":
+                print(f"  {params['action']} {params.get('name', '')} {params.get('collections', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Near-duplicate detection (wildlife/utils/minhash.py): how many documents
+# deduplicate() removes from the current feeds, whether it finds edited
+# copies of them (one overview word replaced, as between two captures of a
+# page), and how LSH candidate lookup compares with checking every earlier
+# document (exact Jaccard over the same shingles) on a larger corpus.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_dedup
+
+import argparse
+import copy
+import random
+import time
+
+from benchmarks.corpus import load_corpus, zipf_docs
+from wildlife.utils.minhash import THRESHOLD, deduplicate, shingles
+
+
+def pairwise_duplicates(docs, threshold=THRESHOLD):
+    # reference: every document against every kept one
+    kept, removed = [], 0
+    for doc in docs:
+        features = shingles(doc)
+        if features and any(len(features & k) / len(features | k) >= threshold for k in kept):
+            removed += 1
+        elif features:
+            kept.append(features)
+    return removed
+
+
+def edited_copies(docs, seed=1):
+    rnd = random.Random(seed)
+    copies = []
+    for doc in docs:
+        words = doc.get("overview").split() if isinstance(doc.get("overview"), str) else []
+        if len(words) < 40:
+            continue
+        doc = copy.deepcopy(doc)
+        words[rnd.randrange(len(words))] = "recaptured"
+        doc["overview"] = " ".join(words)
+        doc["url"] += "?capture=2"
+        copies.append(doc)
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=5000, help="size of the synthetic corpus")
+    args = parser.parse_args()
+
+    docs = load_corpus()
+    _, removed = deduplicate(docs)
+    print(f"{len(docs)} feed documents: {len(removed)} near-duplicates removed")
+    for doc, original in removed:
+        print(f"  {doc['source']} {doc['url']} duplicates {original['source']} {original['url']}")
+
+    copies = edited_copies(docs)
+    _, removed = deduplicate(docs + copies)
+    print(f"{len(copies)} edited copies added: {len(removed)} removed")
+
+    synthetic = list(zipf_docs(args.docs))
+    synthetic += edited_copies(synthetic[:args.docs // 10])
+
+    start = time.perf_counter()
+    _, removed = deduplicate(synthetic)
+    lsh_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = pairwise_duplicates(synthetic)
+    pairwise_s = time.perf_counter() - start
+
+    print(f"{len(synthetic)} synthetic documents: MinHash/LSH {len(removed)} removed in {lsh_s:.1f}s, "
+          f"pairwise Jaccard {expected} removed in {pairwise_s:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# The embedded search engine's on-disk index (wildlife/disk_index.py) vs.
+# loading the JSON: build time and file size, then, each in a fresh
+# process, the time to first answer and the memory added (peak RSS over the
+# interpreter with the modules imported) for
+#   json    json.load of the documents only
+#   engine  json.load and indexing them in memory (SearchEngine)
+#   disk    opening the mmap index and answering one query
+# on the feeds and on a larger synthetic corpus, and the query latency of
+# both engines (postings are decoded from the file on every lookup).
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_disk_index
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_engine import QUERIES, measure
+from benchmarks.corpus import zipf_docs
+from wildlife.disk_index import open_engine, write_index
+from wildlife.search_engine import SearchEngine
+
+QUERY = "endangered mammals in the savanna"
+
+
+def peak_rss_mb():
+    # VmHWM (Linux): unlike ru_maxrss it does not start from the parent's peak
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def child(mode, paths):
+    # runs in its own process: prints seconds and MB added
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "disk":
+        open_engine(paths[0]).search(QUERY)
+    else:
+        docs = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                docs.extend(json.load(f))
+        if mode == "engine":
+            SearchEngine(docs).search(QUERY)
+    print(json.dumps([time.perf_counter() - start, peak_rss_mb() - before]))
+
+
+def run_child(mode, paths):
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_disk_index", "--child", mode, *paths],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def compare(label, json_paths, engine, tmp):
+    index_path = os.path.join(tmp, label + ".idx")
+    start = time.perf_counter()
+    size = write_index(engine, index_path)
+    print(f"{label}: {len(engine.docs)} documents, index written in {time.perf_counter() - start:.2f}s "
+          f"({size / 1e6:.1f} MB, JSON {sum(os.path.getsize(p) for p in json_paths) / 1e6:.1f} MB)")
+    for mode, paths in (("json", json_paths), ("engine", json_paths), ("disk", [index_path])):
+        seconds, mb = run_child(mode, paths)
+        print(f"  {mode:7} {seconds * 1000:8.1f} ms  +{mb:6.1f} MB RSS")
+    print(f"  search in memory: {measure(engine, QUERIES, 5)}")
+    print(f"  search on disk:   {measure(open_engine(index_path), QUERIES, 5)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20_000, help="size of the synthetic corpus")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], args.child[1:])
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # the feeds as indexed (merged, related species), so "engine" loads the
+        # same documents the index holds
+        feeds = SearchEngine.from_feeds()
+        feeds_path = os.path.join(tmp, "feeds.json")
+        with open(feeds_path, "w", encoding="utf-8") as f:
+            json.dump(list(feeds.docs), f, ensure_ascii=False)
+        compare("feeds", [feeds_path], feeds, tmp)
+
+        docs = [dict(doc, id=doc["url"], source="WT") for doc in zipf_docs(args.docs)]
+        synthetic_path = os.path.join(tmp, "synthetic.json")
+        with open(synthetic_path, "w", encoding="utf-8") as f:
+            json.dump(docs, f)
+        compare("synthetic", [synthetic_path], SearchEngine(docs), tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# The embedded search engine (wildlife/search_engine.py): time to index the
+# feeds (merge and related species included) and a larger synthetic corpus,
+# and per-query latency percentiles for the frontend's search request, with
+# and without the sidebar's filter queries and facets.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_engine
+
+import argparse
+import statistics
+import time
+
+from benchmarks.corpus import zipf_docs
+from wildlife.search_engine import FL, MM, PF, QF, TIE, SearchEngine
+
+QUERIES = [
+    "elephant", "african elephant", "grevy's zebra", "sea cow", "big cat",
+    "panthera leo", "\"snow leopard\"", "badger europe", "birds of prey",
+    "endangered mammals in the savanna", "kudu", "animals that eat insects",
+]
+FILTERS = [
+    "weight_kg_min:[* TO 500] AND weight_kg_max:[10 TO *]",
+    "{!terms f=animal_type}Mammal,Bird",
+]
+
+
+def params(query, filters, facets):
+    request = {"q": query, "defType": "edismax", "qf": QF, "pf": PF, "mm": MM, "tie": str(TIE),
+               "rows": 10, "fl": ",".join(FL)}
+    if filters:
+        request["fq"] = FILTERS
+    if facets:
+        request.update({"facet": "true", "facet.field": ["animal_type", "source"],
+                        "facet.mincount": 1, "facet.limit": -1})
+    return request
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+    return f"p50 {pick(0.5):.3f} ms, p95 {pick(0.95):.3f} ms, p99 {pick(0.99):.3f} ms, mean {statistics.mean(samples) * 1000:.3f} ms"
+
+
+def measure(engine, queries, repeat, filters=False, facets=False):
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            engine.select(params(query, filters, facets))
+            samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--docs", type=int, default=10_000, help="size of the synthetic corpus")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = SearchEngine.from_feeds()
+    print(f"feeds: {len(engine.docs)} documents indexed in {time.perf_counter() - start:.2f}s")
+    print(f"  search:                   {measure(engine, QUERIES, args.repeat)}")
+    print(f"  search + fq:              {measure(engine, QUERIES, args.repeat, filters=True)}")
+    print(f"  search + fq + facets:     {measure(engine, QUERIES, args.repeat, filters=True, facets=True)}")
+
+    docs = [dict(doc, id=doc["url"], source="WT") for doc in zipf_docs(args.docs)]
+    start = time.perf_counter()
+    engine = SearchEngine(docs)
+    print(f"synthetic: {len(engine.docs)} documents indexed in {time.perf_counter() - start:.2f}s")
+    words = [f"w{rank} w{rank * 7}" for rank in (3, 50, 400, 2000, 9000)]
+    print(f"  search:                   {measure(engine, words, max(1, args.repeat // 5))}")
+    print(f"  search + fq + facets:     {measure(engine, words, max(1, args.repeat // 5), filters=True, facets=True)}")
+
+
+if __name__ == "__main__":
+    main()
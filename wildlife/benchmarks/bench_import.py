@@ -0,0 +1,41 @@
+# Time to import a spider module in a fresh interpreter, i.e. the fixed cost
+# every `scrapy crawl` and every offline_extract worker pays before doing work.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_import
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import ROOT
+
+MODULE = "wildlife.spiders.wwf_spider"
+
+
+def import_once(module):
+    code = f"import sys, {module}; print('nltk' in sys.modules)"
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, out.stdout.strip() == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default=MODULE)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    # interpreter start-up alone, to subtract from the import time
+    baseline = statistics.median(import_once("os")[0] for _ in range(args.repeat))
+    runs = [import_once(args.module) for _ in range(args.repeat)]
+    median = statistics.median(t for t, _ in runs)
+
+    print(f"python -c 'import {args.module}'  median {median * 1000:.0f} ms "
+          f"({(median - baseline) * 1000:.0f} ms over a bare interpreter)")
+    print(f"nltk imported at module import time: {runs[0][1]}")
+
+
+if __name__ == "__main__":
+    main()
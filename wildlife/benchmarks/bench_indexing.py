@@ -0,0 +1,70 @@
+# Streaming batched indexing vs. the old json.load + single POST per file,
+# against the local fake Solr.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_indexing --docs 50000
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+from benchmarks.corpus import synthetic_docs, write_json_array, write_json_lines
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import SolrClient, index_all
+
+
+def legacy_index(solr_url, path, source):
+    # what index_file did before: whole file in memory, one body, commit=true
+    with open(path, "r", encoding="utf-8") as f:
+        raw_items = json.load(f)
+
+    for item in raw_items:
+        item["id"] = item.get("url")
+        item["source"] = source
+
+    requests.post(f"{solr_url}/update?commit=true", json=raw_items).raise_for_status()
+    return len(raw_items)
+
+
+def measure(label, fn):
+    # the peak also counts the fake Solr's own copy of the documents
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} {count:>8} docs  {elapsed:7.2f}s  {count / elapsed:9.0f} docs/sec  peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = os.path.join(tmp, "species.json")
+        lines_path = os.path.join(tmp, "species.jsonl")
+        write_json_array(array_path, synthetic_docs(args.docs))
+        write_json_lines(lines_path, synthetic_docs(args.docs))
+
+        with FakeSolr() as solr:
+            measure("legacy (json.load)", lambda: legacy_index(solr.url, array_path, "BENCH"))
+
+            client = SolrClient(solr.url)
+            measure("streaming, JSON array", lambda: index_all(
+                client, [(array_path, "BENCH")], batch_size=args.batch_size))
+            measure("streaming, JSON Lines", lambda: index_all(
+                client, [(lines_path, "BENCH")], batch_size=args.batch_size))
+            client.close()
+
+            assert len(solr.collections["wild_life"].docs) == args.docs
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Range filters through the interval index (wildlife/utils/bitsets.py) vs.
+# scanning the numeric columns, as the embedded engine did: checks both give
+# the same documents for the frontend's overlap filter on the feeds and on
+# synthetic ranges, and times build and lookups for narrow and wide query
+# ranges; then the query-time related species pre-filtered by a size range
+# vs. scoring every document.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_intervals
+
+import argparse
+import math
+import random
+import time
+
+from benchmarks.corpus import zipf_docs
+from wildlife.search_engine import SearchEngine
+from wildlife.utils.bitsets import IntervalIndex, bits
+
+QUANTITIES = ["weight_kg", "length_cm", "lifespan_year", "population"]
+
+
+def scan_overlapping(lows, highs, low, high):
+    # reference: the engine's former column scan, one column per fq part
+    return (bits(doc for doc, v in enumerate(lows) if v <= high)
+            & bits(doc for doc, v in enumerate(highs) if v >= low))
+
+
+def random_ranges(n, seed=1):
+    # log-uniform ranges, a tenth of them missing
+    rnd = random.Random(seed)
+    lows, highs = [], []
+    for _ in range(n):
+        if rnd.random() < 0.1:
+            lows.append(math.nan)
+            highs.append(math.nan)
+            continue
+        low = 10 ** rnd.uniform(-2, 5)
+        lows.append(low)
+        highs.append(low * rnd.uniform(1, 10))
+    return lows, highs
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100_000, help="size of the synthetic columns")
+    parser.add_argument("--related-docs", type=int, default=5_000, help="size of the synthetic related corpus")
+    args = parser.parse_args()
+
+    engine = SearchEngine.from_feeds()
+    rnd = random.Random(2)
+    checked = 0
+    for quantity in QUANTITIES:
+        index = engine.interval_index(quantity)
+        lows, highs = engine.numbers[quantity + "_min"], engine.numbers[quantity + "_max"]
+        for _ in range(200):
+            low = 10 ** rnd.uniform(-2, 6)
+            high = low * rnd.uniform(1, 100)
+            expected = scan_overlapping(lows, highs, low, high)
+            assert index.overlapping(low, high) == expected
+            fq = f"{quantity}_min:[* TO {high}] AND {quantity}_max:[{low} TO *]"
+            assert engine.filter_mask(fq) == expected
+            checked += 1
+    print(f"feeds: {checked} overlap queries, interval index == column scan")
+
+    lows, highs = random_ranges(args.docs)
+    start = time.perf_counter()
+    index = IntervalIndex.from_columns(lows, highs)
+    print(f"synthetic: {args.docs} ranges indexed in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for label, low, high in (("narrow", 50, 60), ("medium", 1, 1000), ("wide", 0.01, 100_000)):
+        expected, scan_ms = timed(lambda: scan_overlapping(lows, highs, low, high), 3)
+        result, index_ms = timed(lambda: index.overlapping(low, high), 50)
+        assert result == expected
+        print(f"  {label:6} [{low}, {high}]: {result.bit_count():6} matches, "
+              f"scan {scan_ms:7.2f} ms, interval index {index_ms:6.3f} ms")
+
+    docs = [dict(doc, id=doc["url"], source="WT") for doc in zipf_docs(args.related_docs)]
+    engine = SearchEngine(docs)
+    fq = "length_cm_min:[* TO 50] AND length_cm_max:[20 TO *]"
+    doc_id = docs[0]["id"]
+    engine.related(doc_id)  # features cached, as in a long-running server
+    _, all_ms = timed(lambda: engine.related(doc_id), 5)
+    related, filtered_ms = timed(lambda: engine.related(doc_id, filters=[fq]), 5)
+    print(f"related species over {len(docs)} documents: all {all_ms:.1f} ms, "
+          f"pre-filtered to {engine.filter_mask(fq).bit_count()} by length {filtered_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
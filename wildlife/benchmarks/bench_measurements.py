@@ -0,0 +1,359 @@
+# Golden check and throughput of the shared measurement parsers
+# (wildlife/utils/measurements.py). The spiders' old per-spider parsers are
+# kept below as the reference: both are run over every raw_* field of the
+# three feeds (plus a few awkward strings) and must give the same *_min/*_max
+# fields, in the same order. The values stored in the feeds are compared too
+# and any difference is listed (a feed written by an older parser shows up
+# there, not as a failure).
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_measurements
+
+import argparse
+import re
+import time
+
+from benchmarks.corpus import load_corpus
+from wildlife.utils import measurements as m
+
+# ---------------- reference: wwf_spider ----------------
+
+
+def wwf_extract_numbers(text):
+    if not text:
+        return []
+    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", text)
+    return [float(x) for x in re.findall(r"\d+(?:\.\d+)?", text)]
+
+
+def wwf_parse_weight_kg(raw):
+    nums = wwf_extract_numbers(raw.lower())
+    if not nums:
+        return None
+
+    if "ton" in raw.lower():
+        nums = [n * 1000.0 for n in nums]
+    elif "pound" in raw.lower() or "lb" in raw.lower():
+        nums = [n * 0.453592 for n in nums]
+
+    if nums[0] == nums[-1]:
+        return [0, nums[-1]]
+    return nums
+
+
+def wwf_parse_population(raw):
+    if not raw:
+        return None
+
+    text = raw.lower().replace(",", "")
+    nums = wwf_extract_numbers(text)
+    if not nums:
+        return None
+
+    if "million" in text:
+        nums = [int(n * 1_000_000) for n in nums]
+    elif "thousand" in text:
+        nums = [int(n * 1_000) for n in nums]
+    else:
+        nums = [int(n) for n in nums]
+
+    if "less than" in text or "<" in text or nums[0] == nums[-1]:
+        return [0, nums[0]]
+    return nums
+
+
+def wwf_parse_length_clause(clause):
+    clause = clause.lower()
+    nums = wwf_extract_numbers(clause)
+    if not nums:
+        return None, None
+
+    if "meter" in clause:
+        nums = [v * 100 for v in nums]
+    elif "foot" in clause or "ft" in clause or "feet" in clause:
+        nums = [v * 30.48 for v in nums]
+    elif "inch" in clause:
+        nums = [v * 2.54 for v in nums]
+
+    if nums[0] == nums[-1]:
+        nums = [0, nums[-1]]
+
+    if "tail" in clause:
+        return "tail_length_cm", nums
+    if "wing" in clause or "wingspan" in clause:
+        return "wingspan_cm", nums
+    if "shoulder" in clause or "tall" in clause or "height" in clause:
+        return "shoulder_height_cm", nums
+    return "length_cm", nums
+
+
+def wwf_reference(doc):
+    data = {}
+    if "raw_weight" in doc:
+        parsed = wwf_parse_weight_kg(doc["raw_weight"])
+        if parsed:
+            data["weight_kg_min"] = parsed[0]
+            data["weight_kg_max"] = parsed[-1]
+    if doc.get("raw_length"):
+        for clause in re.split(r"[;,]", doc["raw_length"]):
+            key, value = wwf_parse_length_clause(clause)
+            if key and value is not None:
+                data[key + "_min"] = value[0]
+                data[key + "_max"] = value[-1]
+    if "raw_population" in doc:
+        parsed = wwf_parse_population(doc["raw_population"])
+        if parsed is not None:
+            data["population_min"] = parsed[0]
+            data["population_max"] = parsed[-1]
+    return data
+
+
+# ---------------- reference: afw_spider ----------------
+
+
+def awf_extract_numbers(text):
+    return [float(x) for x in re.findall(r"\d+(?:\.\d+)?", text)]
+
+
+def awf_parse_ranges(text, units):
+    if not text:
+        return None
+
+    text = re.sub(r"\([^)]*\)", "", text)
+    mins, maxs = [], []
+
+    for part in text.split(";"):
+        nums = awf_extract_numbers(part)
+        if not nums:
+            continue
+
+        part_l = part.lower()
+        for pattern, convert in units:
+            if re.search(pattern, part_l):
+                nums = [convert(n) for n in nums]
+                break
+        else:
+            continue
+
+        mins.append(min(nums))
+        maxs.append(max(nums))
+
+    if mins:
+        if min(mins) == max(maxs):
+            return [0, max(maxs)]
+        return [min(mins), max(maxs)]
+    return None
+
+
+AWF_WEIGHT = [
+    (r"\bkilogram(s)?\b|\bkg\b", lambda n: n),
+    (r"\bton(s)?\b", lambda n: n * 1000),
+    (r"\bgram(s)?\b|\bg\b", lambda n: n / 1000),
+]
+AWF_LENGTH = [
+    (r"\bmillimeter(s)?\b|\bmm\b", lambda n: n / 10),
+    (r"\bcentimeter(s)?\b|\bcm\b", lambda n: n),
+    (r"\bmeter(s)?\b|\bm\b", lambda n: n * 100),
+]
+
+
+def awf_parse_gestation_days(text):
+    nums = awf_extract_numbers(text)
+    if not nums:
+        return None
+    if re.search(r"month", text, re.I):
+        nums = [n * 30 for n in nums]
+    return [min(nums), max(nums)]
+
+
+def awf_parse_lifespan_year(text):
+    nums = awf_extract_numbers(text)
+    if not nums:
+        return None
+    return [min(nums), max(nums)]
+
+
+def awf_reference(doc):
+    data = {}
+    for key, field, parse in [
+        ("raw_weight", "weight_kg", lambda t: awf_parse_ranges(t, AWF_WEIGHT)),
+        ("raw_length", "length_cm", lambda t: awf_parse_ranges(t, AWF_LENGTH)),
+        ("raw_lifespan", "lifespan_year", awf_parse_lifespan_year),
+        ("raw_gestation", "gestation_days", awf_parse_gestation_days),
+    ]:
+        if key in doc:
+            parsed = parse(doc[key])
+            if parsed:
+                data[field + "_min"] = parsed[0]
+                data[field + "_max"] = parsed[-1]
+    return data
+
+
+# ---------------- reference: wildlifetrusts_spider ----------------
+
+WT_RANGE = r"([\d\.]+)(?:\s*-\s*([\d\.]+))?"
+WT_PATTERNS = {
+    "length_cm": rf"length\s+(?:around\s+|approx\s+|up\s+to\s+)?{WT_RANGE}\s*(mm|cm|m)",
+    "height_cm": rf"height\s+{WT_RANGE}\s*(mm|cm|m)",
+    "wingspan_cm": rf"wingspan\s+{WT_RANGE}\s*(mm|cm|m)",
+    "tail_cm": rf"tail\s+{WT_RANGE}\s*(mm|cm|m)",
+    "bell_diameter_cm": rf"bell\s+{WT_RANGE}\s*(mm|cm|m)",
+    "max_size_cm": rf"(?:maximum\s+size|max\s+size)\s+{WT_RANGE}\s*(mm|cm|m)",
+    "weight_kg": r"weight\s+(?:around\s+|approx\s+)?([\d\.]+)(?:\s*-\s*([\d\.]+))?\s*(kg|g)",
+    "lifespan_year": r"(?:average\s+)?life\s*span\s+([\d\.]+)(?:\s*-\s*([\d\.]+))?\s*year",
+}
+WT_CM = {"mm": lambda v: v / 10, "cm": lambda v: v, "m": lambda v: v * 100}
+
+
+def wt_reference(doc):
+    data = {}
+    if "raw_statistics" not in doc:
+        return data
+
+    text = doc["raw_statistics"].lower()
+    for field, pattern in WT_PATTERNS.items():
+        match = re.search(pattern, text)
+        if not match:
+            continue
+
+        groups = match.groups()
+        min_val, max_val = float(groups[0]), groups[1]
+
+        if field.endswith("_cm"):
+            unit = groups[2]
+            if max_val:
+                data[field + "_min"] = round(WT_CM[unit](min_val), 2)
+                data[field + "_max"] = round(WT_CM[unit](float(max_val)), 2)
+            else:
+                data[field + "_min"] = 0
+                data[field + "_max"] = round(WT_CM[unit](min_val), 2)
+        elif field == "weight_kg":
+            if groups[2] == "g":
+                min_val /= 1000
+                if max_val:
+                    max_val = float(max_val) / 1000
+            if max_val:
+                data[field + "_min"] = round(min_val, 3)
+                data[field + "_max"] = round(float(max_val), 3)
+            else:
+                data[field + "_min"] = 0
+                data[field + "_max"] = round(min_val, 3)
+        else:
+            if max_val:
+                data[field + "_min"] = min_val
+                data[field + "_max"] = float(max_val)
+            else:
+                data[field + "_min"] = 0
+                data[field + "_max"] = min_val
+    return data
+
+
+# ---------------- shared parsers, as the spiders call them ----------------
+
+
+def wwf_shared(doc):
+    data = {}
+    if "raw_weight" in doc:
+        weight = m.parse_wwf_weight(doc["raw_weight"])
+        if weight:
+            m.store(data, weight)
+    if "raw_length" in doc:
+        for length in m.parse_wwf_lengths(doc["raw_length"]):
+            m.store(data, length)
+    if "raw_population" in doc:
+        population = m.parse_wwf_population(doc["raw_population"])
+        if population is not None:
+            m.store(data, population)
+    return data
+
+
+def awf_shared(doc):
+    data = {}
+    for key, parse in [
+        ("raw_weight", m.parse_awf_weight),
+        ("raw_length", m.parse_awf_length),
+        ("raw_lifespan", m.parse_awf_lifespan),
+        ("raw_gestation", m.parse_awf_gestation),
+    ]:
+        if key in doc:
+            parsed = parse(doc[key])
+            if parsed:
+                m.store(data, parsed)
+    return data
+
+
+def wt_shared(doc):
+    data = {}
+    if "raw_statistics" in doc:
+        for measurement in m.parse_wt_statistics(doc["raw_statistics"]):
+            m.store(data, measurement)
+    return data
+
+
+PARSERS = {
+    "WWF": (wwf_reference, wwf_shared),
+    "AWF": (awf_reference, awf_shared),
+    "WT": (wt_reference, wt_shared),
+}
+
+# strings the feeds do not have yet: thousands separators, unit words inside
+# other words, several clauses of one kind, parentheses, missing units
+EDGE_CASES = [
+    ("WWF", {"raw_weight": "1,000,000 lb or 1,5000 tons"}),
+    ("WWF", {"raw_weight": "12,345.6 kg"}),
+    ("WWF", {"raw_weight": "Washington: 3-4"}),
+    ("WWF", {"raw_length": "2 ft; 3 feet tail, 1,760 inches, wingspan 5-9 meters"}),
+    ("WWF", {"raw_length": "shoulder 4 ft, tall 2-3 centimeters, 7"}),
+    ("WWF", {"raw_population": "Less than 2.5 million"}),
+    ("WWF", {"raw_population": "<300, maybe 1,2 thousand"}),
+    ("AWF", {"raw_weight": "3 kg; 2 tons (4,000 lb); 500 g; 7 stone", "raw_length": "40 mm; 2 m (6 ft); .5 to 1 meter"}),
+    ("AWF", {"raw_lifespan": "about 8 (12 in captivity)", "raw_gestation": "3 MONTHS or 95 days"}),
+    ("WT", {"raw_statistics": "length 3 max size 5cm tail 2-4 mm weight 850g weight 2kg life span 4-4.5 year"}),
+    ("WT", {"raw_statistics": "height 1.15m wingspan 90-105cm bell 50cm across average lifespan 8 year"}),
+]
+
+
+def fields(data):
+    return [(k, v) for k, v in data.items() if k.endswith(("_min", "_max"))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    docs = [(doc["source"], doc) for doc in load_corpus()]
+
+    raw_fields = 0
+    for source, doc in docs + EDGE_CASES:
+        reference, shared = PARSERS[source]
+        expected = reference(doc)
+        assert fields(shared(doc)) == fields(expected), (source, doc.get("name"), shared(doc), expected)
+        raw_fields += sum(1 for k in doc if k.startswith("raw_"))
+    print(f"{raw_fields} raw fields in {len(docs)} documents (+{len(EDGE_CASES)} edge cases): identical output")
+
+    stale = [
+        (doc.get("name"), k, v, dict(fields(doc)).get(k))
+        for source, doc in docs
+        for k, v in fields(PARSERS[source][1](doc))
+        if dict(fields(doc)).get(k) != v
+    ]
+    for name, key, parsed, stored in stale:
+        print(f"  feed differs: {name}: {key} stored {stored}, parsed {parsed}")
+
+    # best of --rounds, the two alternating so they share the machine's noise
+    best = [float("inf"), float("inf")]
+    for _ in range(args.rounds):
+        for index in (0, 1):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for source, doc in docs:
+                    PARSERS[source][index](doc)
+            best[index] = min(best[index], time.perf_counter() - start)
+
+    for label, elapsed in zip(("per-spider parsers", "shared measurements"), best):
+        print(f"{label:<20} {raw_fields * args.repeat / elapsed:10.0f} fields/sec")
+
+
+if __name__ == "__main__":
+    main()
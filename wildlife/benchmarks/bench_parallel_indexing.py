@@ -0,0 +1,77 @@
+# Wall time of sequential vs. thread-pool indexing of several source files
+# against the local fake Solr, which sleeps `--latency` seconds per request to
+# stand in for Solr's analysis time. The last run injects a failing batch in
+# one source into a re-index to show that the other sources are still sent
+# and that nothing is committed, so the previous documents stay live.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_parallel_indexing
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.corpus import synthetic_docs, write_json_array
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import SolrClient, index_all, index_all_parallel
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--docs-per-source", type=int, default=4000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = []
+        for i in range(args.sources):
+            path = os.path.join(tmp, f"source{i}.json")
+            docs = synthetic_docs(args.docs_per_source)
+            write_json_array(path, ({**d, "url": f"{d['url']}@{i}"} for d in docs))
+            sources.append((path, f"S{i}"))
+
+        total = args.sources * args.docs_per_source
+        print(f"{total} docs in {args.sources} sources, batch {args.batch_size}, {args.latency * 1000:.0f} ms/request")
+
+        with FakeSolr(latency=args.latency) as solr:
+            client = SolrClient(solr.url)
+            _, base = timed(lambda: index_all(client, sources, batch_size=args.batch_size))
+            client.close()
+            print(f"sequential            {base:6.2f}s")
+
+            for workers in args.workers:
+                _, elapsed = timed(lambda: index_all_parallel(
+                    solr.url, sources, workers=workers, max_in_flight=workers * 2,
+                    batch_size=args.batch_size))
+                assert len(solr.collections["wild_life"].docs) == total
+                print(f"parallel, {workers:>2} workers  {elapsed:6.2f}s  ({base / elapsed:.1f}x)")
+
+        def fail_first_batch_of_s0(name, payload):
+            return isinstance(payload, list) and payload and payload[0]["id"].endswith("#0@0")
+
+        with FakeSolr() as solr:
+            timed(lambda: index_all_parallel(solr.url, sources, batch_size=args.batch_size))
+            solr.fail_when = fail_first_batch_of_s0
+            results, _ = timed(lambda: index_all_parallel(solr.url, sources, batch_size=args.batch_size))
+            for r in results:
+                print(f"with injected failure: {r.source} sent {r.docs}, failed batches {r.failed_batches}")
+            # the re-index was rolled back, the previous documents are still live
+            live = len(solr.collections["wild_life"].docs)
+            assert live == total, live
+            print(f"live documents after the failed re-index: {live}")
+
+
+if __name__ == "__main__":
+    main()
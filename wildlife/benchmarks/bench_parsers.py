@@ -0,0 +1,77 @@
+# Per-page time of the species extractors with each HTML parser backend, and
+# a check that every backend produces exactly the same items.
+#
+# run command (from the wildlife/ folder):
+#     python3 -m benchmarks.bench_parsers warc_cache/
+# Without WARC paths, pages are rendered from the JSON feeds instead.
+
+import argparse
+import json
+import os
+import time
+
+from benchmarks.corpus import load_corpus, render_page
+from wildlife.offline_extract import EXTRACTORS, iter_response_records, source_for_url
+from wildlife.utils.html_parser import BACKENDS, lxml_available, make_soup
+
+SOURCE_URLS = {
+    "WWF": "https://www.worldwildlife.org/species/",
+    "AWF": "https://awf.org/wildlife-conservation/",
+    "WT": "https://www.wildlifetrusts.org/wildlife-explorer/",
+}
+
+
+def load_pages(paths):
+    if paths:
+        pages = []
+        for url, html_bytes in iter_response_records(paths):
+            source = source_for_url(url or "")
+            if source:
+                pages.append((source, url, html_bytes.decode("utf-8", errors="ignore")))
+        return pages
+
+    pages = []
+    for doc in load_corpus():
+        url = SOURCE_URLS[doc["source"]] + str(len(pages))
+        pages.append((source_for_url(url), url, render_page(doc)))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    backends = [b for b in BACKENDS if b != "lxml" or lxml_available()]
+    outputs = {}
+
+    print(f"{len(pages)} pages")
+    for backend in backends:
+        os.environ["WILDLIFE_HTML_PARSER"] = backend
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, _, html in pages:
+                make_soup(html)
+        parse_ms = (time.perf_counter() - start) * 1000 / (args.repeat * len(pages))
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs[backend] = [EXTRACTORS[source](html, url) for source, url, html in pages]
+        extract_ms = (time.perf_counter() - start) * 1000 / (args.repeat * len(pages))
+
+        print(f"{backend:<12} parse {parse_ms:6.2f} ms/page   full extraction {extract_ms:6.2f} ms/page")
+
+    reference = [json.dumps(item, ensure_ascii=False) for item in outputs[backends[0]]]
+    for backend in backends[1:]:
+        other = [json.dumps(item, ensure_ascii=False) for item in outputs[backend]]
+        diffs = [pages[i][1] for i, (a, b) in enumerate(zip(reference, other)) if a != b]
+        print(f"{backend} vs {backends[0]}: {len(diffs)} pages with different output")
+        for url in diffs[:10]:
+            print(f"  {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Golden check and speed of the query-intent grammar (wildlife/query_intent.py)
+# against the frontend's former parse_query_intent (kept below as the
+# reference, which sent the first number of the query to every field whose
+# keyword appears anywhere in it), and how many feed documents the filter
+# queries of each version keep in the embedded search engine.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_query_intent
+
+import argparse
+import re
+import time
+
+from wildlife.query_intent import parse_query_intent, range_fq
+from wildlife.search_engine import SearchEngine
+
+# ---------------- reference: frontend/search_cli.py ----------------
+
+NUMERIC_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+
+FILTER_KEYWORDS = {
+    "weight": ["weight", "weigh", "kg", "kilogram"],
+    "size": ["size", "length", "height", "cm", "meter", "metre"],
+    "population": ["population", "pop", "individuals"],
+    "lifespan": ["lifespan", "age", "years"],
+}
+
+INTENT_FIELDS = {"weight": "weight_kg", "size": "length_cm", "population": "population"}
+
+
+def old_filter_queries(query):
+    query_lower = query.lower()
+    numbers = [float(n) for n in NUMERIC_PATTERN.findall(query_lower)]
+    fq = []
+    for key, keywords in FILTER_KEYWORDS.items():
+        if any(k in query_lower for k in keywords) and numbers and key in INTENT_FIELDS:
+            fq.append(range_fq(INTENT_FIELDS[key], numbers[0], numbers[0]))
+    return fq
+
+
+# query -> (text searched, [(field, low, high)])
+GOLDEN = {
+    "elephants over 2 tons living 60 years": ("elephants", [("weight_kg", 2000.0, "*"), ("lifespan_year", 60.0, 60.0)]),
+    "lions that weigh over 150 kg": ("lions", [("weight_kg", 150.0, "*")]),
+    "snakes longer than 6 ft": ("snakes", [("length_cm", 182.88, "*")]),
+    "birds with a wingspan between 1 and 2 m": ("birds with a wingspan", [("length_cm", 100.0, 200.0)]),
+    "animals under 500 g": ("animals", [("weight_kg", "*", 0.5)]),
+    "rhinos population under 5,000 individuals": ("rhinos", [("population", "*", 5000.0)]),
+    "species with fewer than 1 million left": ("species", [("population", "*", 1000000.0)]),
+    "gorilla 100-200 kg": ("gorilla", [("weight_kg", 100.0, 200.0)]),
+    "whales from 10 to 30 m long": ("whales", [("length_cm", 1000.0, 3000.0)]),
+    "animals heavier than 2000 lbs and older than 50": ("animals", [("weight_kg", 907.184, "*"), ("lifespan_year", 50.0, "*")]),
+    "mammals weighing about 5 kg": ("mammals", [("weight_kg", 5.0, 5.0)]),
+    "crocodile 5m long": ("crocodile", [("length_cm", 500.0, 500.0)]),
+    "top 10 big cats": ("top 10 big cats", []),
+    "animals from africa weighing 100 kg": ("animals from africa", [("weight_kg", 100.0, 100.0)]),
+    "grevy's zebra": ("grevy's zebra", []),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    failures = 0
+    for query, (text, filters) in GOLDEN.items():
+        intent = parse_query_intent(query)
+        if (intent["text"], intent["filters"]) != (text, filters):
+            failures += 1
+            print(f"MISMATCH {query!r}: {intent}")
+    print(f"{len(GOLDEN)} golden queries, {failures} mismatches")
+
+    engine = SearchEngine.from_feeds()
+
+    def kept(fqs):
+        mask = engine.all
+        for fq in fqs:
+            mask &= engine.filter_mask(fq)
+        return mask.bit_count()
+
+    print(f"documents kept by the filter queries alone ({len(engine.docs)} indexed), old -> new:")
+    for query in GOLDEN:
+        old = old_filter_queries(query)
+        new = [range_fq(*f) for f in parse_query_intent(query)["filters"]]
+        print(f"  {query!r:52} {len(old)} fq, {kept(old):3} docs -> {len(new)} fq, {kept(new):3} docs")
+
+    queries = list(GOLDEN)
+    for label, parse in (("old", old_filter_queries), ("new", parse_query_intent)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in queries:
+                parse(query)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed / (args.repeat * len(queries)) * 1e6:.1f} µs per query")
+
+
+if __name__ == "__main__":
+    main()
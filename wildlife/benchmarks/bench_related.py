@@ -0,0 +1,140 @@
+# "You might also like" as the frontend computed it per search
+# (compute_similarity over Solr-shaped documents, kept below as the
+# reference) vs. the neighbours index_to_solr.py now stores on every
+# document (wildlife/similarity.py). Checks both give the same top-k on the
+# feeds and times the index-time pass on the feeds and on a larger
+# synthetic corpus, then checks the NumPy engine (top_related_numpy) gives
+# the same neighbours and times it on corpora the Python loop is too slow for.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_related
+# (--numpy-docs 100000 for the full-size run, a few minutes)
+
+import argparse
+import re
+import time
+
+from benchmarks.corpus import load_corpus, synthetic_docs, zipf_docs
+from wildlife.similarity import TOP_K, numpy_available, top_related, top_related_numpy
+
+
+def safe_get(doc, key, default=""):
+    val = doc.get(key, default)
+    if isinstance(val, list) and val:
+        return val[0]
+    if val is None:
+        return default
+    return val
+
+
+def text_similarity(a, b):
+    if not a or not b:
+        return 0.0
+
+    tokens_a = set(re.findall(r"\w+", a.lower()))
+    tokens_b = set(re.findall(r"\w+", b.lower()))
+
+    if not tokens_a or not tokens_b:
+        return 0.0
+
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def range_overlap(a_min, a_max, b_min, b_max):
+    if "" in (a_min, a_max, b_min, b_max):
+        return 0.0
+
+    a_min, a_max = float(a_min), float(a_max)
+    b_min, b_max = float(b_min), float(b_max)
+
+    overlap = max(0, min(a_max, b_max) - max(a_min, b_min))
+    span = max(a_max - a_min, b_max - b_min)
+
+    return overlap / span if span > 0 else 0.0
+
+
+def compute_similarity(base, cand):
+    score = 0.0
+    score += 0.4 * text_similarity(safe_get(base, "overview"), safe_get(cand, "overview"))
+    if safe_get(base, "animal_type") == safe_get(cand, "animal_type"):
+        score += 0.3
+    score += 0.2 * range_overlap(
+        safe_get(base, "length_cm_min"), safe_get(base, "length_cm_max"),
+        safe_get(cand, "length_cm_min"), safe_get(cand, "length_cm_max"),
+    )
+    return score
+
+
+def reference_related(docs, k):
+    related = []
+    for doc in docs:
+        scored = [(compute_similarity(doc, cand), j) for j, cand in enumerate(docs) if cand["id"] != doc["id"]]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        related.append([j for _, j in scored[:k]])
+    return related
+
+
+def as_solr(doc):
+    # Solr returns the schemaless fields (animal_type, the numbers) as lists
+    doc = dict(doc, id=doc["url"])
+    for key in ("animal_type", "length_cm_min", "length_cm_max"):
+        if key in doc:
+            doc[key] = [doc[key]]
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=2000, help="size of the synthetic corpus")
+    parser.add_argument(
+        "--numpy-docs", type=int, nargs="*", default=[20_000],
+        help="sizes of the Zipf corpora the NumPy engine alone is timed on",
+    )
+    args = parser.parse_args()
+
+    docs = [as_solr(doc) for doc in load_corpus()]
+
+    start = time.perf_counter()
+    expected = reference_related(docs, TOP_K)
+    reference_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = top_related(docs, TOP_K)
+    index_s = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"{len(docs)} feed documents: identical top-{TOP_K} neighbours")
+    print(f"frontend scoring, all docs  {reference_s * 1000:8.1f} ms")
+    print(f"index-time top_related      {index_s * 1000:8.1f} ms")
+
+    synthetic = [as_solr(doc) for doc in synthetic_docs(args.docs)]
+    start = time.perf_counter()
+    top_related(synthetic, TOP_K)
+    elapsed = time.perf_counter() - start
+    print(f"{args.docs} synthetic documents: {elapsed:.1f}s ({args.docs * (args.docs - 1) / elapsed:.0f} pairs/sec)")
+
+    if not numpy_available():
+        print("numpy not installed, NumPy engine skipped")
+        return
+
+    assert top_related_numpy(docs, TOP_K) == expected
+    # distinct overviews, so ties are rare and the token counts matter
+    zipf = [as_solr(doc) for doc in zipf_docs(args.docs)]
+    start = time.perf_counter()
+    expected = top_related(zipf, TOP_K)
+    python_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = top_related_numpy(zipf, TOP_K)
+    numpy_s = time.perf_counter() - start
+    assert actual == expected
+    print(f"{args.docs} Zipf documents: identical neighbours, top_related {python_s:.1f}s, top_related_numpy {numpy_s:.1f}s")
+
+    for n in args.numpy_docs:
+        zipf = [as_solr(doc) for doc in zipf_docs(n)]
+        start = time.perf_counter()
+        top_related_numpy(zipf, TOP_K)
+        elapsed = time.perf_counter() - start
+        print(f"{n} Zipf documents: top_related_numpy {elapsed:.1f}s ({n * (n - 1) / elapsed:.0f} pairs/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Tokens per second of clean_text as it used to work (lowercasing each token
+# twice, no lemma memo) vs. the memoized clean_text and the batched
+# clean_texts, over the raw overview texts of the three feeds. Needs the NLTK
+# data (python3 -m nltk.downloader punkt_tab stopwords wordnet).
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_text_cleaner
+
+import argparse
+import time
+
+from benchmarks.corpus import load_corpus
+from wildlife.utils.text_cleaner import PUNCT, clean_text, clean_texts, lemmatize, load_resources
+
+
+def legacy_clean_text(text):
+    if not text:
+        return []
+
+    stopwords, lemm, word_tokenize = load_resources()
+    tokens = word_tokenize(text)
+
+    cleaned = [
+        lemm.lemmatize(t.lower())
+        for t in tokens
+        if t.lower() not in stopwords and t not in PUNCT
+    ]
+
+    return " ".join(cleaned)
+
+
+def rate(label, fn, texts, tokens, repeat):
+    lemmatize.cache_clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {tokens * repeat / elapsed:10.0f} tokens/sec")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = []
+    for doc in load_corpus():
+        for field in ("dirty_overview", "why_they_matter", "summary", "how_to_identify", "distribution", "did_you_know"):
+            if doc.get(field):
+                texts.append(doc[field])
+
+    word_tokenize = load_resources()[2]
+    tokens = sum(len(word_tokenize(t)) for t in texts)
+    print(f"{len(texts)} texts, {tokens} tokens")
+
+    legacy = rate("legacy clean_text", lambda ts: [legacy_clean_text(t) for t in ts], texts, tokens, args.repeat)
+    single = rate("memoized clean_text", lambda ts: [clean_text(t) for t in ts], texts, tokens, args.repeat)
+    batch = rate("clean_texts", clean_texts, texts, tokens, args.repeat)
+
+    assert legacy == single == batch
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# detect_type as it used to work (one substring scan per keyword and
+# uncompiled re.search per scientific-name pattern, on every call) vs. the
+# precompiled single-pass matcher, on the overview texts of the three feeds.
+#
+# run command (from the wildlife/ folder): python3 -m benchmarks.bench_type_detector
+
+import argparse
+import re
+import time
+from collections import defaultdict
+
+from benchmarks.corpus import load_corpus
+from wildlife.utils import type_detector
+from wildlife.utils.type_detector import KEYWORD_TABLE, SCI_PATTERNS, category_scores, detect_types_batch
+
+
+def legacy_scores(text):
+    t = text.lower()
+    scores = defaultdict(int)
+
+    for category, weight, keywords in KEYWORD_TABLE:
+        for k in list(keywords):
+            if k in t:
+                scores[category] += weight
+
+    for category, patterns in SCI_PATTERNS.items():
+        for p in patterns:
+            if re.search(p, t):
+                scores[category] += 2
+
+    return scores
+
+
+def legacy_detect_type(text):
+    if not text:
+        return None
+    original = type_detector.category_scores
+    type_detector.category_scores = legacy_scores
+    try:
+        return type_detector.detect_type(text)
+    finally:
+        type_detector.category_scores = original
+
+
+def timed(fn, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(texts)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    texts = [doc["dirty_overview"] for doc in load_corpus() if doc.get("dirty_overview")]
+
+    for text in texts:
+        old = {k: v for k, v in legacy_scores(text).items() if v}
+        new = {k: v for k, v in category_scores(text).items() if v}
+        assert old == new, (text[:60], old, new)
+    assert [legacy_detect_type(t) for t in texts] == detect_types_batch(texts)
+
+    print(f"{len(texts)} overview texts, {sum(map(len, texts)) / len(texts):.0f} chars on average; identical scores")
+    old_us = timed(lambda ts: [legacy_detect_type(t) for t in ts], texts, args.repeat)
+    new_us = timed(lambda ts: [type_detector.detect_type(t) for t in ts], texts, args.repeat)
+    batch_us = timed(detect_types_batch, texts, args.repeat)
+    print(f"legacy scan         {old_us:7.1f} us/text")
+    print(f"compiled matcher    {new_us:7.1f} us/text  ({old_us / new_us:.1f}x)")
+    print(f"detect_types_batch  {batch_us:7.1f} us/text  ({old_us / batch_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
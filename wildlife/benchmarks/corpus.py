@@ -0,0 +1,148 @@
+# Helpers shared by the benchmarks: the real species feeds and synthetic
+# corpora of arbitrary size derived from them.
+
+import copy
+import itertools
+import json
+import os
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEEDS = [
+    ("wildlifetrusts.json", "WT"),
+    ("awf.json", "AWF"),
+    ("wwf.json", "WWF"),
+]
+
+
+def feed_path(name):
+    return os.path.join(ROOT, name)
+
+
+def load_corpus():
+    docs = []
+    for name, source in FEEDS:
+        with open(feed_path(name), "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                item["source"] = source
+                docs.append(item)
+    return docs
+
+
+def synthetic_docs(n, base=None):
+    # Cycles through the real documents, giving every copy a unique url
+    base = base or load_corpus()
+    for i in range(n):
+        doc = copy.deepcopy(base[i % len(base)])
+        doc["url"] = f"{doc['url']}#{i}"
+        yield doc
+
+
+def zipf_docs(n, vocabulary=60_000, words=60, seed=1):
+    # Documents with distinct overviews: word ranks follow Zipf's law as in
+    # real text (copies of the feeds would share all their tokens). Some
+    # documents lack an overview, a type or a length, as in the feeds.
+    rnd = random.Random(seed)
+    tokens = [f"w{i}" for i in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary + 1)))
+    types = sorted({doc.get("animal_type") for doc in load_corpus()} - {None})
+
+    for i in range(n):
+        doc = {"url": f"https://example.org/species/{i}", "name": f"Species {i}"}
+        if rnd.random() > 0.05:
+            doc["overview"] = " ".join(rnd.choices(tokens, cum_weights=cum_weights, k=words))
+        if rnd.random() > 0.1:
+            doc["animal_type"] = rnd.choice(types)
+        if rnd.random() > 0.3:
+            low = 10 ** rnd.uniform(0, 3)
+            doc["length_cm_min"] = round(low, 1)
+            doc["length_cm_max"] = round(low * rnd.uniform(1, 3), 1)
+        yield doc
+
+
+def write_json_array(path, docs):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, doc in enumerate(docs):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(doc, indent=2, ensure_ascii=False))
+        f.write("\n]")
+
+
+def write_json_lines(path, docs):
+    with open(path, "w", encoding="utf-8") as f:
+        for doc in docs:
+            f.write(json.dumps(doc, ensure_ascii=False))
+            f.write("\n")
+
+
+def _paragraphs(value):
+    if isinstance(value, list):
+        return "".join(f"<p>{v}</p>" for v in value)
+    return f"<p>{value}</p>" if value else ""
+
+
+def render_page(doc):
+    # Rebuilds a page with the markup each extractor looks for from a feed
+    # document, for benchmarks that need HTML but have no WARC files at hand
+    source = doc.get("source")
+    name = doc.get("name", "")
+    overview = doc.get("dirty_overview", "")
+
+    if source == "WWF":
+        facts = "".join(
+            f'<li><strong class="hdr">{label}</strong><div>{doc[key]}</div></li>'
+            for label, key in [
+                ("Status", "status"), ("Population", "raw_population"),
+                ("Scientific Name", "scientific_name"), ("Weight", "raw_weight"),
+                ("Length", "raw_length"), ("Habitats", "habitats"), ("Places", "places"),
+            ]
+            if doc.get(key)
+        )
+        return f"""<html><head><title>{name} | WWF</title></head><body>
+<div id="content"><img src="{doc.get('image_url', '')}"></div>
+<ul class="list-data">{facts}</ul>
+<div id="overview"><p>{overview}</p></div>
+<div id="threats"><div class="lead wysiwyg">{_paragraphs(doc.get('threats'))}</div></div>
+<div id="why-they-matter"><p>{doc.get('why_they_matter', '')}</p></div>
+<div class="carousel">{''.join(f'<a><strong class="name">{r}</strong></a>' for r in doc.get('related_species', []))}</div>
+</body></html>"""
+
+    if source == "AWF":
+        facts = "".join(
+            f'<div class="paragraph--type--facts"><div class="field--name-field-facts-label">{label}</div>'
+            f'<div class="field--name-field-facts-description">{doc[key]}</div></div>'
+            for label, key in [
+                ("Habitat", "location"), ("Weight", "raw_weight"), ("Size", "raw_length"),
+                ("Life span", "raw_lifespan"), ("Diet", "diet"), ("Gestation", "raw_gestation"),
+                ("Predators", "predators"), ("Scientific name", "scientific_name"),
+            ]
+            if doc.get(key)
+        )
+        return f"""<html><body>
+<h1 class="views-field-title"><span class="field-content">{name}</span></h1>
+<div id="overview"><p>{overview}</p>{facts}</div>
+<div class="field--name-field-challenges">{_paragraphs(doc.get('threats'))}</div>
+{''.join(f'<div class="paragraph--type--overview-facts"><div class="field--name-field-overview-facts-top">{f}</div></div>' for f in doc.get('facts', []))}
+<picture><source srcset="/img/{name}.webp 1x"></picture>
+</body></html>"""
+
+    sections = "".join(
+        f'<div class="field {css}"><{tag}>{label}</{tag}>{doc[key]}</div>'
+        for css, tag, label, key in [
+            ("species-scientific-name", "h3", "Scientific name", "scientific_name"),
+            ("species-conservation-status", "h3", "Conservation status", "conservation_status"),
+            ("species-statistics", "h3", "Statistics", "raw_statistics"),
+            ("species-about", "h2", "About", "dirty_overview"),
+            ("species-identify", "h2", "How to identify", "how_to_identify"),
+            ("species-distribution", "h2", "Distribution", "distribution"),
+            ("species-did-you-know", "h2", "Did you know?", "did_you_know"),
+        ]
+        if doc.get(key)
+    )
+    return f"""<html><head><title>{name} | The Wildlife Trusts</title></head><body>
+<div class="node__header--species"><picture><source srcset="/img/{name}.webp 1x"></picture></div>
+<div class="species-summary">{doc.get('summary', '')}</div>
+{sections}
+</body></html>"""
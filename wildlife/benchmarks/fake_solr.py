@@ -0,0 +1,237 @@
+# Minimal in-process stand-in for Solr's JSON /update and /select handlers
+# and the Collections API (CREATE, DELETE, LIST, CREATEALIAS, LISTALIASES),
+# used by the indexing benchmarks so they can run without a Solr install.
+#
+#     with FakeSolr(latency=0.005) as solr:
+#         client = SolrClient(solr.url)
+#         ...
+#         solr.calls, solr.updates, solr.collections["wild_life"]
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+        self.pending = {}
+        self.pending_deletes = set()
+        self.delete_all_pending = False
+        self.commits = 0
+
+    def add(self, docs):
+        for doc in docs:
+            self.pending[doc["id"]] = doc
+            self.pending_deletes.discard(doc["id"])
+
+    def delete(self, spec):
+        if isinstance(spec, dict) and spec.get("query") == "*:*":
+            self.delete_all_pending = True
+            self.pending.clear()
+            self.pending_deletes.clear()
+            return
+
+        if isinstance(spec, list):
+            ids = spec
+        elif isinstance(spec, dict):
+            ids = [spec["id"]]
+        else:
+            ids = [spec]
+
+        for doc_id in ids:
+            self.pending.pop(doc_id, None)
+            self.pending_deletes.add(doc_id)
+
+    def commit(self):
+        if self.delete_all_pending:
+            self.docs.clear()
+            self.delete_all_pending = False
+        for doc_id in self.pending_deletes:
+            self.docs.pop(doc_id, None)
+        self.docs.update(self.pending)
+        self.pending.clear()
+        self.pending_deletes.clear()
+        self.commits += 1
+
+    def rollback(self):
+        self.delete_all_pending = False
+        self.pending.clear()
+        self.pending_deletes.clear()
+
+
+class FakeSolr:
+    def __init__(self, latency=0.0, fail_when=None, collections=("wild_life",)):
+        # fail_when(collection, payload) -> True makes that /update call return 500
+        self.latency = latency
+        self.fail_when = fail_when
+        self.collections = {name: FakeCollection() for name in collections}
+        self.aliases = {}
+        self.calls = []
+        # (collection, payload) of every /update call that was applied
+        self.updates = []
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/solr"
+
+    @property
+    def url(self):
+        return f"{self.base_url}/wild_life"
+
+    def __enter__(self):
+        handler = type("Handler", (_Handler,), {"solr": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def resolve(self, name):
+        return self.collections.get(self.aliases.get(name, name))
+
+    def handle_update(self, name, params, payload):
+        if self.fail_when and self.fail_when(name, payload):
+            return 500, {"error": {"msg": "injected failure"}}
+
+        coll = self.resolve(name)
+        if coll is None:
+            return 404, {"error": {"msg": f"no such collection {name}"}}
+
+        with self.lock:
+            self.updates.append((name, payload))
+            if isinstance(payload, list):
+                coll.add(payload)
+            else:
+                for key, value in payload.items():
+                    if key == "add":
+                        coll.add([value["doc"]] if "doc" in value else value)
+                    elif key == "delete":
+                        coll.delete(value)
+                    elif key == "commit":
+                        coll.commit()
+                    elif key == "rollback":
+                        coll.rollback()
+
+            if params.get("commit") == "true":
+                coll.commit()
+
+        return 200, {"responseHeader": {"status": 0}}
+
+    def handle_select(self, name, params):
+        coll = self.resolve(name)
+        if coll is None:
+            return 404, {"error": {"msg": f"no such collection {name}"}}
+
+        with self.lock:
+            docs = list(coll.docs.values())
+
+        body = {"response": {"numFound": len(docs), "start": 0, "docs": []}}
+        if params.get("facet") == "true":
+            fields = {}
+            for field in params.get("facet.field", []):
+                counts = {}
+                for doc in docs:
+                    value = doc.get(field)
+                    if value is not None:
+                        counts[value] = counts.get(value, 0) + 1
+                flat = []
+                for value, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+                    flat += [value, count]
+                fields[field] = flat
+            body["facet_counts"] = {"facet_fields": fields}
+        return 200, body
+
+    def handle_collections_api(self, params):
+        action = params.get("action", "").upper()
+        name = params.get("name")
+
+        with self.lock:
+            if action == "LIST":
+                return 200, {"collections": sorted(self.collections)}
+            if action == "LISTALIASES":
+                return 200, {"aliases": dict(self.aliases)}
+            if action == "CREATE":
+                if name in self.collections or name in self.aliases:
+                    return 400, {"error": {"msg": f"collection already exists: {name}"}}
+                self.collections[name] = FakeCollection()
+                return 200, {"success": {}}
+            if action == "DELETE":
+                if name not in self.collections:
+                    return 400, {"error": {"msg": f"could not find collection: {name}"}}
+                if name in self.aliases.values():
+                    return 400, {"error": {"msg": f"collection {name} is referenced by an alias"}}
+                del self.collections[name]
+                return 200, {"success": {}}
+            if action == "CREATEALIAS":
+                if name in self.collections:
+                    return 400, {"error": {"msg": f"cannot create alias {name}: a collection has that name"}}
+                self.aliases[name] = params["collections"]
+                return 200, {"success": {}}
+
+        return 400, {"error": {"msg": f"unsupported action {action}"}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    solr = None
+
+    def log_message(self, *args):
+        pass
+
+    def _params(self):
+        query = parse_qs(urlparse(self.path).query)
+        return {k: v if k == "facet.field" else v[-1] for k, v in query.items()}
+
+    def _route(self):
+        parts = urlparse(self.path).path.strip("/").split("/")
+        # /solr/<collection>/<handler> or /solr/admin/<api>
+        return parts[1] if len(parts) > 1 else "", parts[2] if len(parts) > 2 else ""
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"null")
+        name, handler = self._route()
+        params = self._params()
+
+        if self.solr.latency:
+            time.sleep(self.solr.latency)
+
+        with self.solr.lock:
+            self.solr.calls.append(("POST", name, handler, params))
+
+        if handler == "update":
+            self._send(*self.solr.handle_update(name, params, payload))
+        else:
+            self._send(404, {"error": {"msg": "unknown handler"}})
+
+    def do_GET(self):
+        name, handler = self._route()
+        params = self._params()
+
+        with self.solr.lock:
+            self.solr.calls.append(("GET", name, handler, params))
+
+        if name == "admin" and handler == "collections":
+            self._send(*self.solr.handle_collections_api(params))
+        elif handler == "select":
+            self._send(*self.solr.handle_select(name, params))
+        else:
+            self._send(404, {"error": {"msg": "unknown handler"}})
@@ -1,33 +1,156 @@
+import asyncio
 import json
-import requests
 from pyscript import document, when, window
+from pyodide.ffi import create_proxy
+from pyodide.http import pyfetch
 from js import console
 import re
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlencode
+
+# wildlife/query_intent.py and wildlife/autocomplete.py, copied next to this
+# file by index.html's py-config
+from autocomplete import Autocomplete
+from query_intent import parse_query_intent, range_fq
 
 
 def show_for_you(user_profile):
     return
 
 
-def dom_ready():
+def on_dom_ready(event=None):
     ls = window.localStorage
     show_for_you(ls.getItem("user_profile"))
-    return document.readyState == "complete"
 
-while not dom_ready():
-    pass
+if document.readyState == "loading":
+    document.addEventListener("DOMContentLoaded", create_proxy(on_dom_ready))
+else:
+    on_dom_ready()
 
 SOLR_URL = "http://localhost:8983/solr/wild_life/select"
 
-NUMERIC_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+CACHE_SIZE = 100
+CACHE_TTL = 300  # seconds
+CACHE_STORAGE_KEY = "wildlife_select_cache"
+
+
+class QueryCache:
+    # Solr select responses by request params. The least recently used entry
+    # is evicted beyond max_entries, entries expire after ttl seconds, and the
+    # cache is mirrored to localStorage so reloads and back/forward browsing
+    # reuse it.
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, storage=None, storage_key=CACHE_STORAGE_KEY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.storage = storage
+        self.storage_key = storage_key
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def key(params):
+        # the same search whatever the whitespace in q or the order of fq / fl
+        normalized = {}
+        for name, value in params.items():
+            if name == "q":
+                value = " ".join(str(value).split())
+            elif name == "fq":
+                value = sorted([value] if isinstance(value, str) else value)
+            elif name == "fl":
+                value = sorted(value.split(","))
+            normalized[name] = value
+        return json.dumps(normalized, sort_keys=True)
+
+    def get(self, params):
+        key = self.key(params)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] < time.time():
+            del self.entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, params, data):
+        key = self.key(params)
+        self.entries[key] = (time.time() + self.ttl, data)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.save()
+
+    def load(self):
+        if self.storage is None:
+            return
+        raw = self.storage.getItem(self.storage_key)
+        if not raw:
+            return
+        now = time.time()
+        entries = OrderedDict()
+        try:
+            for key, expires, data in json.loads(raw)[-self.max_entries:]:
+                if expires > now:
+                    entries[key] = (expires, data)
+        except (ValueError, TypeError, KeyError):
+            # written by another version or corrupted: start empty
+            self.storage.removeItem(self.storage_key)
+            return
+        self.entries = entries
+
+    def save(self):
+        if self.storage is None:
+            return
+        entries = [[key, expires, data] for key, (expires, data) in self.entries.items()]
+        try:
+            self.storage.setItem(self.storage_key, json.dumps(entries))
+        except Exception:
+            # storage full or disabled: the in-memory cache still works
+            pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
 
-FILTER_KEYWORDS = {
-    "weight": ["weight", "weigh", "kg", "kilogram"],
-    "size": ["size", "length", "height", "cm", "meter", "metre"],
-    "population": ["population", "pop", "individuals"],
-    "lifespan": ["lifespan", "age", "years"],
-}
+
+search_cache = QueryCache(storage=window.localStorage)
+# diagnostics from the browser console: JSON.parse(searchCacheStats())
+window.searchCacheStats = create_proxy(lambda: json.dumps(search_cache.stats()))
+
+
+async def select(params):
+    # Solr select through search_cache; None when Solr answers with an error.
+    # Awaiting the fetch lets the browser (and other requests) run meanwhile.
+    data = search_cache.get(params)
+    if data is not None:
+        return data
+
+    resp = await pyfetch(f"{SOLR_URL}?{urlencode(params, doseq=True)}")
+    try:
+        data = await resp.json()
+    except Exception:
+        console.error("Invalid JSON from Solr")
+        return None
+
+    if "error" in data:
+        console.error("Solr error:", data["error"]["msg"])
+        return None
+
+    search_cache.put(params, data)
+    return data
 
 def safe_get(doc, key, default=""):
     val = doc.get(key, default)
@@ -85,23 +208,6 @@ def detect_source(url: str):
         }
 
 
-def parse_query_intent(query):
-    query_lower = query.lower()
-
-    numbers = [float(n) for n in NUMERIC_PATTERN.findall(query_lower)]
-
-    intent = {
-        "text": query,
-        "numeric": numbers,
-        "filters": {}
-    }
-
-    for key, keywords in FILTER_KEYWORDS.items():
-        if any(k in query_lower for k in keywords) and numbers:
-            intent["filters"][key] = numbers
-
-    return intent
-
 def cluster_by_animal_type(results):
     clusters = defaultdict(lambda: {"count": 0, "docs": []})
 
@@ -168,7 +274,7 @@ def compute_similarity(base, cand):
     return score
 
 
-def fetch_related(doc, rows=30):
+async def fetch_related(doc, rows=30):
 
     animal_type = doc.get("animal_type", ['Animal'])
 
@@ -185,8 +291,7 @@ def fetch_related(doc, rows=30):
         "wt": "json"
     }
 
-    resp = requests.get(SOLR_URL, params=params)
-    data = resp.json()
+    data = await select(params) or {}
 
     # console.log(
     #     "docs:",
@@ -196,9 +301,11 @@ def fetch_related(doc, rows=30):
     return data.get("response", {}).get("docs", [])
 
 
-def show_related(doc):
+async def rank_related(doc, limit=7):
+    # fallback for an index built without related_docs: one Solr request and
+    # a rescoring pass in the browser
 
-    candidates = fetch_related(doc)
+    candidates = await fetch_related(doc)
     scored = []
     for cand in candidates:
         if cand.get("id") == doc.get("id"):
@@ -210,14 +317,18 @@ def show_related(doc):
     # sort based on similarity
     scored.sort(key=lambda x: x[0], reverse=True)
 
+    return [pair[1] for pair in scored[:limit]]
+
 
-    limit = 7
-    reccomended = []
+async def related_for(doc):
+    # neighbours precomputed by index_to_solr.py, stored on the doc itself
+    payload = safe_get(doc, "related_docs", None)
+    if payload:
+        return json.loads(payload)
+    return await rank_related(doc)
 
-    for pair in scored[:limit]:
-        doc = pair[1]
-        reccomended.append(doc)
 
+def show_related(doc, reccomended):
 
     results_container = document.querySelector(".reccomended-results")
     results_container.innerHTML = f"<h2>You might also like, based on {safe_get(doc, "animal_type")}</h2>"
@@ -250,31 +361,65 @@ def show_related(doc):
         results_container.appendChild(item)
 
 
-def search(query, rows=10):
-    intent = parse_query_intent(query)
+# the sidebar range filters: their div ids in index.html are the Solr field
+# prefixes
+RANGE_FILTERS = ["weight_kg", "length_cm", "population"]
+
+
+def bound(value):
+    # a number input's value, or * when it is empty
+    return float(value) if value not in (None, "") else "*"
+
 
+def ui_filter_queries():
+    # the enabled sidebar filters as Solr filter queries
     fq = []
 
-    if "weight" in intent["filters"]:
-        v = intent["filters"]["weight"][0]
-        fq.append(
-            f"weight_kg_min:[* TO {v}] AND weight_kg_max:[{v} TO *]"
+    for field in RANGE_FILTERS:
+        if not is_filter_enabled(field):
+            continue
+        div = document.querySelector(f"#{field}")
+        low = bound(div.querySelector(".min-input").value)
+        high = bound(div.querySelector(".max-input").value)
+        fq.append(range_fq(field, low, high))
+
+    if is_filter_enabled("animal-type"):
+        checkboxes = document.querySelectorAll(
+            "#animal-type .animal-type-options input[type='checkbox']"
         )
+        selected = [cb.value for cb in checkboxes if cb.checked]
+        # no box checked: no filter, an empty terms list would match nothing
+        if selected:
+            fq.append("{!terms f=animal_type}" + ",".join(selected))
 
-    if "size" in intent["filters"]:
-        v = intent["filters"]["size"][0]
-        fq.append(
-            f"length_cm_min:[* TO {v}] AND length_cm_max:[{v} TO *]"
-        )
+    return fq
 
-    if "population" in intent["filters"]:
-        v = intent["filters"]["population"][0]
-        fq.append(
-            f"population_min:[* TO {v}] AND population_max:[{v} TO *]"
-        )
+
+# "topics" from facet counts over the whole result set, each cluster's docs
+# fetched when it is first expanded; False groups the rest of a 10-row page
+# with cluster_by_animal_type instead
+FACET_CLUSTERS = True
+FACET_FIELDS = ["animal_type", "source"]
+CLUSTER_ROWS = 10
+
+SOURCE_NAMES = {
+    "AWF": "African Wildlife Foundation",
+    "WWF": "World Wildlife Fund",
+    "WT": "The Wildlife Trusts",
+}
+
+
+def search_params(query, rows=10, filters=()):
+    # numeric conditions ("over 2 tons") become filter queries, the rest is
+    # the text searched
+    intent = parse_query_intent(query)
+
+    fq = list(filters)
+    for field, low, high in intent["filters"]:
+        fq.append(range_fq(field, low, high))
 
     params = {
-        "q": query if query.strip() else "*:*",
+        "q": intent["text"] if intent["text"].strip() else "*:*",
         "defType": "edismax",
         "qf": "name^8 scientific_name^6 summary^4 overview^4 habitats^2 distribution^2 facts^1.5 threats^1 diet^1",
         "pf": "name^12 scientific_name^8",
@@ -287,7 +432,7 @@ def search(query, rows=10):
             "length_cm_min", "length_cm_max",
             "lifespan_year_min", "lifespan_year_max",
             "population_min", "population_max",
-            "how_to_identify", "summary", "overview"
+            "how_to_identify", "summary", "overview", "related_docs"
         ]),
         "wt": "json"
     }
@@ -295,294 +440,291 @@ def search(query, rows=10):
     if fq:
         params["fq"] = fq
 
-    resp = requests.get(SOLR_URL, params=params)
-    try:
-        data = resp.json()
-    except Exception:
-        console.error("Invalid JSON from Solr")
-        return []
+    return params
 
-    if "error" in data:
-        console.error("Solr error:", data["error"]["msg"])
+
+async def search(query, rows=10, filters=()):
+    data = await select(search_params(query, rows, filters))
+    if data is None:
         return []
 
     return data.get("response", {}).get("docs", [])
 
 
+async def facet_search(query, rows, filters=()):
+    # the top `rows` docs, plus (value, count) pairs of every FACET_FIELDS
+    # field over all the matching docs
+    params = search_params(query, rows, filters)
+    params.update({
+        "facet": "true",
+        "facet.field": FACET_FIELDS,
+        "facet.mincount": 1,
+        "facet.limit": -1,
+    })
+
+    data = await select(params)
+    if data is None:
+        return [], {}
+
+    flat = data.get("facet_counts", {}).get("facet_fields", {})
+    facets = {field: list(zip(values[::2], values[1::2])) for field, values in flat.items()}
+    return data.get("response", {}).get("docs", []), facets
+
+
 searchbar = document.querySelector("#search")
 searchbtn = document.querySelector("#search-btn")
 
 
 
-@when("click", searchbtn)
-def on_search_click(event):
+def render_result(doc):
+    source = detect_source(safe_get(doc, "url")) or {
+        "logo": "../resources/images/wf_basic_logo.png",
+        "name": "Unknown source"
+    }
 
+    weight = [doc.get("weight_kg_min"), doc.get("weight_kg_max")]
+    size = [doc.get("length_cm_min"), doc.get("length_cm_max")]
+    population = [doc.get("population_min"), doc.get("population_max")]
+
+    item = document.createElement("div")
+    item.className = "item"
+
+    item.innerHTML = f"""
+        <div class="logo">
+            <img class="logo-img" src="{source['logo']}" alt="{source['name']}">
+            <p>{source['name']}</p>
+        </div>
+
+        <div class="result">
+            <img class="animal-img"
+                src="{safe_get(doc, "image_url", "../resources/images/wf_basic_logo.png")}"
+                alt="{safe_get(doc, "name", "Unknown")}">
+            <div class="text">
+                <a href="{safe_get(doc, "url", "Unknown")}" target="_blank">
+                    {safe_get(doc, "name", "Unknown")} - {safe_get(doc, "scientific_name", "Unknown")}
+                </a>
+                <p class="overview">
+                    {safe_get(doc, "dirty_overview", "No overview available")}
+                </p>
+            </div>
+            <div class="animal-information">
+                <div class="animal-type-info">
+                    <p>Animal Type</p>
+                    <p>{safe_get(doc, "animal_type", "Unknown")}</p>
+                </div>
+                <div class="animal-weight">
+                    <p>Weight</p>
+                    <p>{format_stat(weight, "kg")}</p>
+                </div>
+                <div class="animal-size">
+                    <p>Lenght</p>
+                    <p>{format_stat(size, "cm")}</p>
+                </div>
+                <div class="animal-population">
+                    <p>Population</p>
+                    <p>{format_stat(population)}</p>
+                </div>
+            </div>
+        </div>
+    """
 
-    # filters
-    weight_div = document.querySelector("#weight_kg")
-    size_div = document.querySelector("#length_cm")
-    population_div = document.querySelector("#population")
-    min_class = ".min-input"
-    max_class = ".max-input"
-    animal_type_div = document.querySelector("#animal-type")
+    return item
 
-    weight_value_min = weight_div.querySelector(min_class).value
-    weight_value_max = weight_div.querySelector(max_class).value
-    weight_range = [float(weight_value_min), float(weight_value_max)]
 
-    size_value_min = size_div.querySelector(min_class).value
-    size_value_max = size_div.querySelector(max_class).value
-    size_range = [float(size_value_min), float(size_value_max)]
+def add_cluster(cluster_container, label):
+    toggle_btn = document.createElement("button")
+    toggle_btn.className = "filter-toggle"
+    toggle_btn.innerText = f"{label} ▼"
 
-    population_value_min = population_div.querySelector(min_class).value
-    population_value_max = population_div.querySelector(max_class).value
-    population_range = [float(population_value_min), float(population_value_max)]
+    cluster_div = document.createElement("div")
+    cluster_div.className = "cluster"
 
-    checkboxes = animal_type_div.querySelectorAll(
-        ".animal-type-options input[type='checkbox']"
-    )
+    cluster_container.appendChild(toggle_btn)
+    cluster_container.appendChild(cluster_div)
+    return toggle_btn, cluster_div
 
-    selected_types = [
-        cb.value
-        for cb in checkboxes
-        if cb.checked
-    ]
-    
-    query = searchbar.value
-    #console.log(f"Searching for: {query}")
 
-    results = search(query)
-    results_container = document.querySelector(".top-results")
-    results_container.innerHTML = '<h2 class="title">TOP RESULTS</h2>'
+def show_page_clusters(clusters):
+    cluster_container = document.querySelector("#topics-container")
+    cluster_container.innerHTML = ""
+    for animal_type, data in clusters:
+        _, cluster_div = add_cluster(cluster_container, animal_type)
 
-    
-    results_to_display = 3
-    clusters = cluster_by_animal_type(results=results[results_to_display:])
+        for doc in data["docs"]:
+            cluster_div.appendChild(render_result(doc))
 
-    for r in results[:results_to_display]:
 
-        # TODO also add to user profile
-       
-        show_related(r)
-            
-        source = detect_source(r.get("url", ""))
+# click handlers of the current clusters, released on the next search
+cluster_proxies = []
 
-        weight = [
-            r.get("weight_kg_min"),
-            r.get("weight_kg_max")
-        ]
 
-        size = [
-            r.get("length_cm_min"),
-            r.get("length_cm_max")
-        ]
+def cluster_loader(query, filters, animal_type, cluster_div):
+    loaded = []
 
-        population = [
-            r.get("population_min"),
-            r.get("population_max")
-        ]
+    async def load(event):
+        if loaded:
+            return
+        loaded.append(True)
 
-        animal_type = r.get("animal_type")
-        
-        if is_filter_enabled("weight_kg"):
-            if None in weight:
-                continue
+        fq = list(filters) + ["{!term f=animal_type}" + animal_type]
+        for doc in await search(query, CLUSTER_ROWS, fq):
+            cluster_div.appendChild(render_result(doc))
 
-            w_min = float(weight[0][0])
-            w_max = float(weight[1][0])
+    return load
 
-            if max(w_min, weight_range[0]) > min(w_max, weight_range[1]):
-                continue
-        
-        if is_filter_enabled("length_cm"):
-            if None in size:
-                continue
 
-            s_min = float(size[0][0])
-            s_max = float(size[1][0])
+def show_facet_clusters(query, filters, facets):
+    for proxy in cluster_proxies:
+        proxy.destroy()
+    cluster_proxies.clear()
 
-            if max(s_min, size_range[0]) > min(s_max, size_range[1]):
-                continue
-        
-        if is_filter_enabled("population"):
-            if None in population:
-                continue
+    cluster_container = document.querySelector("#topics-container")
+    cluster_container.innerHTML = ""
 
-            p_min = float(population[0][0])
-            p_max = float(population[1][0])
+    sources = facets.get("source", [])
+    if sources:
+        counts = document.createElement("p")
+        counts.className = "source-counts"
+        counts.innerText = " · ".join(f"{SOURCE_NAMES.get(s, s)}: {n}" for s, n in sources)
+        cluster_container.appendChild(counts)
 
-            if max(p_min, population_range[0]) > min(p_max, population_range[1]):
-                continue
+    for animal_type, count in facets.get("animal_type", []):
+        toggle_btn, cluster_div = add_cluster(cluster_container, f"{animal_type} ({count})")
 
-        if is_filter_enabled("animal-type"):
-            if animal_type is None:
-                continue
+        proxy = create_proxy(cluster_loader(query, filters, animal_type, cluster_div))
+        toggle_btn.addEventListener("click", proxy)
+        cluster_proxies.append(proxy)
 
-            type = animal_type[0]
 
-            if type not in selected_types:
-                continue
+# bumped by every search; a slower, older search stops rendering once a
+# newer one has started
+search_generation = 0
 
-        format_weight = format_stat(weight, "kg")
-        format_size = format_stat(size, "cm")
-        format_population = format_stat(population)
-        item = document.createElement("div")
-        item.className = "item"
 
-        item.innerHTML = f"""
-            <div class="logo">
-                <img class="logo-img" src="{source['logo']}" alt="{source['name']}">
-                <p>{source['name']}</p>
-            </div>
+@when("click", searchbtn)
+async def on_search_click(event):
+    global search_generation
+    search_generation += 1
+    generation = search_generation
 
-            <div class="result">
-                <img class="animal-img"
-                    src="{safe_get(r, "image_url", "../resources/images/wf_basic_logo.png")}"
-                    alt="{safe_get(r, "name", "Unknown")}">
-                <div class="text">
-                    <a href="{safe_get(r, "url", "Unknown")}" target="_blank">
-                        {safe_get(r, "name", "Unknown")} - {safe_get(r, "scientific_name", "Unknown")}
-                    </a>
-                    <p class="overview">
-                        {safe_get(r, "dirty_overview", "No overview available")}
-                    </p>
-                </div>
-                <div class="animal-information">
-                    <div class="animal-type-info">
-                        <p>Animal Type</p>
-                        <p>{animal_type[0]}</p>
-                    </div>
-                    <div class="animal-weight">
-                        <p>Weight</p>
-                        <p>{format_weight}</p>
-                    </div>
-                    <div class="animal-size">
-                        <p>Lenght</p>
-                        <p>{format_size}</p>
-                    </div>
-                    <div class="animal-population">
-                        <p>Population</p>
-                        <p>{format_population}</p>
-                    </div>
-                </div>
-            </div>
+    query = searchbar.value
+    #console.log(f"Searching for: {query}")
+
+    # the sidebar filters are applied by Solr, so every returned doc matches
+    # and a page is always full
+    filters = ui_filter_queries()
+    results_to_display = 3
+
+    if FACET_CLUSTERS:
+        results, facets = await facet_search(query, results_to_display, filters)
+    else:
+        results = await search(query, filters=filters)
+    console.debug("select cache:", json.dumps(search_cache.stats()))
+    if generation != search_generation:
+        return
+
+    top = results[:results_to_display]
+
+    # the related species of every top result are fetched concurrently
+    # (only needed for an index without related_docs) while the results
+    # and clusters are rendered
+    related = [asyncio.ensure_future(related_for(r)) for r in top]
+
+    results_container = document.querySelector(".top-results")
+    results_container.innerHTML = '<h2 class="title">TOP RESULTS</h2>'
+
+    for r in top:
+
+        # TODO also add to user profile
+
+        results_container.appendChild(render_result(r))
+
+    if FACET_CLUSTERS:
+        show_facet_clusters(query, filters, facets)
+    else:
+        show_page_clusters(cluster_by_animal_type(results=results[results_to_display:]))
+
+    # rendered in result order as they arrive; the section ends up showing
+    # the last top result's neighbours, as before
+    for r, pending in zip(top, related):
+        reccomended = await pending
+        if generation != search_generation:
+            return
+        show_related(r, reccomended)
+
+
+# typeahead: frontend/autocomplete.json (written by index_to_solr.py) is
+# fetched once, then every keystroke is a lookup in it, without Solr
+AUTOCOMPLETE_URL = "autocomplete.json"
+autocomplete = None
+suggestions_list = document.querySelector("#suggestions")
+suggestion_proxies = []
+
+
+async def load_autocomplete():
+    global autocomplete
+    try:
+        resp = await pyfetch(AUTOCOMPLETE_URL)
+        table = await resp.json() if resp.ok else None
+    except Exception:
+        table = None
+    if table is None:
+        console.warn("No autocomplete.json, run index_to_solr.py to build it")
+        return
+    autocomplete = Autocomplete(table)
+
+
+def hide_suggestions(event=None):
+    for proxy in suggestion_proxies:
+        proxy.destroy()
+    suggestion_proxies.clear()
+    suggestions_list.innerHTML = ""
+    suggestions_list.hidden = True
+
+
+def choose_suggestion(name):
+    def choose(event):
+        # mousedown, so it runs before the input's blur hides the list
+        event.preventDefault()
+        searchbar.value = name
+        hide_suggestions()
+        searchbtn.click()
+    return choose
+
+
+@when("input", searchbar)
+def on_search_input(event):
+    hide_suggestions()
+    if autocomplete is None:
+        return
+
+    for name, scientific_name, sources in autocomplete.suggest(searchbar.value):
+        item = document.createElement("li")
+        item.innerHTML = f"""
+            <span class="suggestion-name">{name}</span>
+            <span class="suggestion-scientific">{scientific_name}</span>
+            <span class="suggestion-sources">{", ".join(sources)}</span>
         """
+        proxy = create_proxy(choose_suggestion(name))
+        item.addEventListener("mousedown", proxy)
+        suggestion_proxies.append(proxy)
+        suggestions_list.appendChild(item)
 
-        results_container.appendChild(item)
+    suggestions_list.hidden = not suggestion_proxies
 
-    cluster_container = document.querySelector("#topics-container")
-    cluster_container.innerHTML = ""
-    for animal_type, data in clusters:
-        toggle_btn = document.createElement("button")
-        toggle_btn.className = "filter-toggle"
-        toggle_btn.innerText = f"{animal_type} ▼"
 
-        cluster_div = document.createElement("div")
-        cluster_div.className = "cluster"
+@when("blur", searchbar)
+def on_search_blur(event):
+    hide_suggestions()
 
-        cluster_container.appendChild(toggle_btn)
-        cluster_container.appendChild(cluster_div)
 
-        for doc in data["docs"]:
-            source = detect_source(safe_get(doc, "url"))
-
-            weight2 = [
-                doc.get("weight_kg_min"),
-                doc.get("weight_kg_max")
-            ]
-
-            size2 = [
-                doc.get("length_cm_min"),
-                doc.get("length_cm_max")
-            ]
-
-            population2 = [
-                doc.get("population_min"),
-                doc.get("population_max")
-            ]
-
-            animal_type2 = doc.get("animal_type")
-            
-            if is_filter_enabled("weight_kg"):
-                if None in weight2:
-                    continue
-
-                w_min2 = float(weight2[0][0])
-                w_max2 = float(weight2[1][0])
-
-                if max(w_min2, weight_range[0]) > min(w_max2, weight_range[1]):
-                    continue
-            
-            if is_filter_enabled("length_cm"):
-                if None in size2:
-                    continue
-
-                s_min2 = float(size2[0][0])
-                s_max2 = float(size2[1][0])
-
-                if max(s_min2, size_range[0]) > min(s_max2, size_range[1]):
-                    continue
-            
-            if is_filter_enabled("population"):
-                if None in population2:
-                    continue
-
-                p_min2 = float(population2[0][0])
-                p_max2 = float(population2[1][0])
-
-                if max(p_min2, population_range[0]) > min(p_max2, population_range[1]):
-                    continue
-
-            if is_filter_enabled("animal-type"):
-                if animal_type2 is None:
-                    continue
-
-                type2 = animal_type2[0]
-
-                if type2 not in selected_types:
-                    continue
-
-            format_weight2 = format_stat(weight2, "kg")
-            format_size2 = format_stat(size2, "cm")
-            format_population2 = format_stat(population2)
-            item = document.createElement("div")
-            item.className = "item"
-
-            item.innerHTML = f"""
-                <div class="logo">
-                    <img class="logo-img" src="{source['logo']}" alt="{source['name']}">
-                    <p>{source['name']}</p>
-                </div>
+@when("keydown", searchbar)
+def on_search_keydown(event):
+    if event.key == "Escape":
+        hide_suggestions()
+    elif event.key == "Enter":
+        hide_suggestions()
+        searchbtn.click()
 
-                <div class="result">
-                    <img class="animal-img"
-                        src="{safe_get(doc, "image_url", "../resources/images/wf_basic_logo.png")}"
-                        alt="{safe_get(doc, "name", "Unknown")}">
-                    <div class="text">
-                        <a href="{safe_get(doc, "url", "Unknown")}" target="_blank">
-                            {safe_get(doc, "name", "Unknown")} - {safe_get(doc, "scientific_name", "Unknown")}
-                        </a>
-                        <p class="overview">{safe_get(doc, "dirty_overview", "No overview available.")}</p>
-                    </div>
-                    <div class="animal-information">
-                        <div class="animal-type-info">
-                            <p>Animal Type</p>
-                            <p>{animal_type2[0]}</p>
-                        </div>
-                        <div class="animal-weight">
-                            <p>Weight</p>
-                            <p>{format_weight2}</p>
-                        </div>
-                        <div class="animal-size">
-                            <p>Lenght</p>
-                            <p>{format_size2}</p>
-                        </div>
-                        <div class="animal-population">
-                            <p>Population</p>
-                            <p>{format_population2}</p>
-                        </div>
-                    </div>
-                </div>
-            """
 
-            cluster_div.appendChild(item)
+asyncio.ensure_future(load_autocomplete())
@@ -1,47 +1,845 @@
+import argparse
+import hashlib
 import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import requests
+from requests.adapters import HTTPAdapter
 
-SOLR_URL = "http://localhost:8983/solr/wild_life"
+from wildlife.autocomplete import build_autocomplete
+from wildlife.merge import merge_group, merge_species
+from wildlife.similarity import ENGINES, FEATURE_FIELDS, RELATED_FIELDS, TOP_K, build_related, neighbours_engine
 
-def clear_index():
-    url = f"{SOLR_URL}/update?commit=true"
-    payload = {"delete": {"query": "*:*"}}
-    resp = requests.post(url, json=payload)
-    print("Delete all docs:", resp.status_code, resp.text)
+SOLR_BASE_URL = "http://localhost:8983/solr"
+COLLECTION = "wild_life"
+SOLR_URL = f"{SOLR_BASE_URL}/{COLLECTION}"
 
-def reset_collection():
-    print("Deleting all documents from Solr collection...")
+SOURCES = [
+    ("wildlifetrusts.json", "WT"),
+    ("awf.json", "AWF"),
+    ("wwf.json", "WWF"),
+]
 
-    delete_payload = {
-        "delete": {"query": "*:*"},
-        "commit": {}
-    }
+BATCH_SIZE = 500
+READ_CHUNK_SIZE = 64 * 1024
+WORKERS = 4
+MAX_IN_FLIGHT = 8
+MANIFEST_PATH = ".index_manifest.json"
+AUTOCOMPLETE_PATH = os.path.join("frontend", "autocomplete.json")
 
-    resp = requests.post(
-        "http://localhost:8983/solr/wild_life/update",
-        json=delete_payload
-    )
 
-    resp.raise_for_status()
+class SolrClient:
+    # Thin wrapper around the /update handler of one collection that reuses
+    # pooled keep-alive connections for every batch.
+
+    def __init__(self, solr_url=SOLR_URL, pool_size=4, timeout=120):
+        self.solr_url = solr_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def update(self, payload, **params):
+        resp = self.session.post(
+            f"{self.solr_url}/update",
+            params=params,
+            json=payload,
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def add(self, docs, commit_within=None):
+        params = {}
+        if commit_within is not None:
+            params["commitWithin"] = commit_within
+        return self.update(docs, **params)
+
+    def delete_all(self):
+        return self.update({"delete": {"query": "*:*"}})
+
+    def delete_ids(self, ids):
+        return self.update({"delete": list(ids)})
+
+    def commit(self):
+        return self.update({"commit": {}})
+
+    def rollback(self):
+        # drops the uncommitted adds and deletes (standalone Solr only)
+        return self.update({"rollback": {}})
+
+    def close(self):
+        self.session.close()
+
+
+def clear_index(client):
+    # not committed here: the delete becomes visible together with the new
+    # documents at the final commit, so searches never see an empty core
+    resp = client.delete_all()
+    print("Delete all docs:", resp.status_code)
+
+
+def reset_collection(client):
+    print("Deleting all documents from Solr collection...")
+
+    client.delete_all()
+    client.commit()
+
     print("Collection reset complete.")
 
 
-def index_file(path, source):
+def _skip_whitespace(buf, pos):
+    while pos < len(buf) and buf[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _check_array_end(f, buf, pos, chunk_size):
+    # only whitespace may follow the closing bracket: a re-appended file or
+    # two arrays in one would otherwise lose documents without an error
+    while True:
+        pos = _skip_whitespace(buf, pos)
+        if pos < len(buf):
+            raise ValueError(f"Unexpected content after the JSON array in {f.name}: {buf[pos:pos + 20]!r}")
+        buf = f.read(chunk_size)
+        pos = 0
+        if not buf:
+            return
+
+
+def _iter_json_array(f, buf, chunk_size):
+    # elements separated by exactly one comma, as json.load requires
+    decoder = json.JSONDecoder()
+    pos = buf.index("[") + 1
+    count = 0
+    expect_value = True
+
+    while True:
+        pos = _skip_whitespace(buf, pos)
+
+        if pos >= len(buf):
+            buf = f.read(chunk_size)
+            pos = 0
+            if not buf:
+                raise ValueError(f"Unterminated JSON array in {f.name}")
+            continue
+
+        char = buf[pos]
+        if not expect_value:
+            if char == "]":
+                _check_array_end(f, buf, pos + 1, chunk_size)
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' after element {count} in {f.name}, got {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        if char == "]" and not count:
+            _check_array_end(f, buf, pos + 1, chunk_size)
+            return
+        if char in ",]":
+            raise ValueError(f"Missing element after element {count} in {f.name}")
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # the document continues in the next chunk
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        if end == len(buf):
+            # a number may go on in the next chunk: decode it again with more
+            more = f.read(chunk_size)
+            if more:
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+
+        yield item
+        count += 1
+        pos = end
+        expect_value = False
+
+
+def _iter_json_lines(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_documents(path, chunk_size=READ_CHUNK_SIZE):
+    # Yields the documents of a JSON array file or a JSON Lines file one at a
+    # time without loading the whole file.
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        # the leading whitespace may be longer than a chunk
+        while buf and not buf.lstrip():
+            buf = f.read(chunk_size)
+
+        if buf.lstrip().startswith("["):
+            yield from _iter_json_array(f, buf, chunk_size)
+        else:
+            f.seek(0)
+            yield from _iter_json_lines(f)
+
+
+def prepare_document(item, source):
+    item["id"] = item.get("url")
+    item["source"] = source
+    return item
+
+
+def iter_batches(docs, batch_size):
+    docs = iter(docs)
+    while True:
+        batch = list(islice(docs, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_source_batches(path, source, batch_size=BATCH_SIZE, doc_filter=None):
+    docs = (prepare_document(item, source) for item in iter_documents(path))
+    if doc_filter:
+        docs = doc_filter(docs)
+    return iter_batches(docs, batch_size)
+
+
+def compose_filters(*filters):
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+
+    def composed(docs):
+        for f in filters:
+            docs = f(docs)
+        return docs
+
+    return composed
+
+
+# the fields the stages that need the whole corpus read: the merge key, the
+# related species' features and cards, the typeahead's names
+SCAN_FIELDS = list(dict.fromkeys(["id", "url", "source", *RELATED_FIELDS, *FEATURE_FIELDS]))
+
+
+def scan_documents(sources):
+    # One streaming pass over the sources keeping only SCAN_FIELDS of each
+    # document; the full documents are read again as they are sent to Solr.
+    return [
+        {f: doc[f] for f in SCAN_FIELDS if f in doc}
+        for path, source in sources
+        for doc in (prepare_document(item, source) for item in iter_documents(path))
+    ]
+
+
+def merge_filter(docs):
+    # Documents of the same species from several sources become one (see
+    # wildlife/merge.py). `docs` are scan_documents(); returns them after
+    # merging and the filter that, as the sources are streamed, holds back
+    # the members of each merged species until the last one has been read
+    # and then sends their canonical document. Only the species spread over
+    # several files wait in memory.
+    start = time.perf_counter()
+    merged, owner = merge_species(docs)
+    members = Counter(owner[doc["id"]] for doc in docs if doc["id"] in owner)
+    # source order, whatever order the sources are streamed in (round-robin
+    # when indexing in parallel)
+    position = {}
+    for i, doc in enumerate(docs):
+        position.setdefault(doc["id"], i)
+    report("Merged species", len(merged), time.perf_counter() - start)
+    print(f"{len(owner)} documents merged into {len(members)} species")
+
+    # shared by the sources, each streamed through its own merge()
+    waiting = {}
+    seen = Counter()
+
+    def merge(docs):
+        for doc in docs:
+            canonical_id = owner.get(doc["id"])
+            if canonical_id is None:
+                doc["sources"] = [doc["source"]]
+                yield doc
+                continue
+
+            # the last document with an id stands for it, at its first place
+            group = waiting.setdefault(canonical_id, {})
+            group[doc["id"]] = doc
+            seen[canonical_id] += 1
+            if seen[canonical_id] == members[canonical_id]:
+                group = sorted(waiting.pop(canonical_id).values(), key=lambda d: position[d["id"]])
+                yield merge_group(group)
+
+    return merged, merge
+
+
+def related_filter(docs, k=TOP_K, engine="auto"):
+    # The neighbours need the whole corpus (scan_documents, after merging);
+    # the returned filter then adds related_ids / related_docs to each
+    # document as it is streamed to Solr.
+    start = time.perf_counter()
+    related = build_related(docs, k, neighbours_engine(engine))
+    report("Related species", len(docs), time.perf_counter() - start)
+
+    def add_related(docs):
+        for doc in docs:
+            doc.update(related.get(doc["id"], {}))
+            yield doc
+
+    return add_related
+
+
+def write_autocomplete(docs, path=AUTOCOMPLETE_PATH):
+    # the search page's typeahead table (wildlife/autocomplete.py), from the
+    # documents as indexed
+    start = time.perf_counter()
+    table = build_autocomplete(docs)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    report("Autocomplete", len(docs), time.perf_counter() - start)
+    print(f"{len(table['entries'])} species, {len(table['keys'])} prefixes written to {path}")
+
+
+def index_file(client, path, source, batch_size=BATCH_SIZE, commit_within=None, doc_filter=None):
     print(f"Indexing: {path} ({source})")
+    start = time.perf_counter()
+    count = 0
+
+    for batch in iter_source_batches(path, source, batch_size, doc_filter):
+        client.add(batch, commit_within=commit_within)
+        count += len(batch)
+
+    report(path, count, time.perf_counter() - start)
+    return count
+
+
+def report(label, count, elapsed):
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{label}: {count} docs in {elapsed:.2f}s ({rate:.0f} docs/sec)")
+
+
+def index_all(
+    client,
+    sources=SOURCES,
+    batch_size=BATCH_SIZE,
+    commit_within=None,
+    clear=True,
+    commit=True,
+    doc_filter=None,
+):
+    start = time.perf_counter()
+    total = 0
+
+    try:
+        if clear:
+            clear_index(client)
+
+        for path, source in sources:
+            total += index_file(client, path, source, batch_size, commit_within, doc_filter)
+
+        # single hard commit for the delete and every file
+        if commit:
+            client.commit()
+    except Exception:
+        # the pending delete-all must not reach the live index with the next commit
+        if commit:
+            rollback(client)
+        raise
+    report("Total", total, time.perf_counter() - start)
+    return total
+
+
+def rollback(client):
+    try:
+        client.rollback()
+    except requests.RequestException as e:
+        # SolrCloud has no rollback; the pending changes wait for the next commit
+        print(f"Rollback failed: {e}")
+
+
+class SourceResult:
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.docs = 0
+        self.failed_batches = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def index_all_parallel(
+    solr_url,
+    sources=SOURCES,
+    workers=WORKERS,
+    max_in_flight=MAX_IN_FLIGHT,
+    batch_size=BATCH_SIZE,
+    commit_within=None,
+    clear=True,
+    commit=True,
+    doc_filter=None,
+):
+    # Batches of all sources are read round-robin on this thread and posted by
+    # a pool of workers, each with its own session. At most `max_in_flight`
+    # batches are queued or being sent; the reader blocks until one finishes.
+    # A failing batch or unreadable file is recorded on its SourceResult and
+    # the remaining batches carry on, but nothing is committed: the pending
+    # delete and documents are rolled back so the live index stays whole.
+    start = time.perf_counter()
+    local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_in_flight)
+    results_lock = threading.Lock()
+
+    def thread_client():
+        if not hasattr(local, "client"):
+            local.client = SolrClient(solr_url, pool_size=1)
+            with clients_lock:
+                clients.append(local.client)
+        return local.client
+
+    def post(result, batch):
+        try:
+            thread_client().add(batch, commit_within=commit_within)
+            with results_lock:
+                result.docs += len(batch)
+        except Exception as e:
+            with results_lock:
+                result.failed_batches += 1
+                result.errors.append(f"batch of {len(batch)} docs: {e}")
+        finally:
+            slots.release()
+
+    main_client = SolrClient(solr_url)
+    results = [SourceResult(path, source) for path, source in sources]
+
+    try:
+        if clear:
+            clear_index(main_client)
+
+        pending = [(r, iter_source_batches(r.path, r.source, batch_size, doc_filter)) for r in results]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending:
+                for entry in list(pending):
+                    result, batches = entry
+                    try:
+                        batch = next(batches)
+                    except StopIteration:
+                        pending.remove(entry)
+                        continue
+                    except Exception as e:
+                        with results_lock:
+                            result.errors.append(f"reading {result.path}: {e}")
+                        pending.remove(entry)
+                        continue
+
+                    slots.acquire()
+                    pool.submit(post, result, batch)
+
+        if not all(r.ok for r in results):
+            print("Errors while indexing; not committing.")
+            if commit:
+                rollback(main_client)
+        elif commit:
+            main_client.commit()
+    finally:
+        main_client.close()
+        for client in clients:
+            client.close()
+
+    for result in results:
+        status = "ok" if result.ok else f"{len(result.errors)} error(s)"
+        print(f"{result.path} ({result.source}): {result.docs} docs, {status}")
+        for error in result.errors:
+            print(f"  {error}")
+
+    report("Total", sum(r.docs for r in results), time.perf_counter() - start)
+    return results
+
+
+class SolrAdmin:
+    # Collections API calls used by the blue/green mode (SolrCloud only)
+
+    def __init__(self, base_url=SOLR_BASE_URL, timeout=120):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def call(self, action, **params):
+        resp = requests.get(
+            f"{self.base_url}/admin/collections",
+            params={"action": action, "wt": "json", **params},
+            timeout=self.timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(f"Solr {action} failed ({resp.status_code}): {resp.text}")
+        return resp.json()
+
+    def list_collections(self):
+        return self.call("LIST").get("collections", [])
+
+    def list_aliases(self):
+        return self.call("LISTALIASES").get("aliases", {})
+
+    def create_collection(self, name, config_name):
+        return self.call("CREATE", name=name, numShards=1, replicationFactor=1,
+                         **{"collection.configName": config_name})
+
+    def create_alias(self, alias, collection):
+        return self.call("CREATEALIAS", name=alias, collections=collection)
+
+    def delete_collection(self, name):
+        return self.call("DELETE", name=name)
+
+
+def count_by_source(solr_url):
+    resp = requests.get(
+        f"{solr_url.rstrip('/')}/select",
+        params={
+            "q": "*:*", "rows": 0, "wt": "json",
+            "facet": "true", "facet.field": "source", "facet.limit": -1, "facet.mincount": 1,
+        },
+        timeout=120,
+    )
+    resp.raise_for_status()
+    flat = resp.json()["facet_counts"]["facet_fields"]["source"]
+    return dict(zip(flat[::2], flat[1::2]))
+
+
+class SourceCounter:
+    # Remembers the source of every id that was sent so the counts Solr
+    # reports after the commit can be checked per source.
+
+    def __init__(self):
+        self.sources = {}
+
+    def filter(self, docs):
+        for doc in docs:
+            self.sources[doc["id"]] = doc["source"]
+            yield doc
+
+    def expected(self):
+        counts = {}
+        for source in self.sources.values():
+            counts[source] = counts.get(source, 0) + 1
+        return counts
+
+
+def index_blue_green(
+    base_url=SOLR_BASE_URL,
+    alias=COLLECTION,
+    config_name=COLLECTION,
+    sources=SOURCES,
+    workers=1,
+    max_in_flight=MAX_IN_FLIGHT,
+    batch_size=BATCH_SIZE,
+    commit_within=None,
+    doc_filter=None,
+):
+    # Builds a fresh collection next to the live one, checks its document
+    # counts per source, then atomically re-points `alias` (the name the
+    # frontend queries) at it and drops the previous collection. Queries keep
+    # hitting the old collection until the alias moves.
+    admin = SolrAdmin(base_url)
+    aliases = admin.list_aliases()
+    old = aliases.get(alias)
+
+    if old is None and alias in admin.list_collections():
+        raise RuntimeError(
+            f"'{alias}' is a collection, not an alias. Delete or rename it once "
+            f"before using blue/green indexing so the alias can take its name."
+        )
+
+    new = f"{alias}_{time.strftime('%Y%m%d%H%M%S')}"
+    new_url = f"{base_url.rstrip('/')}/{new}"
+    counter = SourceCounter()
+    doc_filter = compose_filters(doc_filter, counter.filter)
+
+    print(f"Building {new} (alias {alias} currently -> {old})")
+    admin.create_collection(new, config_name)
+
+    try:
+        if workers > 1:
+            results = index_all_parallel(
+                new_url, sources, workers, max_in_flight, batch_size,
+                commit_within, clear=False, doc_filter=doc_filter,
+            )
+            failed = [r for r in results if not r.ok]
+            if failed:
+                raise RuntimeError(f"indexing failed for {', '.join(r.path for r in failed)}")
+        else:
+            client = SolrClient(new_url)
+            try:
+                index_all(client, sources, batch_size, commit_within,
+                          clear=False, doc_filter=doc_filter)
+            finally:
+                client.close()
+
+        expected = counter.expected()
+        actual = count_by_source(new_url)
+        for source, count in expected.items():
+            print(f"{source}: expected {count}, indexed {actual.get(source, 0)}")
+        if actual != expected:
+            raise RuntimeError(f"document counts per source do not match: {actual} != {expected}")
+    except Exception:
+        print(f"Dropping {new}; {alias} still points to {old}")
+        try:
+            admin.delete_collection(new)
+        except Exception as e:
+            # the indexing or validation error is the one to report
+            print(f"Could not delete {new}, delete it by hand: {e}")
+        raise
+
+    admin.create_alias(alias, new)
+    print(f"Alias {alias} -> {new}")
+
+    if old:
+        admin.delete_collection(old)
+        print(f"Deleted {old}")
+
+    return new
+
+
+def content_hash(doc):
+    # stable across runs and key order; includes the id and source fields
+    payload = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
     with open(path, "r", encoding="utf-8") as f:
-        raw_items = json.load(f)
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class DeltaTracker:
+    # Compares each document with the hash recorded for its id at the last
+    # successful run and only lets added or changed documents through.
+
+    def __init__(self, previous):
+        self.previous = previous
+        self.current = {}
+        self.unchanged = 0
+
+    def filter(self, docs):
+        for doc in docs:
+            digest = content_hash(doc)
+            self.current[doc["id"]] = digest
+
+            if self.previous.get(doc["id"]) == digest:
+                self.unchanged += 1
+                continue
+            yield doc
+
+    def vanished_ids(self):
+        return [doc_id for doc_id in self.previous if doc_id not in self.current]
+
+
+def index_delta(
+    solr_url,
+    sources=SOURCES,
+    manifest_path=MANIFEST_PATH,
+    workers=1,
+    max_in_flight=MAX_IN_FLIGHT,
+    batch_size=BATCH_SIZE,
+    commit_within=None,
+    doc_filter=None,
+):
+    # Sends only what changed since the last run, deletes the ids that are no
+    # longer in any source and commits once; the live collection is never
+    # cleared. The manifest is only rewritten after a fully successful run,
+    # otherwise the next run re-sends the same delta.
+    tracker = DeltaTracker(load_manifest(manifest_path))
+    doc_filter = compose_filters(doc_filter, tracker.filter)
+    client = SolrClient(solr_url)
 
-    for item in raw_items:
-        item["id"] = item.get("url")
-        item["source"] = source
+    try:
+        if workers > 1:
+            results = index_all_parallel(
+                solr_url, sources, workers, max_in_flight, batch_size,
+                commit_within, clear=False, commit=False, doc_filter=doc_filter,
+            )
+            if not all(r.ok for r in results):
+                print("Errors while indexing; not deleting vanished ids or updating the manifest.")
+                return False
+        else:
+            index_all(
+                client, sources, batch_size, commit_within,
+                clear=False, commit=False, doc_filter=doc_filter,
+            )
 
-    resp = requests.post(f"{SOLR_URL}/update?commit=true", json=raw_items)
-    print(resp.status_code, resp.text)
+        vanished = tracker.vanished_ids()
+        for batch in iter_batches(vanished, batch_size):
+            client.delete_ids(batch)
+
+        client.commit()
+    finally:
+        client.close()
+
+    save_manifest(manifest_path, tracker.current)
+    print(f"Delta: {len(tracker.current) - tracker.unchanged} added/changed, "
+          f"{tracker.unchanged} unchanged, {len(vanished)} deleted")
+    return True
+
+
+def index_full(
+    solr_url,
+    sources=SOURCES,
+    manifest_path=MANIFEST_PATH,
+    workers=1,
+    max_in_flight=MAX_IN_FLIGHT,
+    batch_size=BATCH_SIZE,
+    commit_within=None,
+    doc_filter=None,
+):
+    # Clears the collection and sends every document, committing once. A
+    # full re-index also records the manifest so a later --delta run can
+    # tell which ids have vanished since.
+    tracker = DeltaTracker({})
+    doc_filter = compose_filters(doc_filter, tracker.filter)
+
+    if workers > 1:
+        results = index_all_parallel(
+            solr_url, sources, workers, max_in_flight, batch_size,
+            commit_within, doc_filter=doc_filter,
+        )
+        if not all(r.ok for r in results):
+            return False
+    else:
+        client = SolrClient(solr_url)
+        try:
+            index_all(client, sources, batch_size, commit_within, doc_filter=doc_filter)
+        finally:
+            client.close()
+
+    save_manifest(manifest_path, tracker.current)
+    return True
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Index the species JSON files into Solr.")
+    parser.add_argument("--solr-url", default=SOLR_URL)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--commit-within", type=int, default=None,
+        help="ask Solr to soft-commit each batch within N ms (the run still ends with one hard commit); "
+             "only with --delta or --blue-green, as on a full re-index it would make the cleared "
+             "collection visible half-filled",
+    )
+    parser.add_argument(
+        "--file", nargs=2, action="append", metavar=("PATH", "SOURCE"),
+        help="JSON array or JSON Lines file and its source tag (default: the three spider outputs)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="index sources and batches concurrently with N threads (default: sequential)",
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+        help="upper bound on batches queued or being sent in parallel mode",
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="only send documents whose content changed since the last --delta run and delete vanished ones",
+    )
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="content hash manifest used by --delta")
+    parser.add_argument(
+        "--blue-green", action="store_true",
+        help="build a new collection, validate it and swap the wild_life alias to it (SolrCloud)",
+    )
+    parser.add_argument("--solr-base-url", default=SOLR_BASE_URL, help="used by --blue-green")
+    parser.add_argument("--alias", default=COLLECTION, help="alias the frontend queries, used by --blue-green")
+    parser.add_argument("--config-name", default=COLLECTION, help="configset for new collections, used by --blue-green")
+    parser.add_argument(
+        "--related-k", type=int, default=TOP_K,
+        help="similar species stored on every document for 'You might also like' (0: skip)",
+    )
+    parser.add_argument(
+        "--no-merge", dest="merge", action="store_false",
+        help="index the documents of a species found in several sources separately",
+    )
+    parser.add_argument(
+        "--related-engine", choices=("auto", *ENGINES), default="auto",
+        help="how the similar species are computed (auto: numpy when installed)",
+    )
+    parser.add_argument(
+        "--autocomplete", default=AUTOCOMPLETE_PATH,
+        help="where to write the search page's typeahead table (empty: skip)",
+    )
+    args = parser.parse_args(argv)
+    if args.commit_within is not None and not (args.delta or args.blue_green):
+        parser.error("--commit-within needs --delta or --blue-green: a full re-index clears the live "
+                     "collection and soft commits would show it half-filled")
+    return args
 
 
 if __name__ == "__main__":
-    clear_index()
+    args = parse_args()
+    sources = [tuple(f) for f in args.file] if args.file else SOURCES
+    docs = scan_documents(sources) if args.merge or args.related_k > 0 or args.autocomplete else None
+    merge = None
+    if args.merge:
+        docs, merge = merge_filter(docs)
+    related = related_filter(docs, args.related_k, args.related_engine) if args.related_k > 0 else None
+    prepare = compose_filters(merge, related)
+
+    if args.blue_green:
+        # raises, leaving the alias where it was, if anything failed
+        index_blue_green(
+            base_url=args.solr_base_url,
+            alias=args.alias,
+            config_name=args.config_name,
+            sources=sources,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            batch_size=args.batch_size,
+            commit_within=args.commit_within,
+            doc_filter=prepare,
+        )
+        ok = True
+    else:
+        index = index_delta if args.delta else index_full
+        ok = index(
+            args.solr_url,
+            sources=sources,
+            manifest_path=args.manifest,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            batch_size=args.batch_size,
+            commit_within=args.commit_within,
+            doc_filter=prepare,
+        )
 
-    index_file("wildlifetrusts.json", "WT")
-    index_file("awf.json", "AWF")
-    index_file("wwf.json", "WWF")
+    # only once the documents are searchable: a failed run keeps the
+    # previous table, which matches the documents still live
+    if ok and args.autocomplete:
+        write_autocomplete(docs, args.autocomplete)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,99 @@
+# Blue/green re-indexing (index_to_solr.index_blue_green) against the fake
+# Solr of the benchmarks, which records the Collections API calls it gets.
+
+import itertools
+
+import pytest
+import requests
+
+import index_to_solr
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import index_blue_green
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = []
+    for source, count in (("A", 7), ("B", 5)):
+        path = tmp_path / f"{source}.jsonl"
+        path.write_text("".join(f'{{"url": "{source}/{i}", "name": "n{i}"}}\n' for i in range(count)))
+        paths.append((str(path), source))
+    return paths
+
+
+@pytest.fixture
+def solr(monkeypatch):
+    # new collection names have one-second resolution: number them instead
+    stamps = (f"{i:014d}" for i in itertools.count(1))
+    monkeypatch.setattr(index_to_solr.time, "strftime", lambda fmt: next(stamps))
+    with FakeSolr(collections=()) as solr:
+        yield solr
+
+
+def admin_calls(solr):
+    return [(params["action"], params.get("name")) for _, name, _, params in solr.calls
+            if name == "admin" and params["action"] not in ("LIST", "LISTALIASES")]
+
+
+def rebuild(solr, sources, **kwargs):
+    return index_blue_green(base_url=solr.base_url, sources=sources, batch_size=3, **kwargs)
+
+
+def test_swap_creates_aliases_then_drops_the_old_collection(solr, sources):
+    first = rebuild(solr, sources)
+    second = rebuild(solr, sources)
+
+    assert admin_calls(solr) == [
+        ("CREATE", first), ("CREATEALIAS", "wild_life"),
+        ("CREATE", second), ("CREATEALIAS", "wild_life"), ("DELETE", first),
+    ]
+    assert solr.aliases == {"wild_life": second}
+    assert sorted(solr.collections) == [second]
+    assert len(solr.collections[second].docs) == 12
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_failed_batch_keeps_the_alias(solr, sources, workers):
+    live = rebuild(solr, sources)
+    solr.fail_when = lambda name, payload: name != live and isinstance(payload, list)
+
+    with pytest.raises((RuntimeError, requests.HTTPError)):
+        rebuild(solr, sources, workers=workers)
+
+    calls = admin_calls(solr)[2:]
+    assert [action for action, _ in calls] == ["CREATE", "DELETE"]
+    assert calls[0][1] == calls[1][1] != live
+    assert solr.aliases == {"wild_life": live}
+    assert sorted(solr.collections) == [live]
+
+
+def test_count_mismatch_keeps_the_alias(solr, sources, monkeypatch):
+    live = rebuild(solr, sources)
+    count_by_source = index_to_solr.count_by_source
+    monkeypatch.setattr(index_to_solr, "count_by_source", lambda url: {**count_by_source(url), "B": 4})
+
+    with pytest.raises(RuntimeError, match="counts per source"):
+        rebuild(solr, sources)
+
+    assert solr.aliases == {"wild_life": live}
+    assert sorted(solr.collections) == [live]
+
+
+def test_cleanup_failure_does_not_hide_the_error(solr, sources, monkeypatch):
+    live = rebuild(solr, sources)
+    solr.fail_when = lambda name, payload: name != live and isinstance(payload, list)
+
+    def delete_collection(self, name):
+        raise RuntimeError("Solr is down")
+
+    monkeypatch.setattr(index_to_solr.SolrAdmin, "delete_collection", delete_collection)
+    with pytest.raises(requests.HTTPError):
+        rebuild(solr, sources)
+    assert solr.aliases == {"wild_life": live}
+
+
+def test_existing_collection_named_like_the_alias(sources):
+    with FakeSolr() as solr:
+        with pytest.raises(RuntimeError, match="is a collection, not an alias"):
+            rebuild(solr, sources)
+        assert admin_calls(solr) == []
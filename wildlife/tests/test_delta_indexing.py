@@ -0,0 +1,98 @@
+# Incremental re-indexing (index_to_solr.index_delta) against the fake Solr
+# of the benchmarks: only added or changed documents are sent, vanished ids
+# are deleted, and a failed run leaves the manifest and the deletes alone.
+
+import json
+
+import pytest
+import requests
+
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import index_delta, index_full, load_manifest
+
+
+def write(path, docs):
+    path.write_text("".join(json.dumps(doc) + "\n" for doc in docs))
+
+
+def sent(solr):
+    return [doc["id"] for _, payload in solr.updates if isinstance(payload, list) for doc in payload]
+
+
+def deletes(solr):
+    return [payload["delete"] for _, payload in solr.updates
+            if isinstance(payload, dict) and isinstance(payload.get("delete"), list)]
+
+
+@pytest.fixture
+def feed(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    write(path, [{"url": f"u{i}", "name": f"n{i}"} for i in range(10)])
+    return path
+
+
+@pytest.fixture
+def indexed(feed, tmp_path):
+    # a full index of the feed, manifest written
+    manifest = str(tmp_path / "manifest.json")
+    with FakeSolr() as solr:
+        assert index_full(solr.url, [(str(feed), "T")], manifest_path=manifest, batch_size=4)
+        solr.updates.clear()
+        yield solr, manifest
+
+
+def change_feed(feed):
+    # u3 changed, u7 gone, u10 new
+    docs = [{"url": f"u{i}", "name": f"n{i}"} for i in range(11) if i != 7]
+    docs[3]["name"] = "renamed"
+    write(feed, docs)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_only_changes_are_sent_and_vanished_ids_deleted(indexed, feed, workers):
+    solr, manifest = indexed
+    assert index_delta(solr.url, [(str(feed), "T")], manifest_path=manifest, workers=workers, batch_size=4)
+    assert sent(solr) == []
+    assert deletes(solr) == []
+
+    change_feed(feed)
+    assert index_delta(solr.url, [(str(feed), "T")], manifest_path=manifest, workers=workers, batch_size=4)
+
+    assert sorted(sent(solr)) == ["u10", "u3"]
+    assert deletes(solr) == [["u7"]]
+    live = solr.collections["wild_life"].docs
+    assert sorted(live, key=lambda i: int(i[1:])) == [f"u{i}" for i in range(11) if i != 7]
+    assert live["u3"]["name"] == "renamed"
+    assert sorted(load_manifest(manifest)) == sorted(live)
+
+
+def test_failed_batch_parallel(indexed, feed):
+    solr, manifest = indexed
+    before = load_manifest(manifest)
+    change_feed(feed)
+    solr.fail_when = lambda name, payload: isinstance(payload, list)
+
+    assert not index_delta(solr.url, [(str(feed), "T")], manifest_path=manifest, workers=3, batch_size=4)
+
+    assert deletes(solr) == []
+    assert solr.collections["wild_life"].commits == 1
+    assert load_manifest(manifest) == before
+
+
+def test_failed_batch_sequential(indexed, feed):
+    solr, manifest = indexed
+    before = load_manifest(manifest)
+    change_feed(feed)
+    solr.fail_when = lambda name, payload: isinstance(payload, list)
+
+    with pytest.raises(requests.HTTPError):
+        index_delta(solr.url, [(str(feed), "T")], manifest_path=manifest, batch_size=4)
+
+    assert deletes(solr) == []
+    assert solr.collections["wild_life"].commits == 1
+    assert load_manifest(manifest) == before
+    # the next run sends the same delta again
+    solr.fail_when = None
+    assert index_delta(solr.url, [(str(feed), "T")], manifest_path=manifest, batch_size=4)
+    assert sorted(sent(solr)) == ["u10", "u3"]
+    assert deletes(solr) == [["u7"]]
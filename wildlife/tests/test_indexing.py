@@ -0,0 +1,110 @@
+# Streaming the source files to Solr (index_to_solr.iter_documents /
+# index_all) against the fake Solr of the benchmarks: batches of batch_size
+# documents, one hard commit at the end, nothing committed after an error.
+
+import json
+
+import pytest
+import requests
+
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import SolrClient, index_all, iter_documents, parse_args
+
+DOCS = [{"url": f"https://example.org/{i}", "name": f"species {i}", "overview": "x" * i} for i in range(23)]
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def commits(solr):
+    return [payload for _, payload in solr.updates if isinstance(payload, dict) and "commit" in payload]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+@pytest.mark.parametrize("text", [
+    json.dumps(DOCS, indent=1),
+    " " * 5000 + json.dumps(DOCS),
+    "\n".join(json.dumps(doc) for doc in DOCS),
+    "\n" * 5000 + "\n".join(json.dumps(doc) for doc in DOCS) + "\n",
+])
+def test_iter_documents(tmp_path, text, chunk_size):
+    assert list(iter_documents(write(tmp_path, "docs.json", text), chunk_size)) == DOCS
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1} {"b": 2}]',
+    '[{"a": 1},, {"b": 2}]',
+    '[{"a": 1},]',
+    '[{"a": 1}',
+    '[{"a": 1}][{"b": 2}]',
+    '[{"a": 1}] trailing',
+])
+def test_malformed_arrays_raise(tmp_path, text):
+    with pytest.raises(ValueError):
+        list(iter_documents(write(tmp_path, "docs.json", text), 4))
+
+
+def test_batches_and_one_commit_at_the_end(tmp_path):
+    path = write(tmp_path, "docs.jsonl", "\n".join(json.dumps(doc) for doc in DOCS))
+    with FakeSolr() as solr:
+        client = SolrClient(solr.url)
+        total = index_all(client, [(path, "T")], batch_size=5)
+        client.close()
+
+        batches = [payload for _, payload in solr.updates if isinstance(payload, list)]
+        assert total == 23
+        assert [len(batch) for batch in batches] == [5, 5, 5, 5, 3]
+        assert all(doc["source"] == "T" and doc["id"] == doc["url"] for batch in batches for doc in batch)
+        # the delete-all first, the only commit last
+        assert solr.updates[0][1] == {"delete": {"query": "*:*"}}
+        assert commits(solr) == [{"commit": {}}]
+        assert solr.updates[-1][1] == {"commit": {}}
+        assert len(solr.collections["wild_life"].docs) == 23
+
+
+def test_commit_within_is_sent_with_every_batch(tmp_path):
+    path = write(tmp_path, "docs.jsonl", "\n".join(json.dumps(doc) for doc in DOCS))
+    with FakeSolr() as solr:
+        client = SolrClient(solr.url)
+        index_all(client, [(path, "T")], batch_size=10, commit_within=0, clear=False)
+        client.close()
+        batch_params = [params for method, _, _, params in solr.calls if params.get("commitWithin")]
+        assert [p["commitWithin"] for p in batch_params] == ["0", "0", "0"]
+
+
+def test_failed_batch_rolls_back_the_delete(tmp_path):
+    path = write(tmp_path, "docs.jsonl", "\n".join(json.dumps(doc) for doc in DOCS))
+    with FakeSolr() as solr:
+        client = SolrClient(solr.url)
+        index_all(client, [(path, "T")], batch_size=5)
+
+        solr.fail_when = lambda name, payload: isinstance(payload, list) and payload[0]["url"].endswith("/10")
+        with pytest.raises(requests.HTTPError):
+            index_all(client, [(path, "T")], batch_size=5)
+        client.close()
+
+        assert len(commits(solr)) == 1
+        assert solr.updates[-1][1] == {"rollback": {}}
+        assert len(solr.collections["wild_life"].docs) == 23
+
+
+def test_unreadable_file_rolls_back_the_delete(tmp_path):
+    good = write(tmp_path, "good.jsonl", "\n".join(json.dumps(doc) for doc in DOCS))
+    bad = write(tmp_path, "bad.json", '[{"url": "a"}][{"url": "b"}]')
+    with FakeSolr() as solr:
+        client = SolrClient(solr.url)
+        index_all(client, [(good, "T")], batch_size=5)
+        with pytest.raises(ValueError):
+            index_all(client, [(good, "T"), (bad, "B")], batch_size=5)
+        client.close()
+        assert len(solr.collections["wild_life"].docs) == 23
+
+
+def test_commit_within_needs_delta_or_blue_green():
+    with pytest.raises(SystemExit):
+        parse_args(["--commit-within", "1000"])
+    assert parse_args(["--commit-within", "0", "--delta"]).commit_within == 0
+    assert parse_args(["--commit-within", "1000", "--blue-green"]).commit_within == 1000
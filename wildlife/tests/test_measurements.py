@@ -0,0 +1,77 @@
+# Golden output of the shared measurement parsers (wildlife/utils/measurements.py)
+# on the raw_* fields of the three feeds and a few awkward strings, as the
+# spiders' own parsers gave them before the rewrite: the *_min / *_max fields
+# and their order.
+
+import json
+import os
+
+import pytest
+
+from wildlife.utils import measurements as m
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden_measurements.json")
+
+with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+# the parsers as each spider calls them
+
+
+def wwf(raw):
+    data = {}
+    if "raw_weight" in raw:
+        weight = m.parse_wwf_weight(raw["raw_weight"])
+        if weight:
+            m.store(data, weight)
+    if "raw_length" in raw:
+        for length in m.parse_wwf_lengths(raw["raw_length"]):
+            m.store(data, length)
+    if "raw_population" in raw:
+        population = m.parse_wwf_population(raw["raw_population"])
+        if population is not None:
+            m.store(data, population)
+    return data
+
+
+def awf(raw):
+    data = {}
+    for key, parse in [
+        ("raw_weight", m.parse_awf_weight),
+        ("raw_length", m.parse_awf_length),
+        ("raw_lifespan", m.parse_awf_lifespan),
+        ("raw_gestation", m.parse_awf_gestation),
+    ]:
+        if key in raw:
+            parsed = parse(raw[key])
+            if parsed:
+                m.store(data, parsed)
+    return data
+
+
+def wt(raw):
+    data = {}
+    if "raw_statistics" in raw:
+        for measurement in m.parse_wt_statistics(raw["raw_statistics"]):
+            m.store(data, measurement)
+    return data
+
+
+PARSERS = {"WWF": wwf, "AWF": awf, "WT": wt}
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=lambda case: f"{case['source']}:{sorted(case['raw'].values())[0][:40]}")
+def test_golden(case):
+    parsed = PARSERS[case["source"]](case["raw"])
+    assert [[k, v] for k, v in parsed.items()] == case["expected"]
+
+
+def test_thousands_separators():
+    assert wwf({"raw_weight": "12,345.6 kg"}) == {"weight_kg_min": 0, "weight_kg_max": 12345.6}
+
+
+def test_no_numbers():
+    assert wwf({"raw_weight": "unknown", "raw_population": "unknown"}) == {}
+    assert awf({"raw_weight": "heavy"}) == {}
+    assert wt({"raw_statistics": "colourful"}) == {}
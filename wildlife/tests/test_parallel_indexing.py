@@ -0,0 +1,83 @@
+# Thread-pool indexing (index_to_solr.index_all_parallel) against the fake
+# Solr of the benchmarks: a failing source is recorded on its SourceResult,
+# the other sources are still sent, and nothing of the run is committed.
+
+import json
+import os
+import runpy
+
+import pytest
+
+from benchmarks.fake_solr import FakeSolr
+from index_to_solr import index_all_parallel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = {"A": 12, "B": 9, "C": 7}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = []
+    for source, count in SIZES.items():
+        path = tmp_path / f"{source}.jsonl"
+        path.write_text("".join(json.dumps({"url": f"{source}/{i}", "name": f"n{i}"}) + "\n" for i in range(count)))
+        paths.append((str(path), source))
+    return paths
+
+
+def fail_source(source):
+    return lambda name, payload: isinstance(payload, list) and payload[0]["source"] == source
+
+
+def test_every_source_indexed_and_committed_once(sources):
+    with FakeSolr() as solr:
+        results = index_all_parallel(solr.url, sources, workers=3, max_in_flight=2, batch_size=4)
+
+        assert [(r.source, r.docs, r.ok) for r in results] == [("A", 12, True), ("B", 9, True), ("C", 7, True)]
+        assert len(solr.collections["wild_life"].docs) == 28
+        assert solr.collections["wild_life"].commits == 1
+
+
+def test_failing_source_is_recorded_and_rolled_back(sources):
+    with FakeSolr() as solr:
+        index_all_parallel(solr.url, sources, workers=3, batch_size=4)
+
+        solr.fail_when = fail_source("B")
+        results = {r.source: r for r in index_all_parallel(solr.url, sources, workers=3, batch_size=4)}
+
+        assert results["B"].failed_batches == 3 and len(results["B"].errors) == 3
+        assert results["B"].docs == 0 and not results["B"].ok
+        # the other sources were still sent ...
+        assert (results["A"].docs, results["C"].docs) == (12, 7)
+        assert results["A"].ok and results["C"].ok
+        # ... but not committed: the delete-all was rolled back with them
+        assert solr.updates[-1][1] == {"rollback": {}}
+        assert solr.collections["wild_life"].commits == 1
+        assert len(solr.collections["wild_life"].docs) == 28
+
+
+def test_unreadable_file_is_recorded(sources, tmp_path):
+    bad = tmp_path / "bad.json"
+    bad.write_text('[{"url": "x"} {"url": "y"}]')
+    with FakeSolr() as solr:
+        results = index_all_parallel(solr.url, sources + [(str(bad), "BAD")], workers=2, batch_size=4)
+
+        assert [r.ok for r in results] == [True, True, True, False]
+        assert results[3].errors[0].startswith(f"reading {bad}")
+        assert solr.collections["wild_life"].commits == 0
+
+
+def test_main_exits_non_zero(sources, tmp_path, monkeypatch):
+    files = [arg for path, source in sources for arg in ("--file", path, source)]
+    with FakeSolr(fail_when=fail_source("C")) as solr:
+        monkeypatch.setattr("sys.argv", [
+            "index_to_solr.py", "--solr-url", solr.url, "--workers", "3", "--batch-size", "4",
+            "--no-merge", "--related-k", "0", "--autocomplete", "",
+            "--manifest", str(tmp_path / "manifest.json"), *files,
+        ])
+        with pytest.raises(SystemExit) as exit_info:
+            runpy.run_path(os.path.join(ROOT, "index_to_solr.py"), run_name="__main__")
+
+        assert exit_info.value.code == 1
+        assert solr.collections["wild_life"].commits == 0
+        assert not (tmp_path / "manifest.json").exists()
@@ -0,0 +1,135 @@
+# The embedded search engine (wildlife/search_engine.py) answering Solr select
+# requests without Solr: a small corpus written here for the query semantics,
+# and the three feeds for the requests the frontend sends.
+
+import math
+
+import pytest
+
+from wildlife.search_engine import SearchEngine, min_should_match
+from wildlife.utils.analysis import SynonymMap
+
+DOCS = [
+    {"id": "lion", "name": "Lion", "overview": "The lion is a big cat of the savanna.",
+     "animal_type": "Mammal", "source": "AWF", "weight_kg_min": 120, "weight_kg_max": 250},
+    {"id": "zebra", "name": "Grevy's Zebra", "overview": "A striped horse of the savanna.",
+     "animal_type": "Mammal", "source": "AWF", "weight_kg_min": 350, "weight_kg_max": 450},
+    {"id": "orca", "name": "Orca", "overview": "The largest dolphin, also called killer whale.",
+     "animal_type": "Mammal", "source": "WWF", "weight_kg_min": 3000, "weight_kg_max": 6000},
+    {"id": "frog", "name": "Common Frog", "overview": "A small amphibian of ponds.",
+     "animal_type": "Amphibian", "source": "WT"},
+]
+
+SYNONYMS = SynonymMap.parse(["killer whale, orca", "big cat => lion"])
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return SearchEngine(DOCS, synonyms=SYNONYMS)
+
+
+@pytest.fixture(scope="module")
+def feeds():
+    return SearchEngine.from_feeds()
+
+
+def ids(response):
+    return [doc["id"] for doc in response["response"]["docs"]]
+
+
+@pytest.mark.parametrize("spec, optional, required", [
+    ("75%", 4, 3), ("-1", 4, 3), ("-25%", 4, 3), ("2", 1, 1),
+    ("1<75%", 1, 1), ("1<75%", 4, 3), ("3<90% 6<-2", 8, 6), ("", 3, 3),
+])
+def test_min_should_match(spec, optional, required):
+    assert min_should_match(spec, optional) == required
+
+
+def test_default_mm_follows_q_op_or(engine):
+    # no mm: any of the words, as Solr's default q.op=OR
+    response = engine.select({"q": "savanna ponds", "qf": "overview"})
+    assert sorted(ids(response)) == ["frog", "lion", "zebra"]
+
+
+def test_q_op_and_requires_every_word(engine):
+    assert ids(engine.select({"q": "savanna ponds", "qf": "overview", "q.op": "AND"})) == []
+    assert ids(engine.select({"q": "savanna striped", "qf": "overview", "q.op": "AND"})) == ["zebra"]
+
+
+def test_explicit_mm_wins_over_q_op(engine):
+    response = engine.select({"q": "savanna ponds", "qf": "overview", "q.op": "AND", "mm": "1"})
+    assert len(ids(response)) == 3
+
+
+def test_boosted_field_ranks_first(engine):
+    response = engine.select({"q": "lion", "qf": "name^8 overview"})
+    assert ids(response) == ["lion"]
+    response = engine.select({"q": "savanna zebra", "qf": "name^8 overview"})
+    assert ids(response)[0] == "zebra"
+
+
+def test_synonyms(engine):
+    assert ids(engine.select({"q": "killer whale", "qf": "name"})) == ["orca"]
+    assert ids(engine.select({"q": "big cat", "qf": "name"})) == ["lion"]
+
+
+def test_phrase_and_exclusion(engine):
+    assert ids(engine.select({"q": '"striped horse"', "qf": "overview"})) == ["zebra"]
+    assert ids(engine.select({"q": '"horse striped"', "qf": "overview"})) == []
+    assert ids(engine.select({"q": "savanna -lion", "qf": "overview"})) == ["zebra"]
+
+
+def test_filter_queries(engine):
+    def found(fq):
+        return sorted(ids(engine.select({"q": "*:*", "fq": fq})))
+
+    assert found("source:AWF") == ["lion", "zebra"]
+    assert found("{!terms f=animal_type}Amphibian,Reptile") == ["frog"]
+    assert found("weight_kg_min:[* TO 300] AND weight_kg_max:[200 TO *]") == ["lion"]
+    assert found("weight_kg_min:[1000 TO *]") == ["orca"]
+    # documents without the field never match a range
+    assert "frog" not in found("weight_kg_min:[* TO *]")
+
+
+def test_facets_count_the_matches(engine):
+    response = engine.select({"q": "savanna", "qf": "overview", "rows": 0,
+                              "facet": "true", "facet.field": "source", "facet.mincount": 1})
+    assert response["response"]["numFound"] == 2
+    assert response["facet_counts"]["facet_fields"]["source"] == ["AWF", 2]
+
+
+def test_fl_rows_and_start(engine):
+    response = engine.select({"q": "*:*", "fl": "id,name", "rows": 2, "start": 1})
+    assert response["response"]["numFound"] == 4
+    assert response["response"]["docs"] == [{"id": "zebra", "name": "Grevy's Zebra"},
+                                            {"id": "orca", "name": "Orca"}]
+
+
+def test_more_like_this(engine):
+    response = engine.select({"q": "{!mlt}lion", "fl": "id"})
+    assert ids(response)[0] == "zebra"
+    assert "lion" not in ids(response)
+    response = engine.select({"q": "{!mlt}lion", "fq": "source:WWF"})
+    assert ids(response) == ["orca"]
+
+
+def test_feeds_search(feeds):
+    assert feeds.search("african elephant")[0]["name"] == "African Forest Elephant"
+    assert feeds.search("lion")[0]["name"] == "Lion"
+
+
+def test_feeds_query_intent(feeds):
+    docs = feeds.search("elephants over 2 tons", rows=50)
+    assert docs
+    assert all(doc["weight_kg_max"][0] >= 2000 for doc in docs)
+
+
+def test_feeds_overlap_filter_matches_a_scan(feeds):
+    fq = "weight_kg_min:[* TO 500] AND weight_kg_max:[100 TO *]"
+    expected = {
+        doc["id"] for doc in feeds.docs
+        if doc.get("weight_kg_min", [math.inf])[0] <= 500 and doc.get("weight_kg_max", [-math.inf])[0] >= 100
+    }
+    response = feeds.select({"q": "*:*", "fq": fq, "rows": len(feeds.docs), "fl": "id"})
+    assert set(ids(response)) == expected
+    assert response["response"]["numFound"] == len(expected)
@@ -0,0 +1,37 @@
+# The NumPy neighbours engine (wildlife/similarity.top_related_numpy) against
+# the pure Python top_related on a small corpus full of ties: repeated
+# overviews, repeated types and lengths, missing fields and a repeated id.
+
+import pytest
+
+from wildlife.similarity import top_related, top_related_numpy
+
+pytest.importorskip("numpy")
+
+DOCS = [
+    {"id": "a", "overview": "A big cat of the savanna.", "animal_type": "Mammal", "length_cm_min": 100, "length_cm_max": 200},
+    {"id": "b", "overview": "A big cat of the savanna.", "animal_type": "Mammal", "length_cm_min": 100, "length_cm_max": 200},
+    {"id": "c", "overview": "A big cat of the savanna.", "animal_type": "Mammal"},
+    {"id": "d", "overview": "A striped horse of the savanna.", "animal_type": ["Mammal"], "length_cm_min": [150], "length_cm_max": [250]},
+    {"id": "e", "overview": "A small frog of ponds.", "animal_type": "Amphibian", "length_cm_min": 2, "length_cm_max": 8},
+    {"id": "f", "overview": "A small toad of ponds.", "animal_type": "Amphibian", "length_cm_min": 2, "length_cm_max": 8},
+    {"id": "g", "overview": "", "animal_type": "Bird"},
+    {"id": "h", "animal_type": "Bird"},
+    {"id": "i", "overview": "Savanna savanna SAVANNA", "animal_type": "Bird", "length_cm_min": 10, "length_cm_max": 10},
+    {"id": "a", "overview": "The same id as the first one.", "animal_type": "Mammal"},
+    {"id": "j", "overview": "A big cat of the savanna.", "animal_type": "Reptile", "length_cm_min": 100, "length_cm_max": 200},
+    {"id": "k"},
+]
+
+
+@pytest.mark.parametrize("k", [1, 3, 7, len(DOCS)])
+@pytest.mark.parametrize("block_cells, dense_tokens", [(1, 0), (5, 2), (30, 4), (10_000, 128)])
+def test_numpy_matches_python(k, block_cells, dense_tokens):
+    expected = top_related(DOCS, k)
+    assert top_related_numpy(DOCS, k, block_cells=block_cells, dense_tokens=dense_tokens) == expected
+
+
+def test_repeated_id_is_not_its_own_neighbour():
+    related = top_related_numpy(DOCS, len(DOCS))
+    assert 9 not in related[0] and 0 not in related[9]
+    assert related[0][0] == 1
@@ -0,0 +1,58 @@
+# Batch cleaning (wildlife/utils/text_cleaner.clean_texts) against cleaning
+# one text at a time, with a small stand-in for the NLTK data so the test
+# runs without it.
+
+import re
+
+import pytest
+
+from wildlife.utils import text_cleaner
+from wildlife.utils.text_cleaner import clean_text, clean_texts
+
+
+class Lemmatizer:
+    def __init__(self):
+        self.calls = []
+
+    def lemmatize(self, word):
+        self.calls.append(word)
+        return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+
+@pytest.fixture
+def lemmatizer(monkeypatch):
+    lemmatizer = Lemmatizer()
+    resources = ({"the", "a", "of", "and", "is"}, lemmatizer, lambda text: re.findall(r"\w+|[^\w\s]", text))
+    monkeypatch.setattr(text_cleaner, "load_resources", lambda: resources)
+    text_cleaner.lemmatize.cache_clear()
+    yield lemmatizer
+    text_cleaner.lemmatize.cache_clear()
+
+
+TEXTS = [
+    "The lions and the zebras of the savanna.",
+    "",
+    None,
+    "Lions, lions, LIONS!",
+    "the a of",
+    "Zebras graze; lions hunt zebras.",
+    "The lions and the zebras of the savanna.",
+    "...",
+]
+
+
+def test_batch_matches_one_by_one(lemmatizer):
+    assert clean_texts(TEXTS) == [clean_text(t) for t in TEXTS]
+    assert clean_texts(TEXTS)[0] == "lion zebra savanna"
+    assert clean_texts(TEXTS)[4] == ""
+
+
+def test_each_word_is_lemmatized_once(lemmatizer):
+    clean_texts(TEXTS)
+    assert sorted(lemmatizer.calls) == sorted(set(lemmatizer.calls))
+    assert sorted(lemmatizer.calls) == ["graze", "hunt", "lions", "savanna", "zebras"]
+
+
+@pytest.mark.parametrize("texts", [[], [""], [None, ""]])
+def test_empty_texts(lemmatizer, texts):
+    assert clean_texts(texts) == [clean_text(t) for t in texts]
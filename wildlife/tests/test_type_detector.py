@@ -0,0 +1,47 @@
+# Keyword scoring (wildlife/utils/type_detector.py) against scores worked out
+# by hand: keywords match as substrings ("elephant" also scores "ant"), a
+# keyword listed twice counts twice, and each scientific suffix adds 2.
+
+import pytest
+
+from wildlife.utils.type_detector import category_scores, detect_type, detect_types_batch
+
+CASES = [
+    ("The elephant", {"Insect": 5, "Mammal": 7}, "Mammal"),
+    ("Elephants", {"Insect": 5, "Mammal": 14}, "Mammal"),
+    ("An ant on an elephant in the grass", {"Insect": 5, "Mammal": 7, "Plant": 3}, "Mammal"),
+    ("ANT colony", {"Insect": 5}, "Insect"),
+    # listed twice in the table
+    ("flight", {"Bird": 10}, "Bird"),
+    ("a nest", {"Bird": 10}, "Bird"),
+    ("measured in centimeters", {"Mammal": 21}, "Mammal"),
+    ("sea turtle", {"Fish": 18, "Reptile": 3}, "Fish"),
+    ("whale shark", {"Aquatic Mammal": 10, "Fish": 18}, "Fish"),
+    ("a killer whale with a dorsal fin and flippers", {"Aquatic Mammal": 20}, "Aquatic Mammal"),
+    ("jellyfish with tentacles near a bird", {"Bird": 5, "Fish": 18, "Invertebrate": 4}, "Fish"),
+    # scientific names: whole-word suffixes only
+    ("Canidae", {"Mammal": 7}, "Mammal"),
+    ("class Aves", {"Bird": 2}, "Bird"),
+    ("suborder Squamata, a snake", {"Reptile": 5}, "Reptile"),
+    ("Lanceolata", {"Plant": 2}, "Plant"),
+    ("Plantago lanceolata", {"Insect": 5, "Plant": 5}, "Insect"),
+    ("Giraffa camelopardalis ssp.peralta", {"Mammal": 2}, "Mammal"),
+    ("Panthera leo ssp. persica", {"Insect": 5}, "Insect"),
+    ("Asteraceae", {}, "Animal"),
+    # ties go to the first category of PRIORITY
+    ("the idae family", {"Amphibian": 2, "Bird": 2, "Fish": 2, "Mammal": 2, "Reptile": 2}, "Bird"),
+    ("xyz", {}, "Animal"),
+    ("", {}, None),
+]
+
+
+@pytest.mark.parametrize("text, scores, animal_type", CASES)
+def test_scores(text, scores, animal_type):
+    assert {k: v for k, v in category_scores(text).items() if v} == scores
+    assert detect_type(text) == animal_type
+
+
+def test_batch_matches_one_by_one():
+    texts = [text for text, _, _ in CASES]
+    texts += texts[::2] + [None]
+    assert detect_types_batch(texts) == [detect_type(t) for t in texts]
@@ -0,0 +1,99 @@
+import heapq
+import unicodedata
+from bisect import bisect_left
+
+# Typeahead over species names and scientific names, without Solr.
+# index_to_solr.py builds the table once from the documents it indexes and
+# writes it to frontend/autocomplete.json; the page loads that file once and
+# answers every keystroke from it.
+#
+#   entries  [name, scientific name, sources], one per species (documents
+#            with the same name are one entry with the sources of all),
+#            ranked: most sources first, then by name
+#   keys     every word-start suffix of both names, normalized ("african
+#            forest elephant", "forest elephant", "elephant", ...), sorted
+#   targets  the entry (rank) of each key
+#
+# A prefix is a bisect into `keys`; the suggestions are the best ranks in the
+# matching slice. One- and two-character prefixes, whose slices are the
+# longest, are answered from a table built when the file is loaded.
+#
+# Standalone (standard library only): frontend/index.html loads this file into
+# PyScript next to search_cli.py.
+
+MAX_SUGGESTIONS = 8
+SHORT_PREFIX = 2
+
+
+def normalize(text):
+    # case, accents and spacing do not matter: "Grévy's  Zebra" -> "grevy's zebra"
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.casefold().split())
+
+
+def first(value):
+    if isinstance(value, list):
+        return value[0] if value else ""
+    return value if isinstance(value, str) else ""
+
+
+def build_autocomplete(docs):
+    # the table frontend/autocomplete.json holds, from the indexed documents
+    species = {}
+    for doc in docs:
+        name = first(doc.get("name")).strip()
+        if not name:
+            continue
+        scientific = first(doc.get("scientific_name")).strip()
+        entry = species.setdefault(normalize(name), [name, scientific, []])
+        if not entry[1]:
+            entry[1] = scientific
+        for source in doc.get("sources") or [doc.get("source")]:
+            if source and source not in entry[2]:
+                entry[2].append(source)
+
+    entries = sorted(species.values(), key=lambda e: (-len(e[2]), normalize(e[0])))
+
+    keys = set()
+    for rank, (name, scientific, _) in enumerate(entries):
+        for text in (name, scientific):
+            words = normalize(text).split()
+            for i in range(len(words)):
+                keys.add((" ".join(words[i:]), rank))
+    keys = sorted(keys)
+
+    return {
+        "entries": entries,
+        "keys": [key for key, _ in keys],
+        "targets": [rank for _, rank in keys],
+    }
+
+
+class Autocomplete:
+    def __init__(self, table, limit=MAX_SUGGESTIONS):
+        self.entries = table["entries"]
+        self.keys = table["keys"]
+        self.targets = table["targets"]
+        self.limit = limit
+
+        short = {}
+        for key, rank in zip(self.keys, self.targets):
+            for size in range(1, min(SHORT_PREFIX, len(key)) + 1):
+                short.setdefault(key[:size], set()).add(rank)
+        self.short = {prefix: heapq.nsmallest(limit, ranks) for prefix, ranks in short.items()}
+
+    def suggest(self, text, limit=None):
+        # the best entries with a name or scientific name word starting with `text`
+        limit = limit or self.limit
+        prefix = normalize(text)
+        if not prefix:
+            return []
+
+        if len(prefix) <= SHORT_PREFIX and limit <= self.limit:
+            ranks = self.short.get(prefix, [])[:limit]
+        else:
+            low = bisect_left(self.keys, prefix)
+            high = bisect_left(self.keys, prefix + "￿", low)
+            ranks = heapq.nsmallest(limit, set(self.targets[low:high]))
+        return [self.entries[rank] for rank in ranks]
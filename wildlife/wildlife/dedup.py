@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import time
+
+from wildlife.spiders.afw_spider import AwfSpider
+from wildlife.spiders.wildlifetrusts_spider import WildlifeTrustsSpider
+from wildlife.spiders.wwf_spider import WwfSpider
+from wildlife.utils.minhash import THRESHOLD, deduplicate
+
+# Near-duplicate removal over whole JSON feeds, across sources: the same
+# record from several CommonCrawl captures, or copied between sites. The
+# first document of each group (in file order) is kept; --mode merge also
+# copies into it the fields only its duplicates have. Without --write the
+# feeds are only reported on.
+#
+# run command (from the wildlife/ folder): python3 -m wildlife.dedup [--mode merge] [--write]
+
+FEEDS = [WildlifeTrustsSpider.json_filename, AwfSpider.json_filename, WwfSpider.json_filename]
+
+
+def load_feeds(paths):
+    docs, origins = [], []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                docs.append(item)
+                origins.append(path)
+    return docs, origins
+
+
+def write_feed(path, docs):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(docs, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run(paths, mode="drop", threshold=THRESHOLD, write=False):
+    start = time.perf_counter()
+    docs, origins = load_feeds(paths)
+    origin = {id(doc): path for doc, path in zip(docs, origins)}
+
+    kept, removed = deduplicate(docs, mode, threshold)
+    elapsed = time.perf_counter() - start
+
+    for doc, original in removed:
+        print(f"{origin[id(doc)]}: {doc.get('url')} duplicates {origin[id(original)]}: {original.get('url')}")
+    print(f"{len(docs)} documents, {len(removed)} near-duplicates removed ({elapsed:.2f}s)")
+
+    if write:
+        for path in paths:
+            feed = [doc for doc in kept if origin[id(doc)] == path]
+            write_feed(path, feed)
+            print(f"{path}: {len(feed)} items")
+
+    return kept, removed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find and remove near-duplicate species records.")
+    parser.add_argument("paths", nargs="*", default=FEEDS, help="JSON feeds, earlier ones win (default: all three)")
+    parser.add_argument("--mode", choices=("drop", "merge"), default="drop")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="estimated Jaccard similarity")
+    parser.add_argument("--write", action="store_true", help="rewrite the feeds without the duplicates")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.paths, args.mode, args.threshold, args.write)
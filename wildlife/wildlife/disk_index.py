@@ -0,0 +1,287 @@
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+
+from wildlife.search_engine import SearchEngine
+from wildlife.similarity import TOP_K
+from wildlife.utils.analysis import SynonymMap
+from wildlife.utils.bitsets import bits, iter_bits
+
+# The embedded search engine's index (wildlife/search_engine.py) as one
+# file, opened with mmap: startup reads only a small JSON header, and the
+# worker processes serving the same file share its pages in the page cache.
+#
+#   magic, header length, header (JSON: schema, synonyms, document count,
+#   average field lengths and the offset of every section below), then
+#   8-byte aligned sections:
+#   - per text field: a sorted term dictionary (term bytes + uint32 offsets,
+#     searched with bisect), uint32 document frequencies, uint64 postings
+#     offsets and the postings, uint32 field lengths per document
+#   - per string field: the same dictionary, postings without positions
+#   - per numeric field (weight_kg_min, length_cm_max, ...): a float64
+#     column, NaN where a document has no value
+#   - the stored documents, as JSON, with uint64 offsets
+#
+# Postings are varints: for every document the gap from the previous
+# document number, then (text fields) the number of positions and the gaps
+# between them.
+#
+# run command (from the wildlife/ folder): python3 -m wildlife.disk_index
+# then python3 -m wildlife.search_engine --index species.idx
+
+MAGIC = b"WLIDX001"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "species.idx")
+STRING_TYPES = {"string", "strings"}
+
+
+def encode_varint(value, out):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_postings(postings, out):
+    # {doc: [positions]} (or [doc, ...]) in increasing document order
+    previous = 0
+    for doc in sorted(postings):
+        encode_varint(doc - previous, out)
+        previous = doc
+        if isinstance(postings, dict):
+            positions = postings[doc]
+            encode_varint(len(positions), out)
+            last = 0
+            for position in positions:
+                encode_varint(position - last, out)
+                last = position
+
+
+class Writer:
+    def __init__(self):
+        self.data = bytearray()
+        # name -> [offset from the end of the header, length]
+        self.sections = {}
+
+    def add(self, name, payload):
+        # payload: bytes or an array, stored 8-byte aligned
+        self.data.extend(b"\0" * (-len(self.data) % 8))
+        raw = payload.tobytes() if isinstance(payload, array) else bytes(payload)
+        self.sections[name] = [len(self.data), len(raw)]
+        self.data.extend(raw)
+
+    def add_terms(self, name, postings):
+        # postings: {term: {doc: [positions]} or [doc, ...]}
+        terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+        blob, offsets = bytearray(), array("I", [0])
+        data, starts, df = bytearray(), array("Q", [0]), array("I")
+        for term in terms:
+            blob.extend(term.encode("utf-8"))
+            offsets.append(len(blob))
+            encode_postings(postings[term], data)
+            starts.append(len(data))
+            df.append(len(postings[term]))
+        self.add(name + ".terms", blob)
+        self.add(name + ".term_offsets", offsets)
+        self.add(name + ".df", df)
+        self.add(name + ".postings", data)
+        self.add(name + ".postings_offsets", starts)
+
+
+def write_index(engine, path=DEFAULT_PATH):
+    # write the structures of an in-memory SearchEngine to `path`
+    writer = Writer()
+
+    for field, postings in engine.text.items():
+        writer.add_terms("text." + field, postings)
+        writer.add("text." + field + ".lengths", array("I", engine.lengths[field]))
+
+    exact = [field for field, (field_type, _) in engine.schema.items() if field_type in STRING_TYPES]
+    for field in exact:
+        writer.add_terms("exact." + field, {v: list(iter_bits(mask)) for v, mask in engine.exact_index(field).items()})
+
+    for field, column in engine.numbers.items():
+        writer.add("number." + field, array("d", column))
+
+    blob, offsets = bytearray(), array("Q", [0])
+    for doc in engine.docs:
+        blob.extend(json.dumps(doc, ensure_ascii=False).encode("utf-8"))
+        offsets.append(len(blob))
+    writer.add("docs", blob)
+    writer.add("docs.offsets", offsets)
+
+    header = json.dumps({
+        "doc_count": len(engine.docs),
+        "schema": engine.schema,
+        "synonyms": [[list(phrase), [list(a) for a in alternatives]] for phrase, alternatives in engine.synonyms.rules.items()],
+        "average_length": engine.average_length,
+        "text": list(engine.text),
+        "exact": exact,
+        "numbers": list(engine.numbers),
+        "sections": writer.sections,
+    }).encode("utf-8")
+    start = len(MAGIC) + 8 + len(header)
+    start += -start % 8
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        f.write(b"\0" * (start - f.tell()))
+        f.write(writer.data)
+    os.replace(tmp_path, path)
+    return start + len(writer.data)
+
+
+class SortedTerms:
+    # the term dictionary as a sequence of bytes, for bisect
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+
+class DiskTerms:
+    # {term: postings} of one field, read from the mapped file on lookup;
+    # decode(data, start, df) turns a term's postings into its value
+    def __init__(self, index, name, decode):
+        self.terms = SortedTerms(index.section(name + ".terms"), index.section(name + ".term_offsets", "I"))
+        self.df = index.section(name + ".df", "I")
+        self.postings = index.section(name + ".postings")
+        self.starts = index.section(name + ".postings_offsets", "Q")
+        self.decode = decode
+
+    def find(self, term):
+        key = term.encode("utf-8")
+        i = bisect.bisect_left(self.terms, key)
+        if i < len(self.terms) and self.terms[i] == key:
+            return i
+        return None
+
+    def get(self, term, default=None):
+        i = self.find(term)
+        if i is None:
+            return default
+        return self.decode(self.postings, self.starts[i], self.df[i])
+
+    def __contains__(self, term):
+        return self.find(term) is not None
+
+    def __len__(self):
+        return len(self.terms)
+
+    def items(self):
+        for i in range(len(self.terms)):
+            yield self.terms[i].decode("utf-8"), self.decode(self.postings, self.starts[i], self.df[i])
+
+
+def decode_positions(data, pos, df):
+    postings = {}
+    doc = 0
+    for _ in range(df):
+        gap, pos = decode_varint(data, pos)
+        doc += gap
+        count, pos = decode_varint(data, pos)
+        positions = []
+        position = 0
+        for _ in range(count):
+            gap, pos = decode_varint(data, pos)
+            position += gap
+            positions.append(position)
+        postings[doc] = positions
+    return postings
+
+
+def decode_bitset(data, pos, df):
+    docs = []
+    doc = 0
+    for _ in range(df):
+        gap, pos = decode_varint(data, pos)
+        doc += gap
+        docs.append(doc)
+    return bits(docs)
+
+
+class DiskDocs:
+    # the stored documents, decoded on access
+    def __init__(self, index):
+        self.blob = index.section("docs")
+        self.offsets = index.section("docs.offsets", "Q")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return json.loads(bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]))
+
+
+class DiskIndex:
+    # the structures SearchEngine.from_index() needs, over a mapped file
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a species index")
+        (length,) = struct.unpack_from("<Q", self.map, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self.map[start:start + length])
+        self.base = start + length + (-(start + length) % 8)
+        self.view = memoryview(self.map)
+        self.sections = header["sections"]
+
+        self.schema = {field: tuple(declared) for field, declared in header["schema"].items()}
+        self.synonyms = SynonymMap(([tuple(phrase)], [tuple(a) for a in alternatives])
+                                   for phrase, alternatives in header["synonyms"])
+        self.average_length = header["average_length"]
+        self.docs = DiskDocs(self)
+        self.text = {field: DiskTerms(self, "text." + field, decode_positions) for field in header["text"]}
+        self.lengths = {field: self.section("text." + field + ".lengths", "I") for field in header["text"]}
+        self.exact = {field: DiskTerms(self, "exact." + field, decode_bitset) for field in header["exact"]}
+        self.numbers = {field: self.section("number." + field, "d") for field in header["numbers"]}
+
+    def section(self, name, typecode=None):
+        offset, length = self.sections[name]
+        view = self.view[self.base + offset:self.base + offset + length]
+        return view.cast(typecode) if typecode else view
+
+
+def open_engine(path=DEFAULT_PATH):
+    return SearchEngine.from_index(DiskIndex(path))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the embedded search engine's on-disk index from the JSON feeds.")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    parser.add_argument("--no-merge", dest="merge", action="store_false",
+                        help="index the documents of a species found in several sources separately")
+    parser.add_argument("--related-k", type=int, default=TOP_K, help="similar species stored on every document (0: skip)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    engine = SearchEngine.from_feeds(merge=args.merge, related_k=args.related_k)
+    size = write_index(engine, args.output)
+    print(f"{len(engine.docs)} docs written to {args.output} ({size / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
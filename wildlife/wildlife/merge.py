@@ -0,0 +1,149 @@
+import json
+import re
+
+# One canonical document per species across the sources. Documents are
+# grouped (one dict lookup each) by their normalized scientific name; within
+# a group the first document, in source order, is the primary: its id, url,
+# name and other single values are kept, and the other documents fill the
+# fields it lacks. Where several sources have a field, numeric ranges
+# (<quantity>_min / <quantity>_max) are the union of their ranges, the
+# searchable text fields are joined and the list fields (facts, threats)
+# are the union of their items.
+# Where every value came from is stored as JSON in `provenance`.
+
+# genus species [ssp.] [subspecies]; anything else (several species, a
+# family, "Dendrolagus sp.") is not a single species and is never merged
+SPECIES_NAME = re.compile(r"([a-z]+) ([a-z][a-z-]+)(?: (?:ssp\.|subsp\.)? ?([a-z][a-z-]+))?")
+NOT_EPITHETS = {"and", "or", "sp", "spp", "families", "family"}
+
+# text fields the search reads (qf); the other text fields (dirty_overview,
+# raw_*) are displayed and keep the primary's value
+TEXT_FIELDS = [
+    "summary", "overview", "habitats", "distribution", "places", "location",
+    "facts", "threats", "diet", "predators", "why_they_matter", "how_to_identify",
+]
+
+
+def species_key(scientific_name):
+    # "Panthera  Leo" -> "panthera leo", "Giraffa camelopardalis ssp. peralta"
+    # -> "giraffa camelopardalis peralta", "Kudu (...), Lesser kudu (...)" -> None
+    if not isinstance(scientific_name, str):
+        return None
+
+    match = SPECIES_NAME.fullmatch(" ".join(scientific_name.lower().split()))
+    if not match or NOT_EPITHETS & set(match.groups()):
+        return None
+    return " ".join(g for g in match.groups() if g)
+
+
+def is_empty(value):
+    return value in (None, "", [])
+
+
+def as_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def fuse_range(values, bound):
+    # the widest bound among the members, kept as the member wrote it
+    numbers = [(as_number(v), v) for v in values]
+    numbers = [(n, v) for n, v in numbers if n is not None]
+    if not numbers:
+        return values[0]
+    pick = min if bound == "_min" else max
+    return pick(numbers, key=lambda nv: nv[0])[1]
+
+
+def fuse_items(values):
+    # the distinct items of list values (a single value counts as one item)
+    distinct = []
+    for value in values:
+        for item in value if isinstance(value, list) else [value]:
+            if item not in distinct:
+                distinct.append(item)
+    return distinct
+
+
+def fuse_text(values):
+    # single strings, joined
+    return "\n".join(str(t) for t in fuse_items(values))
+
+
+def merge_group(group):
+    # one canonical document from the documents of one species
+    primary = group[0]
+    merged = dict(primary)
+    provenance = {}
+
+    fields = []
+    for doc in group:
+        fields.extend(f for f in doc if f not in fields)
+
+    for field in fields:
+        if field in ("id", "source"):
+            continue
+
+        # one value per source: a later capture of the same page only fills gaps
+        present = {}
+        for doc in group:
+            if not is_empty(doc.get(field)):
+                present.setdefault(doc["source"], doc[field])
+        if not present:
+            continue
+        sources = list(present)
+        values = list(present.values())
+
+        bound = field[-4:]
+        if len(values) > 1 and bound in ("_min", "_max"):
+            merged[field] = fuse_range(values, bound)
+        elif len(values) > 1 and field in TEXT_FIELDS:
+            # a multi-valued field stays a list
+            if any(isinstance(v, list) for v in values):
+                merged[field] = fuse_items(values)
+            else:
+                merged[field] = fuse_text(values)
+        else:
+            merged[field] = values[0]
+            sources = sources[:1]
+
+        provenance[field] = sources
+
+    merged["sources"] = list(dict.fromkeys(doc["source"] for doc in group))
+    merged["source_urls"] = list(dict.fromkeys(doc.get("url") for doc in group if doc.get("url")))
+    merged["provenance"] = json.dumps(provenance, ensure_ascii=False)
+    return merged
+
+
+def merge_species(docs):
+    # -> (documents after merging, in input order with each canonical
+    # document at its primary's place, {member id: canonical id} for the
+    # documents of merged groups)
+    # documents with the same id are one document, the last one, as when
+    # Solr overwrites them
+    groups = {}
+    for doc in docs:
+        key = species_key(doc.get("scientific_name"))
+        if key:
+            groups.setdefault(key, {})[doc["id"]] = doc
+
+    canonical = {}
+    owner = {}
+    for group in groups.values():
+        group = list(group.values())
+        if len(group) < 2:
+            continue
+        merged = merge_group(group)
+        canonical[id(group[0])] = merged
+        for doc in group:
+            owner[doc["id"]] = merged["id"]
+
+    result = []
+    for doc in docs:
+        if id(doc) in canonical:
+            result.append(canonical[id(doc)])
+        elif doc["id"] not in owner:
+            result.append(dict(doc, sources=[doc["source"]]))
+    return result, owner
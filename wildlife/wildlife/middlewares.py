@@ -3,7 +3,14 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import hashlib
+import os
+from collections import OrderedDict
+from urllib.parse import urlparse
+
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
@@ -98,3 +105,127 @@ class WildlifeDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class WarcSegmentCacheMiddleware:
+    # Keeps every WARC record fetched from data.commoncrawl.org on disk, keyed
+    # by (filename, offset, length) of the ranged request, and serves repeated
+    # requests for the same record from there without going to the network.
+    # Least recently used records are evicted once the cache grows past
+    # WARC_CACHE_MAX_BYTES.
+
+    def __init__(self, cache_dir, max_bytes, stats=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self.total_bytes = 0
+        # key -> size, least recently used first
+        self.entries = OrderedDict()
+        self._scan()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("WARC_CACHE_ENABLED"):
+            raise NotConfigured
+
+        return cls(
+            cache_dir=settings.get("WARC_CACHE_DIR", "warc_cache"),
+            max_bytes=settings.getint("WARC_CACHE_MAX_BYTES", 2 * 1024 ** 3),
+            stats=crawler.stats,
+        )
+
+    def _scan(self):
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".warc.gz"):
+                    continue
+                st = os.stat(os.path.join(root, name))
+                found.append((st.st_mtime, name[: -len(".warc.gz")], st.st_size))
+
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def cache_key(request):
+        if "offset" not in request.meta or "length" not in request.meta:
+            return None
+
+        filename = urlparse(request.url).path.lstrip("/")
+        raw = f"{filename}:{request.meta['offset']}:{request.meta['length']}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".warc.gz")
+
+    def _inc(self, name, spider, count=1):
+        if self.stats:
+            self.stats.inc_value(f"warc_cache/{name}", count, spider=spider)
+
+    def process_request(self, request, spider):
+        key = self.cache_key(request)
+        if key is None:
+            return None
+
+        if key not in self.entries:
+            self._inc("miss", spider)
+            return None
+
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.total_bytes -= self.entries.pop(key)
+            self._inc("miss", spider)
+            return None
+
+        # mtime doubles as the recency used to rebuild the LRU order on startup
+        os.utime(path)
+        self.entries.move_to_end(key)
+        self._inc("hit", spider)
+
+        return Response(
+            url=request.url,
+            status=206,
+            body=body,
+            request=request,
+            flags=["warc_cache"],
+        )
+
+    def process_response(self, request, response, spider):
+        if "warc_cache" in response.flags or response.status not in (200, 206):
+            return response
+
+        key = self.cache_key(request)
+        if key is not None:
+            self._store(key, response.body, spider)
+
+        return response
+
+    def _store(self, key, body, spider):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        self.total_bytes += len(body) - self.entries.pop(key, 0)
+        self.entries[key] = len(body)
+        self._inc("stored", spider)
+
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            old_key, size = self.entries.popitem(last=False)
+            try:
+                os.remove(self.path_for(old_key))
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+            self._inc("evicted", spider)
+
+        if self.stats:
+            self.stats.set_value("warc_cache/bytes", self.total_bytes, spider=spider)
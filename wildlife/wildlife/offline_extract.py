@@ -0,0 +1,181 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+from warcio.archiveiterator import ArchiveIterator
+
+from wildlife.pipelines import JsonLinesFeedWriter, NearDuplicateFilter, compact_jsonl_to_json
+from wildlife.utils.html_parser import BACKENDS
+from wildlife.spiders.afw_spider import AwfSpider, extract_awf_species_data, normalize_awf_item
+from wildlife.spiders.wildlifetrusts_spider import WildlifeTrustsSpider, extract_wt_species_data
+from wildlife.spiders.wwf_spider import (
+    SPECIES_URL_PATTERN,
+    WwfSpider,
+    extract_wwf_species_data,
+    is_species_page,
+)
+
+# Re-runs the spiders' extractors over WARC records that are already on disk
+# (the warc_cache/ folder written by WarcSegmentCacheMiddleware, or any
+# .warc/.warc.gz files) on all cores, and writes the same JSON files the
+# spiders produce.
+#
+# run command (from the wildlife/ folder): python3 -m wildlife.offline_extract warc_cache/
+
+EXTRACTORS = {
+    "wwf": extract_wwf_species_data,
+    "awf": extract_awf_species_data,
+    "wildlife_trusts": extract_wt_species_data,
+}
+
+OUTPUT_FILES = {
+    "wwf": WwfSpider.json_filename,
+    "awf": AwfSpider.json_filename,
+    "wildlife_trusts": WildlifeTrustsSpider.json_filename,
+}
+
+BATCH_RECORDS = 256
+
+
+def source_for_url(url):
+    if "worldwildlife.org" in url:
+        return "wwf" if SPECIES_URL_PATTERN.match(url) else None
+    if "awf.org" in url:
+        return "awf"
+    if "wildlifetrusts.org" in url:
+        return "wildlife_trusts"
+    return None
+
+
+def iter_warc_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith((".warc", ".warc.gz")):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_response_records(paths):
+    # (url, html bytes) for every response record in the given files
+    for path in iter_warc_paths(paths):
+        # streamed: a CommonCrawl file is about 1 GB
+        with open(path, "rb") as f:
+            for record in ArchiveIterator(f):
+                if record.rec_type != "response":
+                    continue
+                url = record.rec_headers.get_header("WARC-Target-URI")
+                yield url, record.content_stream().read()
+
+
+def extract_record(task):
+    source, url, html_bytes = task
+    html_text = html_bytes.decode("utf-8", errors="ignore")
+    return source, EXTRACTORS[source](html_text, url)
+
+
+def iter_tasks(paths, sources):
+    for url, html_bytes in iter_response_records(paths):
+        source = source_for_url(url or "")
+        if source in sources:
+            yield source, url, html_bytes
+
+
+def iter_chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SpiderFilters:
+    # Applies the same per-item checks as the spiders' parse_warc and
+    # DedupPipeline, in input order
+
+    def __init__(self):
+        self.wwf_names_seen = set()
+        self.duplicates = {source: NearDuplicateFilter() for source in EXTRACTORS}
+
+    def accept(self, source, extracted):
+        item = self.check(source, extracted)
+        if item is None or self.duplicates[source].duplicate_of(item) is not None:
+            return None
+        return item
+
+    def check(self, source, extracted):
+        if source == "wwf":
+            if not is_species_page(extracted):
+                return None
+            name = extracted["name"].lower()
+            if name in self.wwf_names_seen:
+                return None
+            self.wwf_names_seen.add(name)
+            return extracted
+
+        if source == "awf":
+            return normalize_awf_item(extracted)
+
+        return extracted
+
+
+def run(paths, sources=tuple(EXTRACTORS), output_dir=".", processes=None):
+    start = time.perf_counter()
+    writers = {
+        source: JsonLinesFeedWriter(os.path.join(output_dir, OUTPUT_FILES[source] + "l"))
+        for source in sources
+    }
+    filters = SpiderFilters()
+    records = 0
+
+    # records are handed out in bounded chunks so a large corpus is never
+    # fully queued in memory; imap keeps the input order
+    with Pool(processes) as pool:
+        for chunk in iter_chunks(iter_tasks(paths, sources), BATCH_RECORDS):
+            records += len(chunk)
+            for source, extracted in pool.imap(extract_record, chunk, chunksize=4):
+                item = filters.accept(source, extracted)
+                if item is not None:
+                    writers[source].write(item)
+
+    for source, writer in writers.items():
+        writer.close()
+        json_path = os.path.join(output_dir, OUTPUT_FILES[source])
+        count = compact_jsonl_to_json(writer.path, json_path)
+        os.remove(writer.path)
+        print(f"{source}: {count} items -> {json_path}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{records} records in {elapsed:.1f}s ({records / elapsed if elapsed else 0:.1f} records/sec)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the species extractors over local WARC files.")
+    parser.add_argument("paths", nargs="+", help="WARC files or folders (e.g. warc_cache/)")
+    parser.add_argument("--source", choices=sorted(EXTRACTORS), action="append",
+                        help="only extract this source (repeatable, default: all)")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--processes", type=int, default=None, help="default: number of CPUs")
+    parser.add_argument("--parser", choices=BACKENDS, default=None,
+                        help="HTML parser backend (default: WILDLIFE_HTML_PARSER or html.parser)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.parser:
+        # read by make_soup in the worker processes as well
+        os.environ["WILDLIFE_HTML_PARSER"] = args.parser
+    run(
+        args.paths,
+        sources=tuple(args.source) if args.source else tuple(EXTRACTORS),
+        output_dir=args.output_dir,
+        processes=args.processes,
+    )
@@ -3,11 +3,162 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import json
+import os
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem
+
+from wildlife.utils.minhash import THRESHOLD, NearDuplicateIndex
 
 
 class WildlifePipeline:
     def process_item(self, item, spider):
         return item
+
+
+class NearDuplicateFilter:
+    # duplicate_of(item) is the url of an earlier item the new one is a
+    # near-duplicate of (MinHash over its overview and scientific name), or
+    # None, and the item is remembered.
+
+    def __init__(self, threshold=THRESHOLD):
+        self.index = NearDuplicateIndex(threshold)
+        self.urls = []
+
+    def duplicate_of(self, item):
+        sig = self.index.signature(item)
+        match = self.index.find(sig)
+        if match is not None:
+            return self.urls[match]
+
+        self.index.add(len(self.urls), sig)
+        self.urls.append(item.get("url"))
+        return None
+
+
+class DedupPipeline:
+    # Drops the items that repeat one already scraped by the spider, e.g. the
+    # same species from another CommonCrawl capture. Items are streamed to the
+    # feed as they come, so duplicates are dropped, not merged; merging is
+    # done over whole feeds by wildlife.dedup.
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.filter = None
+        self.dropped = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(threshold=crawler.settings.getfloat("DEDUP_THRESHOLD", THRESHOLD))
+
+    def open_spider(self, spider):
+        self.filter = NearDuplicateFilter(self.threshold)
+        self.dropped = 0
+
+    def process_item(self, item, spider):
+        original = self.filter.duplicate_of(ItemAdapter(item).asdict())
+        if original is not None:
+            self.dropped += 1
+            raise DropItem(f"near-duplicate of {original}")
+        return item
+
+    def close_spider(self, spider):
+        spider.logger.info(f"Dropped {self.dropped} near-duplicate items")
+
+
+class JsonLinesFeedWriter:
+    # Append-only JSON Lines writer: every item costs one line of output,
+    # and the file is fsync'd once per `fsync_every` items instead of per item.
+
+    def __init__(self, path, fsync_every=100):
+        self.path = path
+        self.fsync_every = max(1, int(fsync_every))
+        self.count = 0
+        self._pending = 0
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, item):
+        self._file.write(json.dumps(item, ensure_ascii=False))
+        self._file.write("\n")
+        self.count += 1
+        self._pending += 1
+
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+
+def compact_jsonl_to_json(jsonl_path, json_path):
+    # Rewrites a JSON Lines file as the indented JSON array the spiders used to
+    # produce with json.dump(items, f, indent=2), one item at a time.
+    tmp_path = json_path + ".tmp"
+    written = 0
+
+    with open(jsonl_path, "r", encoding="utf-8") as src, \
+            open(tmp_path, "w", encoding="utf-8") as dst:
+        dst.write("[")
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+
+            item = json.loads(line)
+            dumped = json.dumps(item, indent=2, ensure_ascii=False)
+
+            dst.write(",\n" if written else "\n")
+            dst.write("\n".join("  " + l for l in dumped.split("\n")))
+            written += 1
+
+        dst.write("\n]" if written else "]")
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    os.replace(tmp_path, json_path)
+    return written
+
+
+class JsonFeedExportPipeline:
+    # Streams every item to <json_filename>l while the spider runs and compacts
+    # it into <json_filename> (JSON array, same format as before) on close.
+
+    def __init__(self, fsync_every=100, keep_jsonl=False):
+        self.fsync_every = fsync_every
+        self.keep_jsonl = keep_jsonl
+        self.writer = None
+        self.json_filename = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            fsync_every=crawler.settings.getint("JSON_FEED_FSYNC_EVERY", 100),
+            keep_jsonl=crawler.settings.getbool("JSON_FEED_KEEP_JSONL", False),
+        )
+
+    def open_spider(self, spider):
+        self.json_filename = getattr(spider, "json_filename", f"{spider.name}.json")
+        self.writer = JsonLinesFeedWriter(self.json_filename + "l", self.fsync_every)
+
+    def process_item(self, item, spider):
+        self.writer.write(ItemAdapter(item).asdict())
+        return item
+
+    def close_spider(self, spider):
+        self.writer.close()
+
+        count = compact_jsonl_to_json(self.writer.path, self.json_filename)
+        spider.logger.info(f"Wrote {count} items to {self.json_filename}")
+
+        if not self.keep_jsonl:
+            os.remove(self.writer.path)
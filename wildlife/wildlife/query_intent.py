@@ -0,0 +1,228 @@
+import re
+
+# Numeric conditions in a search query ("elephants over 2 tons living 60
+# years") as range filters on the indexed fields, in the units the spiders
+# store (wildlife/utils/measurements.py): weight in kg, lengths in cm,
+# lifespan in years, population as a count.
+#
+# One compiled pattern reads the query in a single pass as a stream of
+# comparatives (over, under, between, heavier than, >=, ...), numbers,
+# range joiners (to, -, and after between), units / scale words and
+# attribute words (weighing, long, living, population, ...). A number takes
+# the unit written right after it ("2-3 tons"); a number without one is
+# bound to the closest attribute word at most REACH words away, the one
+# before it on a tie. Numbers bound to nothing stay search text; the
+# conditions read, and the attribute words next to them, are removed from it.
+#
+# Standalone (re only): frontend/index.html loads this file into PyScript
+# next to search_cli.py, and the embedded search engine imports it.
+
+# quantity -> indexed field prefix (<prefix>_min / <prefix>_max)
+FIELDS = {
+    "weight": "weight_kg",
+    "length": "length_cm",
+    "lifespan": "lifespan_year",
+    "population": "population",
+}
+
+# word -> (quantity, factor to the indexed unit)
+UNITS = {
+    "kg": ("weight", 1), "kgs": ("weight", 1), "kilo": ("weight", 1), "kilos": ("weight", 1),
+    "kilogram": ("weight", 1), "kilograms": ("weight", 1),
+    "g": ("weight", 0.001), "gram": ("weight", 0.001), "grams": ("weight", 0.001),
+    "ton": ("weight", 1000), "tons": ("weight", 1000), "tonne": ("weight", 1000), "tonnes": ("weight", 1000),
+    "lb": ("weight", 0.453592), "lbs": ("weight", 0.453592),
+    "pound": ("weight", 0.453592), "pounds": ("weight", 0.453592),
+    "oz": ("weight", 0.0283495), "ounce": ("weight", 0.0283495), "ounces": ("weight", 0.0283495),
+    "mm": ("length", 0.1), "millimeter": ("length", 0.1), "millimeters": ("length", 0.1),
+    "millimetre": ("length", 0.1), "millimetres": ("length", 0.1),
+    "cm": ("length", 1), "centimeter": ("length", 1), "centimeters": ("length", 1),
+    "centimetre": ("length", 1), "centimetres": ("length", 1),
+    "m": ("length", 100), "meter": ("length", 100), "meters": ("length", 100),
+    "metre": ("length", 100), "metres": ("length", 100),
+    "ft": ("length", 30.48), "foot": ("length", 30.48), "feet": ("length", 30.48),
+    "inch": ("length", 2.54), "inches": ("length", 2.54),
+    "year": ("lifespan", 1), "years": ("lifespan", 1), "yr": ("lifespan", 1), "yrs": ("lifespan", 1),
+}
+
+# multiply the number; without a unit the number is a population
+SCALES = {"thousand": 1_000, "million": 1_000_000, "millions": 1_000_000, "billion": 1_000_000_000}
+
+# phrase -> (comparison, quantity it implies or None)
+COMPARATIVES = {
+    "over": ("over", None), "above": ("over", None), "exceeding": ("over", None),
+    "more than": ("over", None), "greater than": ("over", None), "at least": ("over", None),
+    "bigger than": ("over", "length"), "larger than": ("over", "length"),
+    "longer than": ("over", "length"), "taller than": ("over", "length"),
+    "heavier than": ("over", "weight"), "older than": ("over", "lifespan"),
+    "under": ("under", None), "below": ("under", None), "up to": ("under", None),
+    "less than": ("under", None), "fewer than": ("under", None), "at most": ("under", None),
+    "smaller than": ("under", "length"), "shorter than": ("under", "length"),
+    "lighter than": ("under", "weight"), "younger than": ("under", "lifespan"),
+    "between": ("between", None), "from": ("between", None),
+    "about": ("about", None), "around": ("about", None), "approximately": ("about", None),
+    "roughly": ("about", None), "exactly": ("about", None),
+    ">": ("over", None), ">=": ("over", None), "<": ("under", None), "<=": ("under", None),
+    "~": ("about", None),
+}
+
+ATTRIBUTES = {
+    "weight": ["weigh", "weighs", "weighing", "weighed", "weight", "weights", "heavy", "mass"],
+    "length": ["long", "length", "tall", "height", "size", "sized"],
+    "lifespan": ["live", "lives", "living", "lived", "lifespan", "life", "age", "old"],
+    "population": ["population", "populations", "individuals", "left", "remaining", "remain"],
+}
+ATTRIBUTE_WORDS = {word: quantity for quantity, words in ATTRIBUTES.items() for word in words}
+
+# words allowed between an attribute word and its number ("weight of about")
+REACH = 2
+
+# left around the removed conditions: "lions that weigh over 150 kg"
+FILLERS = {"and", "or", "with", "that", "which", "who", "are", "is", "of", "in", "a", "an"}
+
+
+def _alternatives(words):
+    # longest first, so "kilograms" is not read as "kilogram"; a space
+    # matches any run of whitespace
+    ordered = sorted(words, key=len, reverse=True)
+    return "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in ordered)
+
+
+_WORD = r"(?<![a-z]){}(?![a-z])"
+TOKEN_PATTERN = re.compile("|".join([
+    r"(?P<number>(?<![\w.])\d+(?:,\d{3})*(?:\.\d+)?)",
+    "(?P<comparative>" + _WORD.format(f"(?:{_alternatives(w for w in COMPARATIVES if w[0].isalpha())})") + ")",
+    r"(?P<symbol>[<>]=?|~)",
+    "(?P<unit>" + _WORD.format(f"(?:{_alternatives(list(UNITS) + list(SCALES))})") + ")",
+    r"(?P<join>" + _WORD.format("(?:to|and)") + r"|-|–)",
+    "(?P<attribute>" + _WORD.format(f"(?:{_alternatives(ATTRIBUTE_WORDS)})") + ")",
+]))
+
+
+def _adjacent(text, measure, start):
+    return measure is not None and not text[measure["end"]:start].strip()
+
+
+def _gap(text, keyword, measure):
+    # (words between them, keyword after the measure)
+    if keyword[1] <= measure["start"]:
+        return len(text[keyword[1]:measure["start"]].split()), False
+    return len(text[measure["end"]:keyword[0]].split()), True
+
+
+def _spans(removed):
+    # sorted, overlapping spans merged
+    merged = []
+    for start, end in sorted(removed):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def range_fq(field, low, high):
+    # documents whose [<field>_min, <field>_max] range overlaps [low, high]
+    return f"{field}_min:[* TO {high}] AND {field}_max:[{low} TO *]"
+
+
+def parse_query_intent(query):
+    # -> {"text": the query without the conditions read,
+    #     "filters": [(field prefix, low, high)], "*" for an open bound}
+    text = query.lower()
+    measures = []
+    keywords = []  # (start, end, quantity)
+    comparison = None
+    current = None
+    joined = None  # end of a range joiner right after `current`
+
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        word = " ".join(match.group().split())
+        start, end = match.span()
+
+        if kind == "number":
+            value = float(word.replace(",", ""))
+            if joined is not None and not text[joined:start].strip() and len(current["values"]) == 1:
+                current["values"].append(value)
+                current["end"] = end
+            else:
+                # a comparative applies to the number right after it
+                if comparison and text[comparison[2]:start].strip():
+                    comparison = None
+                current = {"comparison": comparison and comparison[0], "values": [value],
+                           "quantity": None, "factor": 1, "scale": 1,
+                           "start": comparison[1] if comparison else start, "end": end}
+                measures.append(current)
+            comparison = None
+            joined = None
+
+        elif kind in ("comparative", "symbol"):
+            name, implied = COMPARATIVES[word]
+            comparison = (name, start, end)
+            if implied:
+                keywords.append((start, end, implied))
+            current = None
+
+        elif kind == "unit":
+            if _adjacent(text, current, start):
+                if word in SCALES:
+                    current["scale"] = SCALES[word]
+                else:
+                    current["quantity"], current["factor"] = UNITS[word]
+                current["end"] = end
+            elif word in UNITS:
+                # "weight in kg over 100": the unit names the attribute
+                keywords.append((start, end, UNITS[word][0]))
+
+        elif kind == "join":
+            if _adjacent(text, current, start) and (word != "and" or current["comparison"] == "between"):
+                joined = end
+
+        elif kind == "attribute":
+            keywords.append((start, end, ATTRIBUTE_WORDS[word]))
+            current = None
+
+    filters = []
+    removed = []
+    for measure in measures:
+        near = [k for k in keywords if _gap(text, k, measure)[0] <= REACH]
+        quantity = measure["quantity"]
+        if quantity is None and near:
+            quantity = min(near, key=lambda k: _gap(text, k, measure))[2]
+        if quantity is None and measure["scale"] > 1:
+            quantity = "population"
+        if quantity is None:
+            continue
+
+        values = [round(v * measure["factor"] * measure["scale"], 4) for v in measure["values"]]
+        low, high = min(values), max(values)
+        if len(values) == 1 and measure["comparison"] == "over":
+            high = "*"
+        elif len(values) == 1 and measure["comparison"] == "under":
+            low = "*"
+        filters.append((FIELDS[quantity], low, high))
+        removed.append((measure["start"], measure["end"]))
+        removed.extend(k[:2] for k in near if k[2] == quantity)
+
+    # the query's words, None where a condition was
+    words = []
+    position = 0
+    for start, end in _spans(removed):
+        words.extend(query[position:start].split())
+        words.append(None)
+        position = end
+    words.extend(query[position:].split())
+
+    # drop the fillers left next to a condition ("with a") or at the end
+    changed = bool(removed)
+    while changed:
+        changed = False
+        for i, w in enumerate(words):
+            if w is not None and w.lower() in FILLERS and (
+                (i > 0 and words[i - 1] is None) or i + 1 == len(words) or words[i + 1] is None
+            ):
+                words[i] = None
+                changed = True
+    kept = [w for w in words if w is not None]
+    return {"text": " ".join(kept), "filters": filters}
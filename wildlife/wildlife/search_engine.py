@@ -0,0 +1,661 @@
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from wildlife.merge import merge_species
+from wildlife.query_intent import parse_query_intent, range_fq
+from wildlife.similarity import TOP_K, build_related, features, neighbours_engine, similarity
+from wildlife.utils.analysis import SynonymMap, tokenize
+from wildlife.utils.bitsets import IntervalIndex, SortedColumn, bits, iter_bits
+
+# An in-process stand-in for the wild_life Solr core, for offline use and
+# tests. It indexes the three JSON feeds the way index_to_solr.py sends them
+# (species merged, related species attached), analyzes the fields declared
+# text_syn in schema_fields_for_solr.xml like Solr does (standard tokens,
+# lowercase, synonyms from synonyms_to_add_in_conf_folder.txt) and answers the
+# select requests the frontend sends: edismax-like q with qf / pf / mm / tie
+# and BM25 scores, fq range / term filters, facet.field, fl, rows and start.
+# q={!mlt}<id> ranks the documents the filters keep by their similarity to
+# that document (wildlife/similarity.py) instead.
+#
+# run command (from the wildlife/ folder): python3 -m wildlife.search_engine
+# serves http://localhost:8983/solr/wild_life/select, so frontend/ works
+# without Solr.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT, "schema_fields_for_solr.xml")
+SYNONYMS_PATH = os.path.join(ROOT, "synonyms_to_add_in_conf_folder.txt")
+
+SOURCES = [
+    ("wildlifetrusts.json", "WT"),
+    ("awf.json", "AWF"),
+    ("wwf.json", "WWF"),
+]
+
+# the request frontend/search_cli.py's search() sends
+QF = "name^8 scientific_name^6 summary^4 overview^4 habitats^2 distribution^2 facts^1.5 threats^1 diet^1"
+PF = "name^12 scientific_name^8"
+MM = "1<75%"
+TIE = 0.1
+FL = [
+    "id", "name", "scientific_name", "animal_type", "image_url", "url", "dirty_overview",
+    "weight_kg_min", "weight_kg_max",
+    "length_cm_min", "length_cm_max",
+    "lifespan_year_min", "lifespan_year_max",
+    "population_min", "population_max",
+    "how_to_identify", "summary", "overview", "related_docs",
+]
+
+# Lucene's BM25Similarity defaults
+K1 = 1.2
+B = 0.75
+# gap between the values of a multi-valued field, so phrases never span two
+POSITION_GAP = 100
+
+TEXT_TYPES = {"text_syn", "text_general"}
+FIELD_PATTERN = re.compile(r'<field name="([^"]+)" type="([^"]+)"([^>]*)/>')
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+QUERY_TOKEN = re.compile(r'([+-]?)(?:([\w.]+):)?("[^"]*"|\[[^\]]*\]|\S+)')
+RANGE_PATTERN = re.compile(r"\[\s*(\S+)\s+TO\s+(\S+)\s*\]")
+LOCAL_PARAMS = re.compile(r"\{!(\w+)\s+f=([\w.]+)\}(.*)", re.S)
+# the frontend's range filter: <quantity>_min:[* TO high] AND <quantity>_max:[low TO *]
+OVERLAP_PATTERN = re.compile(r"(\w+)_min:\[\s*\*\s+TO\s+(\S+)\s*\]\s+AND\s+\1_max:\[\s*(\S+)\s+TO\s+\*\s*\]")
+# Solr's MoreLikeThis query parser, q={!mlt}<id>
+MLT_PATTERN = re.compile(r"\{!mlt[^}]*\}(.+)", re.S)
+
+
+def load_schema(path=SCHEMA_PATH):
+    # {field: (type, multi-valued)} of the fields declared for the core
+    with open(path, "r", encoding="utf-8") as f:
+        return {
+            name: (field_type, 'multiValued="true"' in rest)
+            for name, field_type, rest in FIELD_PATTERN.findall(f.read())
+        }
+
+
+def as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def is_number(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    return isinstance(value, str) and NUMBER_PATTERN.fullmatch(value.strip()) is not None
+
+
+def parse_boosts(spec):
+    # "name^8 overview" -> [("name", 8.0), ("overview", 1.0)]
+    fields = []
+    for part in spec.split():
+        name, _, boost = part.partition("^")
+        fields.append((name, float(boost) if boost else 1.0))
+    return fields
+
+
+def min_should_match(spec, optional):
+    # how many of `optional` clauses must match, for mm specs such as "2",
+    # "75%", "-1", "-25%" and conditional "3<90% 6<-2" chains
+    spec = str(spec).strip()
+    if not spec:
+        return optional
+
+    def amount(value):
+        if value.endswith("%"):
+            percent = float(value[:-1])
+            count = int(optional * abs(percent) / 100)
+            return optional - count if percent < 0 else count
+        count = int(value)
+        return optional + count if count < 0 else count
+
+    if "<" not in spec:
+        required = amount(spec)
+    else:
+        required = optional
+        for condition in spec.split():
+            limit, _, value = condition.partition("<")
+            if optional > int(limit):
+                required = amount(value)
+    return max(0, min(required, optional))
+
+
+class Clause:
+    # one part of q: `slots` from the analyzer scored over `fields`, or an
+    # exact value (`value`) for a string field
+    def __init__(self, fields, slots=None, value=None, phrase=False, required=False, negated=False):
+        self.fields = fields
+        self.slots = slots
+        self.value = value
+        self.phrase = phrase
+        self.required = required
+        self.negated = negated
+
+
+class SearchEngine:
+    def __init__(self, docs, schema=None, synonyms=None):
+        self.schema = load_schema() if schema is None else schema
+        self.synonyms = SynonymMap.load(SYNONYMS_PATH) if synonyms is None else synonyms
+        self.docs = [self.stored(doc) for doc in docs]
+        self.all = (1 << len(self.docs)) - 1
+
+        self.text = {}
+        self.lengths = {}
+        self.average_length = {}
+        self.numbers = {}
+        self.exact = {}
+        self.columns = {}
+        self.features = {}
+
+        for field, (field_type, _) in self.schema.items():
+            if field_type in TEXT_TYPES:
+                self.index_text(field)
+        # numeric fields as columns of floats, NaN where a document has none
+        for field in {f for doc in self.docs for f in doc}:
+            values = [doc.get(field) for doc in self.docs]
+            if all(v is None or (isinstance(v, list) and all(isinstance(x, float) for x in v)) for v in values):
+                self.numbers[field] = array("d", (v[0] if v else math.nan for v in values))
+
+    @classmethod
+    def from_index(cls, index):
+        # an engine over structures built beforehand, such as an on-disk
+        # index opened by wildlife/disk_index.py
+        engine = cls.__new__(cls)
+        for name in ("schema", "synonyms", "docs", "text", "lengths", "average_length", "numbers", "exact"):
+            setattr(engine, name, getattr(index, name))
+        engine.all = (1 << len(engine.docs)) - 1
+        engine.columns = {}
+        engine.features = {}
+        return engine
+
+    @classmethod
+    def from_feeds(cls, sources=SOURCES, root=ROOT, merge=True, related_k=TOP_K, engine="auto"):
+        # the documents index_to_solr.py would index with the same options
+        docs = []
+        for path, source in sources:
+            with open(os.path.join(root, path), "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    item["id"] = item.get("url")
+                    item["source"] = source
+                    docs.append(item)
+
+        if merge:
+            docs, _ = merge_species(docs)
+        if related_k > 0:
+            related = build_related(docs, related_k, neighbours_engine(engine))
+            for doc in docs:
+                doc.update(related.get(doc["id"], {}))
+
+        # a re-sent id replaces the earlier document, as a Solr update does
+        unique = {}
+        for doc in docs:
+            unique.pop(doc["id"], None)
+            unique[doc["id"]] = doc
+        return cls(list(unique.values()))
+
+    # ---------------- indexing ----------------
+
+    def stored(self, doc):
+        # the document as Solr returns it: declared single-valued fields as
+        # sent, declared multi-valued ones as lists, and the fields Solr adds
+        # to the schema itself (all multi-valued) as lists of floats when
+        # numeric, of strings otherwise
+        result = {}
+        for field, value in doc.items():
+            if value is None or value == []:
+                continue
+            declared = self.schema.get(field)
+            if declared:
+                result[field] = as_list(value) if declared[1] else value
+                continue
+            values = as_list(value)
+            if all(is_number(v) for v in values):
+                result[field] = [float(v) for v in values]
+            else:
+                result[field] = values
+        return result
+
+    def analyze(self, field, text):
+        if self.schema.get(field, ("",))[0] == "text_syn":
+            return self.synonyms.analyze(text)
+        return [(i, [(t,)]) for i, t in enumerate(tokenize(text))]
+
+    def index_text(self, field):
+        postings = {}
+        lengths = []
+        for doc_id, doc in enumerate(self.docs):
+            offset = 0
+            for value in as_list(doc.get(field, [])):
+                slots = self.analyze(field, str(value))
+                for position, alternatives in slots:
+                    for alternative in alternatives:
+                        for k, term in enumerate(alternative):
+                            postings.setdefault(term, {}).setdefault(doc_id, []).append(offset + position + k)
+                offset += (slots[-1][0] + 1 if slots else 0) + POSITION_GAP
+            lengths.append(max(0, offset - POSITION_GAP) if offset else 0)
+
+        self.text[field] = postings
+        self.lengths[field] = lengths
+        present = [n for n in lengths if n]
+        self.average_length[field] = sum(present) / len(present) if present else 1.0
+
+    def sorted_column(self, field):
+        # SortedColumn of a numeric field (range filters), None if not numeric
+        if field not in self.columns:
+            values = self.numbers.get(field)
+            self.columns[field] = SortedColumn(values) if values is not None else None
+        return self.columns[field]
+
+    def interval_index(self, quantity):
+        # IntervalIndex of <quantity>_min / <quantity>_max, e.g. "weight_kg"
+        lows = self.sorted_column(quantity + "_min")
+        highs = self.sorted_column(quantity + "_max")
+        if lows is None or highs is None:
+            return None
+        return IntervalIndex(lows, highs)
+
+    def doc_features(self, doc):
+        if doc not in self.features:
+            self.features[doc] = features(self.docs[doc])
+        return self.features[doc]
+
+    def exact_index(self, field):
+        # {value: bitset} of a field matched as a whole (string fields)
+        index = self.exact.get(field)
+        if index is None:
+            docs = {}
+            for doc_id, doc in enumerate(self.docs):
+                for value in as_list(doc.get(field, [])):
+                    docs.setdefault(str(value), []).append(doc_id)
+            index = self.exact[field] = {value: bits(ids) for value, ids in docs.items()}
+        return index
+
+    # ---------------- scoring ----------------
+
+    def slot_positions(self, field, alternatives):
+        # {doc: positions where one of the alternatives starts}
+        postings = self.text.get(field, {})
+        found = {}
+        for alternative in alternatives:
+            first = postings.get(alternative[0])
+            if not first:
+                continue
+            for doc, starts in first.items():
+                if len(alternative) > 1:
+                    rest = [postings.get(t, {}).get(doc) for t in alternative[1:]]
+                    if not all(rest):
+                        continue
+                    rest = [set(r) for r in rest]
+                    starts = [p for p in starts if all(p + k + 1 in r for k, r in enumerate(rest))]
+                if starts:
+                    found.setdefault(doc, set()).update(starts)
+        return found
+
+    def idf(self, df):
+        n = len(self.docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def bm25(self, field, boost, idf, frequencies):
+        lengths = self.lengths[field]
+        average = self.average_length[field]
+        return {
+            doc: boost * idf * tf / (tf + K1 * (1 - B + B * lengths[doc] / average))
+            for doc, tf in frequencies.items()
+        }
+
+    def field_scores(self, field, boost, slots, phrase):
+        if field not in self.text:
+            return {}
+
+        if not phrase:
+            alternatives = slots[0][1]
+            if len(alternatives) == 1 and len(alternatives[0]) == 1:
+                postings = self.text[field].get(alternatives[0][0], {})
+                return self.bm25(field, boost, self.idf(len(postings)), {d: len(p) for d, p in postings.items()})
+            found = self.slot_positions(field, alternatives)
+            return self.bm25(field, boost, self.idf(len(found)), {d: len(p) for d, p in found.items()})
+
+        # every slot at its offset from the first one
+        base = slots[0][0]
+        matches = None
+        idf = 0.0
+        for position, alternatives in slots:
+            found = self.slot_positions(field, alternatives)
+            idf += self.idf(len(found))
+            shifted = {d: {p - (position - base) for p in ps} for d, ps in found.items()}
+            if matches is None:
+                matches = shifted
+            else:
+                matches = {d: matches[d] & shifted[d] for d in matches.keys() & shifted.keys()}
+                matches = {d: ps for d, ps in matches.items() if ps}
+            if not matches:
+                return {}
+        return self.bm25(field, boost, idf, {d: len(ps) for d, ps in matches.items()})
+
+    def clause_scores(self, clause, tie):
+        if clause.value is not None:
+            field = clause.fields[0][0]
+            mask = self.exact_index(field).get(clause.value, 0)
+            docs = list(iter_bits(mask))
+            idf = self.idf(len(docs))
+            return {doc: clause.fields[0][1] * idf for doc in docs}
+
+        # dismax over the fields: the best field plus `tie` times the others
+        best = {}
+        total = {}
+        for field, boost in clause.fields:
+            for doc, score in self.field_scores(field, boost, clause.slots, clause.phrase).items():
+                total[doc] = total.get(doc, 0.0) + score
+                if score > best.get(doc, 0.0):
+                    best[doc] = score
+        return {doc: best[doc] + tie * (total[doc] - best[doc]) for doc in best}
+
+    # ---------------- queries ----------------
+
+    def parse_query(self, q, qf):
+        # edismax-like: words (analyzed together, so multi-word synonyms match
+        # across them), "phrases", field:value, +required, -excluded / NOT.
+        # AND / OR are ignored; mm decides how many clauses must match.
+        clauses = []
+        words = []
+
+        def flush():
+            text = " ".join(words)
+            words.clear()
+            for slot in self.synonyms.analyze(text):
+                clauses.append(Clause(qf, [slot]))
+
+        negate_next = False
+        for sign, field, value in QUERY_TOKEN.findall(q):
+            if not sign and not field and value in ("AND", "OR", "&&", "||"):
+                continue
+            if not sign and not field and value == "NOT":
+                negate_next = True
+                continue
+
+            negated = sign == "-" or negate_next
+            negate_next = False
+            quoted = value.startswith('"') and value.endswith('"') and len(value) > 1
+            text = value[1:-1] if quoted else value
+
+            if field and self.schema.get(field, ("",))[0] not in TEXT_TYPES and field not in self.text:
+                clauses.append(Clause([(field, 1.0)], value=text, required=sign == "+", negated=negated))
+                continue
+
+            fields = [(field, 1.0)] if field else qf
+            if not field and not quoted and not sign and not negated:
+                words.append(text)
+                continue
+
+            flush()
+            slots = self.analyze(field or "overview", text)
+            if slots:
+                clauses.append(Clause(fields, slots, phrase=len(slots) > 1,
+                                      required=sign == "+", negated=negated))
+        flush()
+        return clauses
+
+    def filter_mask(self, fq):
+        # bitset of the documents an fq keeps
+        local = LOCAL_PARAMS.fullmatch(fq.strip())
+        if local:
+            parser, field, values = local.groups()
+            if parser == "terms":
+                values = values.split(",")
+            elif parser == "term":
+                values = [values]
+            else:
+                raise ValueError(f"Unsupported filter query parser: {parser}")
+            index = self.exact_index(field)
+            mask = 0
+            for value in values:
+                mask |= index.get(value, 0)
+            return mask
+
+        overlap = OVERLAP_PATTERN.fullmatch(fq.strip())
+        if overlap:
+            quantity, high, low = overlap.groups()
+            index = self.interval_index(quantity)
+            if index is not None:
+                return index.overlapping(-math.inf if low == "*" else float(low),
+                                         math.inf if high == "*" else float(high))
+
+        mask = self.all
+        for part in re.split(r"\s+AND\s+", fq.strip()):
+            mask &= self.part_mask(part, fq)
+        return mask
+
+    def part_mask(self, part, fq):
+        if part == "*:*":
+            return self.all
+
+        field, colon, value = part.partition(":")
+        if not colon:
+            raise ValueError(f"Unsupported filter query: {fq}")
+
+        bounds = RANGE_PATTERN.fullmatch(value)
+        if bounds:
+            low, high = bounds.groups()
+            column = self.sorted_column(field)
+            if column is None:
+                return 0
+            return column.between(-math.inf if low == "*" else float(low), math.inf if high == "*" else float(high))
+
+        value = value.strip('"')
+        if field in self.text:
+            clause = Clause([(field, 1.0)], self.analyze(field, value), phrase=True)
+            return bits(self.clause_scores(clause, 0.0))
+        return self.exact_index(field).get(value, 0)
+
+    def select(self, params):
+        # a Solr /select response for the params (values or lists of values,
+        # as requests / parse_qs give them)
+        start_time = time.perf_counter()
+
+        def param(name, default=None):
+            value = params.get(name, default)
+            return value[-1] if isinstance(value, list) else value
+
+        def param_list(name):
+            value = params.get(name, [])
+            return value if isinstance(value, list) else [value]
+
+        q = (param("q") or "*:*").strip()
+        qf = parse_boosts(param("qf") or "overview")
+        tie = float(param("tie", 0.0))
+        rows = int(param("rows", 10))
+        start = int(param("start", 0))
+
+        mask = self.all
+        for fq in param_list("fq"):
+            mask &= self.filter_mask(fq)
+
+        mlt = MLT_PATTERN.fullmatch(q)
+        if q == "*:*":
+            scores = {doc: 1.0 for doc in iter_bits(mask)}
+        elif mlt:
+            scores = self.similar(mlt.group(1).strip(), mask)
+        else:
+            # edismax without mm: every clause with q.op=AND, one otherwise (the default q.op is OR)
+            mm = param("mm", "100%" if param("q.op") == "AND" else "0%")
+            scores = self.score(q, qf, param("pf"), mm, tie, mask)
+
+        ranked = heapq.nsmallest(start + rows, scores, key=lambda doc: (-scores[doc], doc))
+        fl = [f.strip() for f in ",".join(param_list("fl")).split(",") if f.strip()] or ["*"]
+
+        response = {
+            "responseHeader": {"status": 0, "QTime": 0, "params": params},
+            "response": {
+                "numFound": len(scores),
+                "start": start,
+                "numFoundExact": True,
+                "docs": [self.project(doc, fl, scores[doc]) for doc in ranked[start:start + rows]],
+            },
+        }
+
+        if param("facet") == "true":
+            matched = bits(scores)
+            response["facet_counts"] = {
+                "facet_fields": {
+                    field: self.facet(field, matched, int(param("facet.mincount", 0)), int(param("facet.limit", 100)))
+                    for field in param_list("facet.field")
+                },
+            }
+
+        response["responseHeader"]["QTime"] = int((time.perf_counter() - start_time) * 1000)
+        return response
+
+    def score(self, q, qf, pf, mm, tie, mask):
+        clauses = self.parse_query(q, qf)
+        optional = [c for c in clauses if not c.required and not c.negated]
+        required = [c for c in clauses if c.required]
+        excluded = [c for c in clauses if c.negated]
+        needed = min_should_match(mm, len(optional))
+
+        scores = {}
+        matched = {}
+        for clause in optional + required:
+            for doc, score in self.clause_scores(clause, tie).items():
+                if mask >> doc & 1:
+                    scores[doc] = scores.get(doc, 0.0) + score
+                    if not clause.required:
+                        matched[doc] = matched.get(doc, 0) + 1
+
+        if not optional and not required:
+            scores = {doc: 0.0 for doc in iter_bits(mask)}
+        for clause in required:
+            keep = self.clause_scores(clause, tie)
+            scores = {doc: s for doc, s in scores.items() if doc in keep}
+        if needed:
+            scores = {doc: s for doc, s in scores.items() if matched.get(doc, 0) >= needed}
+        for clause in excluded:
+            drop = self.clause_scores(clause, tie)
+            scores = {doc: s for doc, s in scores.items() if doc not in drop}
+
+        # pf: the query words as one phrase, boosted where they appear together
+        words = [c.slots[0] for c in optional if c.slots and not c.phrase and c.fields is qf]
+        if pf and len(words) > 1 and scores:
+            for field, boost in parse_boosts(pf):
+                for doc, score in self.field_scores(field, boost, words, True).items():
+                    if doc in scores:
+                        scores[doc] += score
+        return scores
+
+    def project(self, doc_id, fl, score):
+        doc = self.docs[doc_id]
+        if "*" in fl:
+            result = dict(doc)
+        else:
+            result = {f: doc[f] for f in fl if f in doc}
+        if "score" in fl:
+            result["score"] = score
+        return result
+
+    def facet(self, field, matched, mincount, limit):
+        # Solr's flat [value, count, ...] list, by count then value
+        counts = ((value, (mask & matched).bit_count()) for value, mask in self.exact_index(field).items())
+        ordered = sorted((item for item in counts if item[1] >= mincount), key=lambda vc: (-vc[1], vc[0]))
+        if limit >= 0:
+            ordered = ordered[:limit]
+        return [x for item in ordered for x in item]
+
+    def search(self, query, rows=10, filters=()):
+        # the docs the frontend's search() gets from Solr, for the same query
+        # and filter queries (numeric conditions read from the query too)
+        intent = parse_query_intent(query)
+        filters = list(filters) + [range_fq(field, low, high) for field, low, high in intent["filters"]]
+        params = {
+            "q": intent["text"] if intent["text"].strip() else "*:*",
+            "defType": "edismax",
+            "qf": QF,
+            "pf": PF,
+            "mm": MM,
+            "tie": str(TIE),
+            "rows": rows,
+            "fl": ",".join(FL),
+        }
+        if filters:
+            params["fq"] = list(filters)
+        return self.select(params)["response"]["docs"]
+
+    def similar(self, doc_id, mask):
+        # {doc: similarity} to the document with id `doc_id` of the other
+        # documents in `mask`: the filters are a bitset first, so only the
+        # documents they keep are scored (as at index time, wildlife/similarity.py)
+        doc = next(iter_bits(self.exact_index("id").get(doc_id, 0)), None)
+        if doc is None:
+            return {}
+        base = self.doc_features(doc)
+        return {other: similarity(base, self.doc_features(other)) for other in iter_bits(mask & ~(1 << doc))}
+
+    def related(self, doc_id, k=TOP_K, filters=()):
+        # "You might also like" at query time among the documents the filter
+        # queries keep (the sidebar's ranges, say), as the select handler
+        # answers q={!mlt}<id>
+        params = {"q": "{!mlt}" + doc_id, "rows": k}
+        if filters:
+            params["fq"] = list(filters)
+        return self.select(params)["response"]["docs"]
+
+
+def make_handler(engine, core):
+    path = f"/solr/{core}/select"
+
+    class SelectHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != path:
+                self.reply(404, {"error": {"msg": f"Not found: {url.path}", "code": 404}})
+                return
+            try:
+                self.reply(200, engine.select(parse_qs(url.query, keep_blank_values=True)))
+            except ValueError as e:
+                self.reply(400, {"error": {"msg": str(e), "code": 400}})
+
+        def reply(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            # the frontend is served from another port (Live Server)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SelectHandler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the species feeds with the embedded search engine.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8983)
+    parser.add_argument("--core", default="wild_life")
+    parser.add_argument("--no-merge", dest="merge", action="store_false",
+                        help="index the documents of a species found in several sources separately")
+    parser.add_argument("--related-k", type=int, default=TOP_K, help="similar species stored on every document (0: skip)")
+    parser.add_argument("--index", help="serve an index written by python3 -m wildlife.disk_index instead of the feeds")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    if args.index:
+        from wildlife.disk_index import open_engine
+
+        engine = open_engine(args.index)
+    else:
+        engine = SearchEngine.from_feeds(merge=args.merge, related_k=args.related_k)
+    print(f"Indexed {len(engine.docs)} docs in {time.perf_counter() - start:.2f}s")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(engine, args.core))
+    print(f"Serving http://{args.host}:{args.port}/solr/{args.core}/select")
+    server.serve_forever()
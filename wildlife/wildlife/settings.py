@@ -60,6 +60,15 @@ COOKIES_ENABLED = False
 #    #"wildlife.middlewares.WildlifeDownloaderMiddleware": 543,
 #     'scrapy_zyte_api.ScrapyZyteAPIDownloaderMiddleware': 1000,
 # }
+DOWNLOADER_MIDDLEWARES = {
+    "wildlife.middlewares.WarcSegmentCacheMiddleware": 950,
+}
+
+# Local cache of the CommonCrawl WARC records, keyed by (filename, offset,
+# length); hits and misses show up as warc_cache/* in the crawl stats
+WARC_CACHE_ENABLED = True
+WARC_CACHE_DIR = "warc_cache"
+WARC_CACHE_MAX_BYTES = 2 * 1024 ** 3
 
 # dotenv.load_dotenv(dotenv_path="secrets.env")
 # ZYTE_API_KEY = os.getenv("ZYTE_API")
@@ -77,9 +86,19 @@ COOKIES_ENABLED = False
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "wildlife.pipelines.WildlifePipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "wildlife.pipelines.DedupPipeline": 300,
+    "wildlife.pipelines.JsonFeedExportPipeline": 800,
+}
+
+# Items whose estimated Jaccard similarity (MinHash over overview shingles and
+# scientific name) with an earlier item of the same spider reaches this are dropped
+DEDUP_THRESHOLD = 0.8
+
+# Items are streamed to <spider json file>l and fsync'd every N items, then
+# compacted into the JSON array file when the spider closes
+JSON_FEED_FSYNC_EVERY = 100
+JSON_FEED_KEEP_JSONL = False
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -0,0 +1,263 @@
+import json
+import re
+
+# "You might also like" neighbours, computed once at index time instead of
+# per search in the browser. Same weighting as compute_similarity in
+# frontend/search_cli.py: 0.4 overview token Jaccard, 0.3 same animal type,
+# 0.2 length range overlap. Ties keep document order.
+
+TOP_K = 7
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# what the frontend needs to render a neighbour's card
+RELATED_FIELDS = ["id", "url", "name", "scientific_name", "animal_type", "image_url", "dirty_overview"]
+# what features() reads
+FEATURE_FIELDS = ["overview", "animal_type", "length_cm_min", "length_cm_max"]
+
+
+def first(doc, key, default=""):
+    # a field as the frontend's safe_get reads it (Solr returns lists)
+    val = doc.get(key, default)
+    if isinstance(val, list) and val:
+        return val[0]
+    if val is None:
+        return default
+    return val
+
+
+def features(doc):
+    # (overview tokens, animal type, (length min, max) or None), computed
+    # once per document instead of once per pair
+    overview = first(doc, "overview")
+    tokens = frozenset(TOKEN_PATTERN.findall(overview.lower())) if overview else frozenset()
+
+    length = (first(doc, "length_cm_min"), first(doc, "length_cm_max"))
+    length = None if "" in length else (float(length[0]), float(length[1]))
+
+    return tokens, first(doc, "animal_type"), length
+
+
+def text_similarity(tokens_a, tokens_b):
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def range_overlap(a, b):
+    if a is None or b is None:
+        return 0.0
+
+    overlap = max(0, min(a[1], b[1]) - max(a[0], b[0]))
+    span = max(a[1] - a[0], b[1] - b[0])
+
+    return overlap / span if span > 0 else 0.0
+
+
+def similarity(a, b):
+    # a and b are features()
+    score = 0.0
+    score += 0.4 * text_similarity(a[0], b[0])
+    if a[1] == b[1]:
+        score += 0.3
+    score += 0.2 * range_overlap(a[2], b[2])
+    return score
+
+
+def top_related(docs, k=TOP_K):
+    # indices of the k most similar other documents, for every document
+    feats = [features(doc) for doc in docs]
+    ids = [doc.get("id") for doc in docs]
+    related = []
+
+    for i, base in enumerate(feats):
+        scored = [
+            (similarity(base, cand), j)
+            for j, cand in enumerate(feats)
+            if ids[j] != ids[i]
+        ]
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        related.append([j for _, j in scored[:k]])
+
+    return related
+
+
+def related_payload(doc):
+    return {f: doc[f] for f in RELATED_FIELDS if doc.get(f) not in (None, "", [])}
+
+
+def build_related(docs, k=TOP_K, neighbours=top_related):
+    # {id: {"related_ids": [...], "related_docs": "<json list of cards>"}}
+    related = {}
+    for doc, neighbours_of_doc in zip(docs, neighbours(docs, k)):
+        cards = [related_payload(docs[j]) for j in neighbours_of_doc]
+        related[doc["id"]] = {
+            "related_ids": [docs[j]["id"] for j in neighbours_of_doc],
+            "related_docs": json.dumps(cards, ensure_ascii=False),
+        }
+    return related
+
+
+# ---------------- NumPy engine ----------------
+
+# cells (rows x documents) of the score matrix held at once
+BLOCK_CELLS = 4_000_000
+# the most frequent tokens are counted with one matrix product per block
+# instead of through their (long) postings
+DENSE_TOKENS = 128
+
+
+def numpy_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _codes(values):
+    # equal values -> equal small ints (repr keeps lists hashable)
+    table = {}
+    return [table.setdefault(repr(v), len(table)) for v in values]
+
+
+def _csr(np, lists):
+    # list of int lists -> (indptr, indices)
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(values) for values in lists])
+    indices = np.fromiter((v for values in lists for v in values), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def top_related_numpy(docs, k=TOP_K, block_cells=BLOCK_CELLS, dense_tokens=DENSE_TOKENS):
+    # Same result as top_related, for corpora where the pure Python pairs
+    # loop is too slow. Rows are scored a block at a time against every
+    # document, so memory stays around block_cells scores. Token
+    # intersections: the dense_tokens most frequent tokens through a float32
+    # incidence matrix product, the rest by gathering their postings for the
+    # whole block and counting (row, document) pairs with one bincount.
+    import numpy as np
+
+    feats = [features(doc) for doc in docs]
+    n = len(feats)
+    if n == 0:
+        return []
+
+    vocabulary = {}
+    doc_tokens = [[vocabulary.setdefault(t, len(vocabulary)) for t in f[0]] for f in feats]
+    doc_indptr, doc_indices = _csr(np, doc_tokens)
+
+    df = np.bincount(doc_indices, minlength=len(vocabulary))
+    dense = np.argsort(-df, kind="stable")[:dense_tokens]
+    dense = dense[df[dense] > 1]
+    dense_column = np.full(len(vocabulary), -1, dtype=np.int64)
+    dense_column[dense] = np.arange(len(dense))
+
+    # incidence of the dense tokens (n x dense) ...
+    columns = dense_column[doc_indices]
+    dense_matrix = np.zeros((n, len(dense)), dtype=np.float32)
+    dense_rows = np.repeat(np.arange(n), np.diff(doc_indptr))
+    dense_matrix[dense_rows[columns >= 0], columns[columns >= 0]] = 1
+    dense_matrix_t = np.ascontiguousarray(dense_matrix.T)
+
+    # ... and postings (token -> documents) of the others
+    sparse = columns < 0
+    sparse_doc_tokens = [[t for t in tokens if dense_column[t] < 0] for tokens in doc_tokens]
+    sparse_indptr, sparse_indices = _csr(np, sparse_doc_tokens)
+    order = np.argsort(doc_indices[sparse], kind="stable")
+    posting_docs = dense_rows[sparse][order]
+    posting_indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    posting_indptr[1:] = np.cumsum(np.bincount(doc_indices[sparse], minlength=len(vocabulary)))
+
+    sizes = np.diff(doc_indptr).astype(np.float64)
+    types = np.array(_codes(f[1] for f in feats), dtype=np.int64)
+    # a missing length is NaN: every comparison with it fails, so the pair's
+    # overlap is never > 0 and scores 0 as in range_overlap
+    low = np.array([f[2][0] if f[2] else np.nan for f in feats], dtype=np.float64)
+    high = np.array([f[2][1] if f[2] else np.nan for f in feats], dtype=np.float64)
+    width = high - low
+
+    # documents never recommend themselves or another copy of their id
+    same_id = {}
+    for i, code in enumerate(_codes(doc.get("id") for doc in docs)):
+        same_id.setdefault(code, []).append(i)
+    excluded = [same_id[code] for code in _codes(doc.get("id") for doc in docs)]
+
+    block = max(1, block_cells // n)
+    related = []
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = slice(start, stop)
+        size = stop - start
+
+        # |A & B| for every (row, document) pair of the block
+        inter = (dense_matrix[rows] @ dense_matrix_t).astype(np.float64)
+
+        tokens = sparse_indices[sparse_indptr[start]:sparse_indptr[stop]]
+        if len(tokens):
+            token_rows = np.repeat(np.arange(size), np.diff(sparse_indptr[start:stop + 1]))
+            lengths = posting_indptr[tokens + 1] - posting_indptr[tokens]
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            matched = posting_docs[np.repeat(posting_indptr[tokens], lengths) + offsets]
+            pairs = np.repeat(token_rows, lengths) * n + matched
+            inter += np.bincount(pairs, minlength=size * n).reshape(size, n)
+
+        # same operations, in the same order, as similarity(): equal scores
+        union = sizes[rows, None] + sizes[None, :] - inter
+        scores = np.divide(inter, union, out=np.zeros(inter.shape), where=inter > 0)
+        scores *= 0.4
+        np.add(scores, 0.3, out=scores, where=types[rows, None] == types[None, :])
+
+        overlap = np.minimum(high[rows, None], high[None, :])
+        overlap -= np.maximum(low[rows, None], low[None, :])
+        span = np.maximum(width[rows, None], width[None, :])
+        ratio = np.divide(overlap, span, out=np.zeros(scores.shape), where=overlap > 0)
+        ratio *= 0.2
+        scores += ratio
+
+        for r in range(size):
+            scores[r, excluded[start + r]] = -np.inf
+
+        related.extend(_top_k_rows(np, scores, k))
+
+    return related
+
+
+def _top_k_rows(np, scores, k):
+    # k best columns per row, highest score first and lowest index among
+    # equal scores, as a stable sort would give
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [[] for _ in scores]
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(scores, top, axis=1)
+    kth = values.min(axis=1)
+    # rows where another column ties with the k-th score need their own pick
+    ties = (scores >= kth[:, None]).sum(axis=1) > k
+
+    result = []
+    for r in range(len(scores)):
+        if ties[r]:
+            row = scores[r]
+            candidates = np.flatnonzero(row >= kth[r])
+            picked = candidates[np.lexsort((candidates, -row[candidates]))[:k]]
+        else:
+            order = np.lexsort((top[r], -values[r]))
+            picked = top[r][order]
+        result.append([int(j) for j in picked if scores[r, j] != -np.inf])
+    return result
+
+
+ENGINES = {"python": top_related, "numpy": top_related_numpy}
+
+
+def neighbours_engine(name="auto"):
+    # "auto": numpy when it is installed, the pure Python loop otherwise
+    if name == "auto":
+        name = "numpy" if numpy_available() else "python"
+    if name not in ENGINES:
+        raise ValueError(f"Unknown related engine {name!r}, expected auto or one of {tuple(ENGINES)}")
+    if name == "numpy" and not numpy_available():
+        raise ImportError("the numpy related engine needs the numpy package (pip install numpy)")
+    return ENGINES[name]
@@ -4,7 +4,15 @@ from bs4 import BeautifulSoup
 import scrapy
 import json
 from warcio.archiveiterator import ArchiveIterator
-from wildlife.utils.text_cleaner import clean_text
+from wildlife.utils.html_parser import make_soup
+from wildlife.utils.measurements import (
+    parse_awf_gestation,
+    parse_awf_length,
+    parse_awf_lifespan,
+    parse_awf_weight,
+    store,
+)
+from wildlife.utils.text_cleaner import clean_text, clean_texts
 from wildlife.utils.type_detector import detect_type
 
 # run command: scrapy crawl awf
@@ -22,101 +30,8 @@ def html_to_json(html_file):
 
     return json_data
 
-def extract_numbers(text):
-    return [float(x) for x in re.findall(r"\d+(?:\.\d+)?", text)]
-
-def strip_parentheses(text: str) -> str:
-    return re.sub(r"\([^)]*\)", "", text)
-
-def parse_weight_kg(text):
-    if not text:
-        return None
-
-    text = strip_parentheses(text)
-
-    mins, maxs = [], []
-
-    for part in text.split(";"):
-        nums = extract_numbers(part)
-        if not nums:
-            continue
-
-        part_l = part.lower()
-
-        if re.search(r"\bkilogram(s)?\b|\bkg\b", part_l):
-            nums = nums
-        elif re.search(r"\bton(s)?\b", part_l):
-            nums = [n * 1000 for n in nums]
-        elif re.search(r"\bgram(s)?\b|\bg\b", part_l):
-            nums = [n / 1000 for n in nums]
-        else:
-            continue
-
-        mins.append(min(nums))
-        maxs.append(max(nums))
-
-    if mins:
-        if min(mins) == max(maxs):
-            return [0, max(maxs)]
-        return [min(mins), max(maxs)]
-    return None
-
-
-
-def parse_length_cm(text):
-    if not text:
-        return None
-
-    text = strip_parentheses(text)
-
-    mins, maxs = [], []
-
-    for part in text.split(";"):
-        nums = extract_numbers(part)
-        if not nums:
-            continue
-
-        part_l = part.lower()
-
-        if re.search(r"\bmillimeter(s)?\b|\bmm\b", part_l):
-            nums = [n / 10 for n in nums]
-        elif re.search(r"\bcentimeter(s)?\b|\bcm\b", part_l):
-            nums = nums
-        elif re.search(r"\bmeter(s)?\b|\bm\b", part_l):
-            nums = [n * 100 for n in nums]
-        else:
-            continue
-
-        mins.append(min(nums))
-        maxs.append(max(nums))
-
-    if mins:
-        if min(mins) == max(maxs):
-            return [0, max(maxs)]
-        return [min(mins), max(maxs)]
-    return None
-
-
-def parse_lifespan_year(text):
-    nums = extract_numbers(text)
-    if not nums:
-        return None
-    return [min(nums), max(nums)]
-
-
-def parse_gestation_days(text):
-    nums = extract_numbers(text)
-    if not nums:
-        return None
-
-    if re.search(r"month", text, re.I):
-        nums = [n * 30 for n in nums]
-
-    return [min(nums), max(nums)]
-
-
 def extract_awf_species_data(html_text, source_url):
-    soup = BeautifulSoup(html_text, "html.parser")
+    soup = make_soup(html_text)
     data = {"url": source_url}
     # ---------- NAME ----------
     name_title = soup.find("h1", class_="views-field-title")
@@ -151,26 +66,23 @@ def extract_awf_species_data(html_text, source_url):
     # ---------- WEIGHT ----------
                 elif key == "weight":
                     data["raw_weight"] = val
-                    parsed = parse_weight_kg(val)
+                    parsed = parse_awf_weight(val)
                     if parsed:
-                        data["weight_kg_min"] = parsed[0]
-                        data["weight_kg_max"] = parsed[-1]
+                        store(data, parsed)
     
     # ---------- HEIGHT ----------
                 elif key == "size":
                     data["raw_length"] = val
-                    parsed = parse_length_cm(val)
+                    parsed = parse_awf_length(val)
                     if parsed:
-                        data["length_cm_min"] = parsed[0]
-                        data["length_cm_max"] = parsed[-1]
+                        store(data, parsed)
 
     # ---------- LIFE SPAN ---------- 
                 elif key == "life span":
                     data["raw_lifespan"] = val
-                    parsed = parse_lifespan_year(val)
+                    parsed = parse_awf_lifespan(val)
                     if parsed:
-                        data["lifespan_year_min"] = parsed[0]
-                        data["lifespan_year_max"] = parsed[-1]
+                        store(data, parsed)
 
     # ---------- DIET ----------
                 elif key == "diet":
@@ -179,10 +91,9 @@ def extract_awf_species_data(html_text, source_url):
     # ---------- GESTATION ----------
                 elif key == "gestation":
                     data["raw_gestation"] = val
-                    parsed = parse_gestation_days(val)
+                    parsed = parse_awf_gestation(val)
                     if parsed:
-                        data["gestation_days_min"] = parsed[0]
-                        data["gestation_days_max"] = parsed[-1]
+                        store(data, parsed)
 
     # ---------- PREDATORS ----------
                 elif key == "predators":
@@ -196,10 +107,8 @@ def extract_awf_species_data(html_text, source_url):
     threats_section = soup.find("div", class_="field--name-field-challenges")
     threats_list = []
     if threats_section:
-         for item in threats_section.find_all("p"):
-             text = item.get_text(strip=True)
-             if text:
-                 threats_list.append(clean_text(text))
+        texts = [item.get_text(strip=True) for item in threats_section.find_all("p")]
+        threats_list = clean_texts([text for text in texts if text])
     data["threats"] = threats_list
 
     # ---------- FACTS LIST ----------
@@ -235,11 +144,26 @@ def extract_awf_species_data(html_text, source_url):
 
     return data
 
+
+def normalize_awf_item(extracted):
+    # skip missing names
+    if not extracted.get("name"):
+        return None
+
+    # force https
+    if extracted["url"].startswith("http://"):
+        extracted["url"] = "https://" + extracted["url"][len("http://"):]
+
+    # remove URLs starting with https://www. (to remove duplicates)
+    if extracted["url"].startswith("https://www."):
+        return None
+
+    return extracted
+
+
 class AwfSpider(scrapy.Spider):
     name = "awf"
-
-    def __init__(self):
-        self.collected = []
+    json_filename = "awf.json"
 
     async def start(self):
 
@@ -287,22 +211,10 @@ class AwfSpider(scrapy.Spider):
                     response.meta["original_url"]
                 )
 
-                 # skip missing names
-                if not extracted.get("name"):
-                    return
-
-                # force https
-                if extracted["url"].startswith("http://"):
-                    extracted["url"] = "https://" + extracted["url"][len("http://"):]
-
-                # remove URLs starting with https://www. (to remove duplicates)
-                if extracted["url"].startswith("https://www."):
+                extracted = normalize_awf_item(extracted)
+                if extracted is None:
                     continue
 
-                self.collected.append(extracted)
-
+                # written to awf.json by JsonFeedExportPipeline
                 yield extracted
-                json_filename = "awf.json"
-                with open(json_filename, "w", encoding="utf-8") as f:
-                    json.dump(self.collected, f, indent=2, ensure_ascii=False)
         
@@ -2,101 +2,22 @@ import io
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
 import scrapy
 from warcio.archiveiterator import ArchiveIterator
+from wildlife.utils.html_parser import make_soup
+from wildlife.utils.measurements import parse_wt_statistics, store
 from wildlife.utils.text_cleaner import clean_text
 from wildlife.utils.type_detector import detect_type
 
 # run command: scrapy crawl wildlife_trusts
 
-NUMBER = r"([\d\.]+)"
-RANGE = rf"{NUMBER}(?:\s*-\s*{NUMBER})?"
-UNIT = r"(mm|cm|m)"
-
 def safe_filename(url: str) -> str:
     name = re.sub(r'^https?://', '', url)
     name = re.sub(r'[^a-zA-Z0-9_-]+', '_', name)
     return name[:200]
 
-def to_cm(value: float, unit: str) -> float:
-    if unit == "mm":
-        return value / 10
-    if unit == "cm":
-        return value
-    if unit == "m":
-        return value * 100
-
-
-def parse_statistics(data, stats_text: str) -> dict:
-    text = stats_text.lower()
-
-    patterns = {
-        "length_cm": rf"length\s+(?:around\s+|approx\s+|up\s+to\s+)?{RANGE}\s*{UNIT}",
-        "height_cm": rf"height\s+{RANGE}\s*{UNIT}",
-        "wingspan_cm": rf"wingspan\s+{RANGE}\s*{UNIT}",
-        "tail_cm": rf"tail\s+{RANGE}\s*{UNIT}",
-        "bell_diameter_cm": rf"bell\s+{RANGE}\s*{UNIT}",
-        "max_size_cm": rf"(?:maximum\s+size|max\s+size)\s+{RANGE}\s*{UNIT}",
-        "weight_kg": r"weight\s+(?:around\s+|approx\s+)?([\d\.]+)(?:\s*-\s*([\d\.]+))?\s*(kg|g)",
-        "lifespan_year": r"(?:average\s+)?life\s*span\s+([\d\.]+)(?:\s*-\s*([\d\.]+))?\s*year",
-    }
-
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text)
-        if not match:
-            continue
-
-        groups = match.groups()
-
-        # ---------- LINEAR MEASUREMENTS ----------
-        if field.endswith("_cm"):
-            min_val = float(groups[0])
-            max_val = groups[1]
-            unit = groups[2]
-
-            min_cm = to_cm(min_val, unit)
-            if max_val:
-                data[field + "_min"] = round(min_cm, 2)
-                data[field + "_max"] = round(to_cm(float(max_val), unit), 2)
-            else:
-                data[field + "_min"] = 0
-                data[field + "_max"] = round(min_cm, 2)
-
-        # ---------- WEIGHT ----------
-        elif field == "weight_kg":
-            min_val = float(groups[0])
-            max_val = groups[1]
-            unit = groups[2]
-
-            if unit == "g":
-                min_val /= 1000
-                if max_val:
-                    max_val = float(max_val) / 1000
-
-            if max_val:
-                data[field + "_min"] = round(min_val, 3)
-                data[field + "_max"] = round(float(max_val), 3)
-            else:
-                data[field + "_min"] = 0
-                data[field + "_max"] = round(min_val, 3)
-
-        # ---------- LIFESPAN ----------
-        elif field == "lifespan_year":
-            min_val = float(groups[0])
-            max_val = groups[1]
-
-            if max_val:
-                data[field + "_min"] = min_val
-                data[field + "_max"] = float(max_val)
-            else:
-                data[field + "_min"] = 0
-                data[field + "_max"] = min_val
-
-    return data
-
 def extract_wt_species_data(html_text, source_url):
-    soup = BeautifulSoup(html_text, "html.parser")
+    soup = make_soup(html_text)
     data = {"url": source_url}
 
     # ---------- NAME ----------
@@ -110,7 +31,7 @@ def extract_wt_species_data(html_text, source_url):
         data["summary"] = clean_text(summary)
 
     # ---------- SCIENTIFIC NAME ----------
-    sci_div = soup.find("div", class_=lambda c: c and "species-scientific-name" in c)
+    sci_div = soup.select_one('div[class*="species-scientific-name"]')
     if sci_div:
         label = sci_div.find("h3")
         if label:
@@ -120,7 +41,7 @@ def extract_wt_species_data(html_text, source_url):
         data["scientific_name"] = scientific_name
 
     # ---------- CONSERVATION STATUS ----------
-    cons_div = soup.find("div", class_=lambda c: c and "species-conservation" in c)
+    cons_div = soup.select_one('div[class*="species-conservation"]')
     if cons_div:
         label = cons_div.find("h3")
         if label:
@@ -130,7 +51,7 @@ def extract_wt_species_data(html_text, source_url):
         data["conservation_status"] = clean_text(status)
 
     # ---------- STATISTICS ----------
-    stats_div = soup.find("div", class_=lambda c: c and "species-statistics" in c)
+    stats_div = soup.select_one('div[class*="species-statistics"]')
     if stats_div:
         label = stats_div.find("h3")
         if label:
@@ -138,11 +59,12 @@ def extract_wt_species_data(html_text, source_url):
 
         raw_stats = clean_text(stats_div.get_text(" ", strip=True))
         data["raw_statistics"] = raw_stats
-        data = parse_statistics(data, raw_stats)
+        for measurement in parse_wt_statistics(raw_stats):
+            store(data, measurement)
         
 
     # ---------- ABOUT ----------
-    about_div = soup.find("div", class_=lambda c: c and "species-about" in c)
+    about_div = soup.select_one('div[class*="species-about"]')
     if about_div:
         label = about_div.find("h2")
         if label:
@@ -155,7 +77,7 @@ def extract_wt_species_data(html_text, source_url):
         data["overview"] = clean_text(about_text)
 
     # ---------- HOW TO IDENTIFY ----------
-    id_div = soup.find("div", class_=lambda c: c and "species-identify" in c)
+    id_div = soup.select_one('div[class*="species-identify"]')
     if id_div:
         label = id_div.find("h2")
         if label:
@@ -165,7 +87,7 @@ def extract_wt_species_data(html_text, source_url):
         data["how_to_identify"] = clean_text(id_text)
 
     # ---------- DISTRIBUTION ----------
-    dis_div = soup.find("div", class_=lambda c: c and "species-distribution" in c)
+    dis_div = soup.select_one('div[class*="species-distribution"]')
     if dis_div:
         label = dis_div.find("h2")
         if label:
@@ -175,7 +97,7 @@ def extract_wt_species_data(html_text, source_url):
         data["distribution"] = clean_text(dis_text)
 
     # ---------- DID YOU KNOW ----------
-    dyk_div = soup.find("div", class_=lambda c: c and "species-did-you-know" in c)
+    dyk_div = soup.select_one('div[class*="species-did-you-know"]')
     if dyk_div:
         label = dyk_div.find("h2")
         if label:
@@ -209,21 +131,14 @@ def extract_wt_species_data(html_text, source_url):
 
 class WildlifeTrustsSpider(scrapy.Spider):
     name = "wildlife_trusts"
+    json_filename = "wildlifetrusts.json"
 
-    def __init__(self):
-        self.collected = []
-   
     async def start(self):
 
         index_url = "http://index.commoncrawl.org/CC-MAIN-2025-43-index?url=www.wildlifetrusts.org/wildlife-explorer/*&output=json"
 
         yield scrapy.Request(index_url, callback=self.parse_index)
 
-    def close(self, reason):
-        json_filename = "wildlifetrusts.json"
-        with open(json_filename, "w", encoding="utf-8") as f:
-            json.dump(self.collected, f, indent=2, ensure_ascii=False)
-
     def parse_index(self, response):
         for line in response.text.splitlines():
             data = json.loads(line)
@@ -259,7 +174,9 @@ class WildlifeTrustsSpider(scrapy.Spider):
             html_text = html_bytes.decode("utf-8", errors="ignore")
 
             extracted = extract_wt_species_data(html_text, response.meta["original_url"])
-            self.collected.append(extracted)
+
+            # written to wildlifetrusts.json by JsonFeedExportPipeline
+            yield extracted
 
             # JSON FILE OUTPUT x each species
             #json_filename = f"wt-{safe_filename(response.meta['original_url'])}.json"
@@ -1,122 +1,17 @@
 import io
 from pathlib import Path
-from bs4 import BeautifulSoup
 import scrapy
 import json
 from warcio.archiveiterator import ArchiveIterator
 import re
-from wildlife.utils.text_cleaner import clean_text
+from wildlife.utils.html_parser import make_soup
+from wildlife.utils.measurements import parse_wwf_lengths, parse_wwf_population, parse_wwf_weight, store
+from wildlife.utils.text_cleaner import clean_text, clean_texts
 from wildlife.utils.type_detector import detect_type
 
 # run command: scrapy crawl wwf
 
-def extract_numbers(text):
-    if not text:
-        return []
-
-    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", text)
-
-    return [float(x) for x in re.findall(r"\d+(?:\.\d+)?", text)]
-
-def pounds_to_kg(lb):
-    return lb * 0.453592
-
-
-def tons_to_kg(tons):
-    return tons * 1000.0
-
-
-def feet_to_cm(ft):
-    return ft * 30.48
-
-
-def inches_to_cm(inch):
-    return inch * 2.54
-
-def meters_to_cm(m):
-    return m * 100
-
-def parse_weight_kg(raw):
-    nums = extract_numbers(raw.lower())
-    if not nums:
-        return None
-
-    if "ton" in raw.lower():
-        nums = [tons_to_kg(n) for n in nums]
-    elif "pound" in raw.lower() or "lb" in raw.lower():
-        nums = [pounds_to_kg(n) for n in nums]
-    elif "kg" in raw.lower():
-        pass  # already kg
-
-    if nums[0] == nums[-1]:
-        return [0, nums[-1]]
-    return nums
-
-def parse_population(raw):
-    if not raw:
-        return None
-
-    text = raw.lower().replace(",", "")
-    nums = extract_numbers(text)
-
-    if not nums:
-        return None
-
-    if "million" in text:
-        nums = [int(n * 1_000_000) for n in nums]
-    elif "thousand" in text:
-        nums = [int(n * 1_000) for n in nums]
-    else:
-        nums = [int(n) for n in nums]
-
-    if "less than" in text or "<" in text or nums[0] == nums[-1]:
-        return [0, nums[0]]
-
-    return nums
-
-def split_clauses(text):
-    return re.split(r"[;,]", text)
-
-def parse_length_clause(clause):
-    clause = clause.lower()
-    nums = extract_numbers(clause)
-
-    if not nums:
-        return None, None
-
-    if "meter" in clause:
-        nums = [v * 100 for v in nums]
-    elif "foot" in clause or "ft" in clause or "feet" in clause:
-        nums = [v * 30.48 for v in nums]
-    elif "inch" in clause:
-        nums = [v * 2.54 for v in nums]
-
-    if nums[0] == nums[-1]:
-        nums = [0, nums[-1]]
-
-    if "tail" in clause:
-        return "tail_length_cm", nums
-    if "wing" in clause or "wingspan" in clause:
-        return "wingspan_cm", nums
-    if "shoulder" in clause or "tall" in clause or "height" in clause:
-        return "shoulder_height_cm", nums
-        
-    return "length_cm", nums
-
-
-def parse_lengths(data, raw):
-    if not raw:
-        return data
-
-    for clause in split_clauses(raw):
-        key, value = parse_length_clause(clause)
-        if key and value is not None:
-            if key not in data:
-                data[key + "_min"] = value[0]
-                data[key + "_max"] = value[-1]
-
-    return data
-
+SPECIES_URL_PATTERN = re.compile(r"^https?://www\.worldwildlife\.org/species/[^/]+/?$")
 
 def extract_wwf_species_data(html_text, source_url):
 
@@ -141,7 +36,7 @@ def extract_wwf_species_data(html_text, source_url):
 
   
 
-    soup = BeautifulSoup(html_text, "html.parser")
+    soup = make_soup(html_text)
 
     
 
@@ -202,10 +97,8 @@ def extract_wwf_species_data(html_text, source_url):
     threat_div = soup.select_one("#threats .lead.wysiwyg")
 
     if threat_div:
-        for p in threat_div.find_all("p"):
-            text = p.get_text(strip=True)
-            if text:
-                threats.append(clean_text(text))
+        texts = [p.get_text(strip=True) for p in threat_div.find_all("p")]
+        threats = clean_texts([text for text in texts if text])
 
     if threats:
         data["threats"] = threats
@@ -223,28 +116,34 @@ def extract_wwf_species_data(html_text, source_url):
         data["related_species"] = related
 
     if "raw_weight" in data:
-        parsed_weight = parse_weight_kg(data["raw_weight"])
-        if parsed_weight:
-            data["weight_kg_min"] = parsed_weight[0]
-            data["weight_kg_max"] = parsed_weight[-1]
+        weight = parse_wwf_weight(data["raw_weight"])
+        if weight:
+            store(data, weight)
 
     if "raw_length" in data:
-        data = parse_lengths(data, data["raw_length"])
+        # a later clause of the same kind replaces an earlier one
+        for length in parse_wwf_lengths(data["raw_length"]):
+            store(data, length)
 
     if "raw_population" in data:
-        parsed_population = parse_population(data["raw_population"])
-        if parsed_population is not None:
-            data["population_min"] = parsed_population[0]
-            data["population_max"] = parsed_population[-1]
+        population = parse_wwf_population(data["raw_population"])
+        if population is not None:
+            store(data, population)
 
     return data
 
+
+def is_species_page(extracted):
+    name = extracted.get("name")
+    return bool(name) and "Page Not Found" not in name and "Sorry" not in name
+
+
 class WwfSpider(scrapy.Spider):
     name = "wwf"
+    json_filename = "wwf.json"
 
     def __init__(self):
-        self.collected = []
-        self.names_seen = []
+        self.names_seen = set()
    
 
     async def start(self):
@@ -255,13 +154,10 @@ class WwfSpider(scrapy.Spider):
 
     def parse_index(self, response):
 
-        pattern = re.compile(r"^https?://www\.worldwildlife\.org/species/[^/]+/?$")
-
-
         for line in response.text.splitlines():
             data = json.loads(line)
 
-            if not pattern.match(data["url"]):
+            if not SPECIES_URL_PATTERN.match(data["url"]):
                 continue
 
             warc_url = f"https://data.commoncrawl.org/{data['filename']}"
@@ -299,7 +195,7 @@ class WwfSpider(scrapy.Spider):
                
                 extracted = extract_wwf_species_data(html_text, response.meta["original_url"])
 
-                if not extracted.get("name") or "Page Not Found" in extracted.get("name") or "Sorry" in extracted.get("name"):
+                if not is_species_page(extracted):
                     return
                 
                 
@@ -307,15 +203,10 @@ class WwfSpider(scrapy.Spider):
                 if extracted["name"].lower() in self.names_seen:
                     return
                 
-                self.names_seen.append(extracted.get("name").lower())
-
-                self.collected.append(extracted)
-
+                self.names_seen.add(extracted.get("name").lower())
 
+                # written to wwf.json by JsonFeedExportPipeline
                 yield extracted
-                json_filename = "wwf.json"
-                with open(json_filename, "w", encoding="utf-8") as f:
-                    json.dump(self.collected, f, indent=2, ensure_ascii=False)
 
                 
 
@@ -0,0 +1,75 @@
+import re
+
+# The text_syn field type of schema_fields_for_solr.xml in Python: standard
+# tokenization, lowercasing and SynonymGraphFilter (expand=true,
+# ignoreCase=true) over a Solr synonyms file, at index and query time.
+#
+# analyze() returns slots: (position, alternatives), where each alternative
+# is a tuple of terms. A token with no synonym is one slot with itself as
+# the only alternative; a (possibly multi-word) synonym input becomes one slot
+# holding every equivalent, e.g. "sea cow" -> [("manatee",), ("dugong",),
+# ("sea", "cow")], and the next slot starts after the words it covered.
+
+# words with inner apostrophes or dots ("grevy's", "1.5") stay one token,
+# as with UAX#29 word breaks
+TOKEN_PATTERN = re.compile(r"\w+(?:['’.]\w+)*")
+
+
+def tokenize(text):
+    return [t.lower() for t in TOKEN_PATTERN.findall(text)]
+
+
+class SynonymMap:
+    # {input term tuple: [equivalent term tuples]}, built from the lines of a
+    # Solr synonyms file:
+    #   a, b, c      a, b and c are all replaced by all three (expand=true)
+    #   a, b => c    a and b are replaced by c
+
+    def __init__(self, rules=()):
+        self.rules = {}
+        for inputs, outputs in rules:
+            for phrase in inputs:
+                alternatives = self.rules.setdefault(phrase, [])
+                alternatives.extend(o for o in outputs if o not in alternatives)
+        self.longest = max((len(phrase) for phrase in self.rules), default=0)
+
+    @classmethod
+    def parse(cls, lines):
+        rules = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            def phrases(side):
+                return [tuple(tokenize(p)) for p in side.split(",") if tokenize(p)]
+
+            if "=>" in line:
+                left, right = line.split("=>", 1)
+                rules.append((phrases(left), phrases(right)))
+            else:
+                group = phrases(line)
+                rules.append((group, group))
+        return cls(rules)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.parse(f)
+
+    def analyze(self, text):
+        tokens = tokenize(text)
+        slots = []
+        i = 0
+        while i < len(tokens):
+            # longest input starting here, as SynonymGraphFilter matches
+            for size in range(min(self.longest, len(tokens) - i), 0, -1):
+                alternatives = self.rules.get(tuple(tokens[i:i + size]))
+                if alternatives:
+                    slots.append((i, alternatives))
+                    i += size
+                    break
+            else:
+                slots.append((i, [(tokens[i],)]))
+                i += 1
+        return slots
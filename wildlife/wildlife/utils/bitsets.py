@@ -0,0 +1,83 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Document sets as Python ints (bit i set: document i), so filters combine
+# with & | ^ over whole machine words, and the range indexes that produce
+# them for the numeric columns (<quantity>_min / <quantity>_max).
+
+# documents between two stored prefix bitsets
+CHECKPOINT = 1024
+
+
+def bits(docs):
+    # built in a bytearray: or-ing 1 << doc into an int copies it every time
+    docs = list(docs)
+    if not docs:
+        return 0
+    buf = bytearray(max(docs) // 8 + 1)
+    for doc in docs:
+        buf[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_bits(mask):
+    for i, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            yield i * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+class SortedColumn:
+    # The documents of a numeric column (NaN: no value) sorted by value, with
+    # the bitset of every `checkpoint`-th prefix of that order. The documents
+    # with a value in [low, high] are two bisects and two prefix bitsets
+    # (a stored one plus fewer than `checkpoint` documents each).
+    def __init__(self, values, checkpoint=CHECKPOINT):
+        present = sorted((v, doc) for doc, v in enumerate(values) if v == v)
+        self.values = array("d", (v for v, _ in present))
+        self.docs = array("q", (doc for _, doc in present))
+        self.checkpoint = checkpoint
+
+        self.prefixes = [0]
+        buf = bytearray((len(values) + 7) // 8)
+        for i, doc in enumerate(self.docs, 1):
+            buf[doc >> 3] |= 1 << (doc & 7)
+            if i % checkpoint == 0:
+                self.prefixes.append(int.from_bytes(buf, "little"))
+
+    def __len__(self):
+        return len(self.values)
+
+    def prefix(self, count):
+        # the documents with the `count` smallest values
+        block = count // self.checkpoint
+        return self.prefixes[block] | bits(self.docs[block * self.checkpoint:count])
+
+    def between(self, low=-math.inf, high=math.inf):
+        if low > high:
+            return 0
+        # the smaller prefix is part of the larger one
+        return self.prefix(bisect_right(self.values, high)) ^ self.prefix(bisect_left(self.values, low))
+
+
+class IntervalIndex:
+    # The documents whose [min, max] range of a quantity (weight_kg,
+    # length_cm, ...) meets a query range, from the sorted columns of both
+    # bounds. Documents missing either bound never match, as with the
+    # frontend's "<q>_min:[* TO hi] AND <q>_max:[lo TO *]" filter queries.
+    def __init__(self, lows, highs):
+        self.lows = lows
+        self.highs = highs
+
+    @classmethod
+    def from_columns(cls, lows, highs, checkpoint=CHECKPOINT):
+        return cls(SortedColumn(lows, checkpoint), SortedColumn(highs, checkpoint))
+
+    def overlapping(self, low=-math.inf, high=math.inf):
+        # min <= high and max >= low
+        return self.lows.between(high=high) & self.highs.between(low=low)
+
+    def containing(self, value):
+        return self.overlapping(value, value)
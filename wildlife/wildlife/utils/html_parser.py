@@ -0,0 +1,33 @@
+import os
+
+from bs4 import BeautifulSoup
+
+# Tree builder used by the species extractors. "html.parser" is the pure
+# Python builder the extractors always used; "lxml" is the C builder and is
+# several times faster. Pick one with the WILDLIFE_HTML_PARSER environment
+# variable (benchmarks/bench_parsers.py checks that both give the same items
+# on a set of pages before switching).
+DEFAULT_BACKEND = "html.parser"
+BACKENDS = ("html.parser", "lxml")
+
+
+def lxml_available():
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def current_backend():
+    backend = os.environ.get("WILDLIFE_HTML_PARSER", DEFAULT_BACKEND)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown WILDLIFE_HTML_PARSER {backend!r}, expected one of {BACKENDS}")
+    return backend
+
+
+def make_soup(html_text, backend=None):
+    backend = backend or current_backend()
+    if backend == "lxml" and not lxml_available():
+        raise ImportError("WILDLIFE_HTML_PARSER=lxml needs the lxml package (pip install lxml)")
+    return BeautifulSoup(html_text, backend)
@@ -0,0 +1,280 @@
+from collections import namedtuple
+import re
+
+# Number and unit parsing shared by the spiders. Every parser lowercases its
+# text once and reads it with precompiled patterns (a single findall for the
+# WWF and AWF fields), and returns Measurement tuples already converted to the
+# unit stored in the feeds, e.g. Measurement("weight", "kg", 45.0, 65.0) is
+# written as weight_kg_min / weight_kg_max.
+
+Measurement = namedtuple("Measurement", "quantity unit min max")
+
+NUMBER = r"\d+(?:\.\d+)?"
+# "1,760" is read as 1760: a comma followed by exactly three digits is a
+# thousands separator, any other comma ends the number
+GROUPED_NUMBER = r"\d(?:\d|,(?=\d{3}\b))*(?:\.\d(?:\d|,(?=\d{3}\b))*)?"
+
+NUMBER_PATTERN = re.compile(NUMBER)
+
+
+def numbers(text):
+    return [float(x) for x in NUMBER_PATTERN.findall(text)]
+
+
+def field_name(m):
+    return f"{m.quantity}_{m.unit}" if m.unit else m.quantity
+
+
+def store(data, m):
+    name = field_name(m)
+    data[name + "_min"] = m.min
+    data[name + "_max"] = m.max
+    return data
+
+
+class Scanner:
+    # Reads numbers, keywords and part separators of a lowercased text with
+    # one findall; everything else is skipped by the regex engine. `keywords`
+    # is [(name, words)]: the part has keyword `name` when one of its words
+    # appears, anywhere in the text (like the `"ton" in text` checks it
+    # replaces), or as a whole word with exact=True (like `\bkg\b`). `skip` is
+    # read and ignored (used for parenthesized text).
+
+    def __init__(self, keywords, number=NUMBER, separator=None, skip=None, exact=False):
+        self.names = {w: name for name, words in keywords for w in words}
+        # longest first, so "kilograms" is not read as "kilogram" + "s"
+        words = "|".join(re.escape(w) for w in sorted(self.names, key=len, reverse=True))
+        if exact:
+            words = rf"\b(?:{words})\b"
+
+        alternatives = [f"({separator or '(?!)'})", f"({number})", f"({words})"]
+        if skip:
+            alternatives.insert(0, f"(?:{skip})")
+        self.pattern = re.compile("|".join(alternatives))
+
+    def scan(self, text):
+        # [(numbers, keywords seen)] for each part of the text
+        parts = [([], set())]
+        for sep, num, word in self.pattern.findall(text):
+            if num:
+                parts[-1][0].append(float(num.replace(",", "")))
+            elif word:
+                parts[-1][1].add(self.names[word])
+            elif sep:
+                parts.append(([], set()))
+        return parts
+
+
+def _first(names, seen):
+    for name in names:
+        if name in seen:
+            return name
+    return None
+
+
+def _first_last(nums):
+    # a single value is an upper bound; otherwise first and last number
+    if nums[0] == nums[-1]:
+        return 0, nums[-1]
+    return nums[0], nums[-1]
+
+
+# ---------------- WWF ----------------
+
+WWF_WEIGHT = Scanner([("ton", ("ton",)), ("pound", ("pound", "lb"))], number=GROUPED_NUMBER)
+WWF_WEIGHT_FACTORS = {"ton": 1000.0, "pound": 0.453592}
+
+
+def parse_wwf_weight(raw):
+    nums, seen = WWF_WEIGHT.scan(raw.lower())[0]
+    if not nums:
+        return None
+
+    unit = _first(("ton", "pound"), seen)
+    if unit:
+        nums = [n * WWF_WEIGHT_FACTORS[unit] for n in nums]
+
+    return Measurement("weight", "kg", *_first_last(nums))
+
+
+WWF_POPULATION = Scanner([("million", ("million",)), ("thousand", ("thousand",))])
+
+
+def parse_wwf_population(raw):
+    if not raw:
+        return None
+
+    text = raw.lower().replace(",", "")
+    nums, seen = WWF_POPULATION.scan(text)[0]
+    if not nums:
+        return None
+
+    if "million" in seen:
+        nums = [int(n * 1_000_000) for n in nums]
+    elif "thousand" in seen:
+        nums = [int(n * 1_000) for n in nums]
+    else:
+        nums = [int(n) for n in nums]
+
+    if "less than" in text or "<" in text or nums[0] == nums[-1]:
+        return Measurement("population", None, 0, nums[0])
+    return Measurement("population", None, nums[0], nums[-1])
+
+
+# clauses are split on "," and ";"; each keyword group is checked in order,
+# the first one present wins
+WWF_LENGTH = Scanner([
+    ("meter", ("meter",)), ("foot", ("foot", "ft", "feet")), ("inch", ("inch",)),
+    ("tail", ("tail",)), ("wing", ("wing",)), ("height", ("shoulder", "tall", "height")),
+], separator="[;,]")
+WWF_LENGTH_FACTORS = {"meter": 100, "foot": 30.48, "inch": 2.54}
+WWF_LENGTH_QUANTITIES = {"tail": "tail_length", "wing": "wingspan", "height": "shoulder_height"}
+
+
+def parse_wwf_lengths(raw):
+    # one Measurement per clause with a number, in text order
+    if not raw:
+        return []
+
+    measurements = []
+    for nums, seen in WWF_LENGTH.scan(raw.lower()):
+        if not nums:
+            continue
+
+        unit = _first(("meter", "foot", "inch"), seen)
+        if unit:
+            nums = [v * WWF_LENGTH_FACTORS[unit] for v in nums]
+
+        kind = _first(("tail", "wing", "height"), seen)
+        quantity = WWF_LENGTH_QUANTITIES.get(kind, "length")
+        measurements.append(Measurement(quantity, "cm", *_first_last(nums)))
+
+    return measurements
+
+
+# ---------------- AWF ----------------
+
+PARENTHESES = r"\([^)]*\)"
+
+AWF_WEIGHT = Scanner([
+    ("kilogram", ("kilogram", "kilograms", "kg")), ("ton", ("ton", "tons")), ("gram", ("gram", "grams", "g")),
+], separator=";", skip=PARENTHESES, exact=True)
+AWF_WEIGHT_UNITS = {"kilogram": None, "ton": lambda n: n * 1000, "gram": lambda n: n / 1000}
+
+AWF_LENGTH = Scanner([
+    ("millimeter", ("millimeter", "millimeters", "mm")), ("centimeter", ("centimeter", "centimeters", "cm")),
+    ("meter", ("meter", "meters", "m")),
+], separator=";", skip=PARENTHESES, exact=True)
+AWF_LENGTH_UNITS = {"millimeter": lambda n: n / 10, "centimeter": None, "meter": lambda n: n * 100}
+
+
+def _parse_awf_ranges(scanner, units, text, quantity, unit):
+    # Text in parentheses (the imperial conversion) is ignored. Each ";" part
+    # needs one of `units` (checked in order, mapped to its conversion or None);
+    # the result spans all the parts.
+    if not text:
+        return None
+
+    mins, maxs = [], []
+    for nums, seen in scanner.scan(text.lower()):
+        if not nums:
+            continue
+
+        name = _first(units, seen)
+        if name is None:
+            continue
+
+        convert = units[name]
+        if convert:
+            nums = [convert(n) for n in nums]
+        mins.append(min(nums))
+        maxs.append(max(nums))
+
+    if not mins:
+        return None
+    if min(mins) == max(maxs):
+        return Measurement(quantity, unit, 0, max(maxs))
+    return Measurement(quantity, unit, min(mins), max(maxs))
+
+
+def parse_awf_weight(text):
+    return _parse_awf_ranges(AWF_WEIGHT, AWF_WEIGHT_UNITS, text, "weight", "kg")
+
+
+def parse_awf_length(text):
+    return _parse_awf_ranges(AWF_LENGTH, AWF_LENGTH_UNITS, text, "length", "cm")
+
+
+def parse_awf_lifespan(text):
+    nums = numbers(text)
+    if not nums:
+        return None
+    return Measurement("lifespan", "year", min(nums), max(nums))
+
+
+def parse_awf_gestation(text):
+    nums = numbers(text)
+    if not nums:
+        return None
+
+    if "month" in text.lower():
+        nums = [n * 30 for n in nums]
+
+    return Measurement("gestation", "days", min(nums), max(nums))
+
+
+# ---------------- WILDLIFE TRUSTS ----------------
+
+WT_NUMBER = r"([\d\.]+)"
+WT_RANGE = rf"{WT_NUMBER}(?:\s*-\s*{WT_NUMBER})?"
+WT_UNIT = r"(mm|cm|m)"
+
+# (quantity, unit, literal the pattern needs, pattern) in the order the fields
+# are written. The patterns overlap ("length 3 m" vs. "max size"), so each
+# statistic keeps its own search; the substring check skips the ones whose
+# keyword is not in the text at all.
+WT_STATISTICS = [
+    ("length", "cm", "length", rf"length\s+(?:around\s+|approx\s+|up\s+to\s+)?{WT_RANGE}\s*{WT_UNIT}"),
+    ("height", "cm", "height", rf"height\s+{WT_RANGE}\s*{WT_UNIT}"),
+    ("wingspan", "cm", "wingspan", rf"wingspan\s+{WT_RANGE}\s*{WT_UNIT}"),
+    ("tail", "cm", "tail", rf"tail\s+{WT_RANGE}\s*{WT_UNIT}"),
+    ("bell_diameter", "cm", "bell", rf"bell\s+{WT_RANGE}\s*{WT_UNIT}"),
+    ("max_size", "cm", "size", rf"(?:maximum\s+size|max\s+size)\s+{WT_RANGE}\s*{WT_UNIT}"),
+    ("weight", "kg", "weight", rf"weight\s+(?:around\s+|approx\s+)?{WT_RANGE}\s*(kg|g)"),
+    ("lifespan", "year", "span", rf"(?:average\s+)?life\s*span\s+{WT_RANGE}\s*year"),
+]
+WT_MATCHERS = [(quantity, unit, literal, re.compile(p)) for quantity, unit, literal, p in WT_STATISTICS]
+
+WT_CM = {"mm": lambda v: v / 10, "cm": None, "m": lambda v: v * 100}
+
+
+def parse_wt_statistics(text):
+    text = text.lower()
+    measurements = []
+
+    for quantity, unit, literal, pattern in WT_MATCHERS:
+        match = literal in text and pattern.search(text)
+        if not match:
+            continue
+
+        groups = match.groups()
+        low = float(groups[0])
+        high = float(groups[1]) if groups[1] else None
+
+        if unit == "cm":
+            convert = WT_CM[groups[2]] or float
+            low = round(convert(low), 2)
+            high = round(convert(high), 2) if high is not None else None
+        elif unit == "kg":
+            if groups[2] == "g":
+                low /= 1000
+                high = high / 1000 if high is not None else None
+            low = round(low, 3)
+            high = round(high, 3) if high is not None else None
+
+        if high is None:
+            measurements.append(Measurement(quantity, unit, 0, low))
+        else:
+            measurements.append(Measurement(quantity, unit, low, high))
+
+    return measurements
@@ -0,0 +1,153 @@
+import random
+import re
+import zlib
+
+# Near-duplicate detection for species records: a document is the set of
+# word shingles of its cleaned overview plus its normalized scientific name,
+# summarized by a MinHash signature. LSH banding puts signatures that agree on
+# a whole band in the same bucket, so a new document is only compared with
+# the few earlier ones it shares a bucket with.
+
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs around the threshold below are candidates with
+# probability ~1 - (1 - s**8)**16 (~0.97 at s = 0.8, ~0.05 at s = 0.4)
+BANDS = 16
+THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+SEED = 1
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_scientific_name(name):
+    # "Panthera  Pardus " -> "panthera pardus"
+    if not isinstance(name, str):
+        return ""
+    return " ".join(name.lower().split())
+
+
+def shingles(doc, size=SHINGLE_SIZE):
+    overview = doc.get("overview")
+    words = WORD_PATTERN.findall(overview.lower()) if isinstance(overview, str) else []
+
+    features = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))} if words else set()
+    name = normalize_scientific_name(doc.get("scientific_name"))
+    if name:
+        features.add("scientific_name:" + name)
+    return features
+
+
+class MinHasher:
+    # num_perm hash functions (a * x + b) mod p over a stable 32-bit hash of
+    # each shingle; the signature keeps the minimum of each
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rnd = random.Random(seed)
+        self.permutations = [
+            (rnd.randrange(1, MERSENNE_PRIME), rnd.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features):
+        if not features:
+            return None
+        hashes = [zlib.crc32(f.encode("utf-8")) for f in features]
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME & MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+
+def estimated_jaccard(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class LSHIndex:
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+
+    def _bands(self, sig):
+        for band, buckets in enumerate(self.buckets):
+            yield buckets, sig[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key, sig):
+        for buckets, band in self._bands(sig):
+            buckets.setdefault(band, []).append(key)
+
+    def candidates(self, sig):
+        # keys sharing at least one band, in insertion order
+        found = {}
+        for buckets, band in self._bands(sig):
+            for key in buckets.get(band, ()):
+                found[key] = None
+        return list(found)
+
+
+class NearDuplicateIndex:
+    # find() returns the key of an earlier document whose estimated Jaccard
+    # similarity is >= threshold (the most similar one), or None
+
+    def __init__(self, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=SEED):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.lsh = LSHIndex(num_perm, bands)
+        self.signatures = {}
+
+    def signature(self, doc):
+        return self.hasher.signature(shingles(doc))
+
+    def find(self, sig):
+        if sig is None:
+            return None
+
+        best, best_score = None, 0.0
+        for key in self.lsh.candidates(sig):
+            score = estimated_jaccard(sig, self.signatures[key])
+            if score > best_score:
+                best, best_score = key, score
+        return best if best_score >= self.threshold else None
+
+    def add(self, key, sig):
+        if sig is None:
+            return
+        self.signatures[key] = sig
+        self.lsh.add(key, sig)
+
+
+def merge_documents(kept, duplicate):
+    # fields the kept document lacks are taken from its duplicate
+    for key, value in duplicate.items():
+        if kept.get(key) in (None, "", []) and value not in (None, "", []):
+            kept[key] = value
+    return kept
+
+
+def deduplicate(docs, mode="drop", threshold=THRESHOLD):
+    # -> (kept documents, [(removed document, document it duplicates)]).
+    # The first document of each group is kept; with mode="merge" it also
+    # receives the fields only its duplicates have.
+    if mode not in ("drop", "merge"):
+        raise ValueError(f"Unknown dedup mode {mode!r}, expected 'drop' or 'merge'")
+
+    index = NearDuplicateIndex(threshold)
+    kept, removed = [], []
+
+    for doc in docs:
+        sig = index.signature(doc)
+        match = index.find(sig)
+        if match is None:
+            index.add(len(kept), sig)
+            kept.append(doc)
+            continue
+
+        if mode == "merge":
+            merge_documents(kept[match], doc)
+        removed.append((doc, kept[match]))
+
+    return kept, removed
@@ -1,30 +1,90 @@
-import nltk
 import string
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from functools import lru_cache
 
-# Download only once
-nltk.download("punkt_tab")
-nltk.download("stopwords")
+PUNCT = set(string.punctuation)
 
-nltk.download("wordnet")
-from nltk.stem import WordNetLemmatizer
+# (path checked with nltk.data.find, package name for nltk.download)
+NLTK_RESOURCES = [
+    ("tokenizers/punkt_tab/english/", "punkt_tab"),
+    ("corpora/stopwords", "stopwords"),
+    ("corpora/wordnet", "wordnet"),
+]
 
-STOPWORDS = set(stopwords.words("english"))
-PUNCT = set(string.punctuation)
 
-lemm = WordNetLemmatizer()
+def download_resources():
+    # one-off setup, same as: python3 -m nltk.downloader punkt_tab stopwords wordnet
+    import nltk
+
+    for _, package in NLTK_RESOURCES:
+        nltk.download(package)
+    load_resources.cache_clear()
+    lemmatize.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def load_resources():
+    # NLTK is imported and its data loaded on the first clean_text call, once
+    # per process. Nothing is downloaded here: missing data is an error.
+    import nltk
+
+    missing = []
+    for path, package in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+
+    if missing:
+        raise LookupError(
+            f"NLTK data not installed: {', '.join(missing)}. "
+            f"Install it once with: python3 -m nltk.downloader {' '.join(missing)}"
+        )
+
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+
+    return set(stopwords.words("english")), WordNetLemmatizer(), word_tokenize
+
+
+# distinct lowercase tokens whose lemma is remembered (per process)
+LEMMA_CACHE_SIZE = 100_000
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(word):
+    return load_resources()[1].lemmatize(word)
+
+
+def _content_words(tokens, stopwords):
+    # lowercased tokens that are neither stopwords nor punctuation
+    words = []
+    for t in tokens:
+        lower = t.lower()
+        if lower not in stopwords and t not in PUNCT:
+            words.append(lower)
+    return words
+
 
 def clean_text(text):
     if not text:
         return []
 
-    tokens = word_tokenize(text)
+    stopwords, _, word_tokenize = load_resources()
+    words = _content_words(word_tokenize(text), stopwords)
+
+    return " ".join(lemmatize(w) for w in words)
+
+
+def clean_texts(texts):
+    # Same as [clean_text(t) for t in texts], but each distinct word of the
+    # whole batch is lemmatized once
+    if not any(texts):
+        return [[] for _ in texts]
+
+    stopwords, _, word_tokenize = load_resources()
+    batch = [_content_words(word_tokenize(t), stopwords) if t else None for t in texts]
 
-    cleaned = [
-        lemm.lemmatize(t.lower())
-        for t in tokens
-        if t.lower() not in STOPWORDS and t not in PUNCT
-    ]
+    lemmas = {w: lemmatize(w) for words in batch if words for w in words}
 
-    return " ".join(cleaned)
\ No newline at end of file
+    return [[] if words is None else " ".join(lemmas[w] for w in words) for words in batch]
@@ -1,139 +1,193 @@
 from collections import defaultdict
 import re
 
-def detect_type(text: str):
-    if not text:
-        return None
-
-    t = text.lower()
-    scores = defaultdict(int)
-
+# (category, points per keyword found, keywords). A keyword listed twice in
+# a category counts twice, as it always has.
+KEYWORD_TABLE = [
     # ---------------- PLANTS ----------------
-    plant_keywords = [
+    ("Plant", 3, [
         "plant", "flower", "petal", "leaf", "leaves", "stem", "seed",
         "grass", "weed", "shrub", "tree", "bark", "root", "rosette",
         "wildflower", "botanical", "algae", "lichen", "moss", "fungi",
         "photosynthesis", "pollination", "woodlands", "evergreen", "deciduous",
         "gardens"
-    ]
-    for k in plant_keywords:
-        if k in t:
-            scores["Plant"] += 3
+    ]),
 
     # ---------------- INVERTEBRATES ----------------
-    invertebrate_keywords = [
+    ("Invertebrate", 4, [
         "invertebrate", "cnidarian", "jellyfish", "coral", "anemone",
         "medusa", "arthropod", "crustacean", "mollusk", "mollusc",
         "octopus", "squid", "snail", "slug", "worm", "annelid",
         "plankton", "echinoderm", "starfish", "sea star", "urchin"
-    ]
-    for k in invertebrate_keywords:
-        if k in t:
-            scores["Invertebrate"] += 4
+    ]),
 
     # ---------------- FISH ----------------
-    fish_keywords = [
+    ("Fish", 9, [
         "fish", "shark","whale shark", "ray", "eel", "gill", "fins", "school",
         "cartilaginous", "bony fish", "teleost", "swim bladder",
         "lateral line", "spawning", "aquatic", "freshwater", "saltwater",
         "turtles", "turtle", "sea turtles", "sea turtle", "tentacles"
-    ]
-    for k in fish_keywords:
-        if k in t:
-            scores["Fish"] += 9
+    ]),
 
     # ---------------- AQUATIC MAMMALS ----------------
-    aquatic_mammals = [
+    ("Aquatic Mammal", 10, [
         "whale", "dolphin", "porpoise", "seal", "walrus",
         "manatee", "dugong", "cetacean", "pinniped", "blubber",
-        "echolocation", "fluke", "flipper", "baleen", "toothed whale", 
+        "echolocation", "fluke", "flipper", "baleen", "toothed whale",
         "orca", "narwhal", "sea lion"
-    ]
-    for k in aquatic_mammals:
-        if k in t:
-            scores["Aquatic Mammal"] += 10
+    ]),
 
     # ---------------- MAMMALS ----------------
-    mammal_keywords = [
+    ("Mammal", 7, [
         "mammal", "fur", "hair", "gestation", "placental",
         "hooves", "antlers", "horns", "teeth", "paws",
         "herbivore", "carnivore", "omnivore",
         "kilograms", "centimeters", "lactation",
-        "mane", "tail", "snout", "ears", "tusks", 
+        "mane", "tail", "snout", "ears", "tusks",
         "dewlap", "scrotum", "udder", "teats",
         "calf", "fawn", "juvenile",
         "herd", "troop", "pack", "nocturnal", "diurnal",
         "herbivorous", "carnivorous", "omnivorous", "insectivorous",
         "centimeters", "meters", "shoulder height",
         "antelope", "bovid", "canid", "primate", "ungulate",
-        "territorial", "otter", "badger", "weasel", "mongoose", 
+        "territorial", "otter", "badger", "weasel", "mongoose",
         "mammals", "badgers", "gorilla", "kangaroo", "elephants", "elephant"
-    ]
-
-    for k in mammal_keywords:
-        if k in t:
-            scores["Mammal"] += 7
+    ]),
 
     # ---------------- BIRDS ----------------
-    bird_keywords = [
+    ("Bird", 5, [
         "bird", "avian", "feathers", "beak", "bill",
         "wings", "flight", "nest", "eggs",
         "migratory", "songbird", "raptor",
         "flight", "wingspan", "nest", "flock",
         "scavenger",
         "vulture", "crane", "ostrich", "lovebird", "falcon"
-    ]
-    for k in bird_keywords:
-        if k in t:
-            scores["Bird"] += 5
+    ]),
 
     # ---------------- REPTILES ----------------
-    reptile_keywords = [
+    ("Reptile", 3, [
         "reptile", "snake", "lizard", "crocodile",
         "alligator", "turtle", "tortoise",
         "gecko", "iguana", "scales", "cold-blooded"
-    ]
-    for k in reptile_keywords:
-        if k in t:
-            scores["Reptile"] += 3
+    ]),
 
     # ---------------- AMPHIBIANS ----------------
-    amphibian_keywords = [
+    ("Amphibian", 3, [
         "amphibian", "frog", "toad", "newt", "salamander",
         "tadpole", "metamorphosis"
-    ]
-    for k in amphibian_keywords:
-        if k in t:
-            scores["Amphibian"] += 3
+    ]),
 
     # ---------------- INSECTS ----------------
-    insect_keywords = [
+    ("Insect", 5, [
         "insect", "butterfly", "moth", "bee", "wasp",
         "ant", "beetle", "dragonfly", "grasshopper",
         "mosquito", "fly", "larva", "caterpillar",
         "pupa", "thorax", "abdomen",
         "compound eye", "antennae", "beetles", "arachnid", "spider", "mite", "tick",
         "honeycomb", "swarm", "larvae", "pollen", "hoverfly", "projection", "pupate"
-    ]
-    for k in insect_keywords:
-        if k in t:
-            scores["Insect"] += 5
-
-    # ---------------- SCIENTIFIC NAME HEURISTICS ----------------
-    sci_patterns = {
-        "Plant": [r"\baceae\b", r"\blanceolata\b", r"\bofficialis\b"],
-        "Fish": [r"\bidae\b"],
-        "Invertebrate": [r"\bcnidaria\b", r"\bcephalopoda\b"],
-        "Mammal": [r"\bidae\b", r"\bssp\.\b"],
-        "Bird": [r"\bidae\b", r"\baves\b"],
-        "Reptile": [r"\bidae\b", r"\bsquamata\b"],
-        "Amphibian": [r"\bidae\b", r"\banura\b"],
-    }
-
-    for category, patterns in sci_patterns.items():
-        for p in patterns:
-            if re.search(p, t):
-                scores[category] += 2
+    ]),
+]
+
+# ---------------- SCIENTIFIC NAME HEURISTICS ----------------
+SCI_PATTERNS = {
+    "Plant": [r"\baceae\b", r"\blanceolata\b", r"\bofficialis\b"],
+    "Fish": [r"\bidae\b"],
+    "Invertebrate": [r"\bcnidaria\b", r"\bcephalopoda\b"],
+    "Mammal": [r"\bidae\b", r"\bssp\.\b"],
+    "Bird": [r"\bidae\b", r"\baves\b"],
+    "Reptile": [r"\bidae\b", r"\bsquamata\b"],
+    "Amphibian": [r"\bidae\b", r"\banura\b"],
+}
+
+# ---------------- PRIORITY ----------------
+PRIORITY = [
+    "Aquatic Mammal",
+    "Bird",
+    "Fish",
+    "Mammal",
+    "Insect",
+    "Invertebrate",
+    "Plant",
+    "Amphibian",
+    "Reptile",
+]
+
+
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # a word ends here but longer ones continue: the optional group is
+        # greedy, so the longest keyword starting at a position wins
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _build_keyword_matcher():
+    points = defaultdict(list)
+    for category, weight, keywords in KEYWORD_TABLE:
+        for k in keywords:
+            points[k].append((category, weight))
+
+    keywords = sorted(points)
+
+    # A zero-width lookahead is tried at every position of the text, so one
+    # finditer pass sees every keyword occurrence, overlapping ones included.
+    # It reports the longest keyword starting at each position; the shorter
+    # keywords that are prefixes of it are added from `prefixes`.
+    pattern = re.compile("(?=(" + _trie_pattern(keywords) + "))")
+    prefixes = {k: [p for p in keywords if k.startswith(p)] for k in keywords}
+    return pattern, prefixes, dict(points)
+
+
+KEYWORD_PATTERN, KEYWORD_PREFIXES, KEYWORD_POINTS = _build_keyword_matcher()
+
+# (category, literal the pattern needs, compiled pattern): the cheap substring
+# check skips the regex for the texts that cannot match it
+SCI_MATCHERS = [
+    (category, p.replace(r"\b", "").replace("\\", ""), re.compile(p))
+    for category, patterns in SCI_PATTERNS.items()
+    for p in patterns
+]
+
+
+def find_keywords(t):
+    found = set()
+    for m in KEYWORD_PATTERN.finditer(t):
+        found.update(KEYWORD_PREFIXES[m.group(1)])
+    return found
+
+
+def category_scores(text: str):
+    t = text.lower()
+    scores = defaultdict(int)
+
+    for k in find_keywords(t):
+        for category, weight in KEYWORD_POINTS[k]:
+            scores[category] += weight
+
+    for category, literal, pattern in SCI_MATCHERS:
+        if literal in t and pattern.search(t):
+            scores[category] += 2
+
+    return scores
+
+
+def detect_type(text: str):
+    if not text:
+        return None
+
+    scores = category_scores(text)
 
     # ---------------- RULES ----------------
     if scores["Invertebrate"] > 4:
@@ -143,25 +197,23 @@ def detect_type(text: str):
     if (scores["Mammal"] > 0 and scores["Aquatic Mammal"] > 0) or (scores["Bird"] > 0 and scores["Fish"] > 0) or (scores["Invertebrate"] > 0 and scores["Fish"] > 0):
         scores["Insect"] = 0
 
-    # ---------------- PRIORITY ----------------
-    priority = [
-        "Aquatic Mammal",
-        "Bird",
-        "Fish",
-        "Mammal",
-        "Insect",
-        "Invertebrate",
-        "Plant",
-        "Amphibian",
-        "Reptile",
-    ]
-
     best_type = None
     best_score = 0
 
-    for tname in priority:
+    for tname in PRIORITY:
         if scores[tname] > best_score:
             best_score = scores[tname]
             best_type = tname
 
     return best_type if best_score > 0 else "Animal"
+
+
+def detect_types_batch(texts):
+    # same as [detect_type(t) for t in texts]; repeated texts are scored once
+    cache = {}
+    results = []
+    for t in texts:
+        if t not in cache:
+            cache[t] = detect_type(t)
+        results.append(cache[t])
+    return results